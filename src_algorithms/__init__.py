@@ -5,6 +5,19 @@ from .softMax import Softmax
 from .gradientePreferencias import GradientPreference
 from .ucb2 import UCB2
 from .ucb1 import UCB1
+from .ucb1Tree import UCB1Tree
+from .klUcb import KLUCB, GaussianKLUCB
+from .ucbV import UCBV
+from .thompsonSampling import BetaThompsonSampling, GaussianThompsonSampling
+from .state import save_state, load_state, read_state
+from .nonStationary import (ConstantStepEpsilonGreedy, DiscountedEpsilonGreedy, SlidingWindowEpsilonGreedy,
+                            ConstantStepUCB1, DiscountedUCB1, SlidingWindowUCB1,
+                            ConstantStepSoftmax, DiscountedSoftmax, SlidingWindowSoftmax)
 
 # Lista de módulos o clases públicas
-__all__ = ['Algorithm', 'EpsilonGreedy','Softmax', 'GradientPreference','UCB2', 'UCB1']
\ No newline at end of file
+__all__ = ['Algorithm', 'EpsilonGreedy','Softmax', 'GradientPreference','UCB2', 'UCB1', 'UCB1Tree',
+           'KLUCB', 'GaussianKLUCB', 'UCBV', 'BetaThompsonSampling', 'GaussianThompsonSampling',
+           'ConstantStepEpsilonGreedy', 'DiscountedEpsilonGreedy', 'SlidingWindowEpsilonGreedy',
+           'ConstantStepUCB1', 'DiscountedUCB1', 'SlidingWindowUCB1',
+           'ConstantStepSoftmax', 'DiscountedSoftmax', 'SlidingWindowSoftmax',
+           'save_state', 'load_state', 'read_state']
\ No newline at end of file
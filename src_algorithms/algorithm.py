@@ -1,46 +1,230 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple, Union
+
 import numpy as np
 
+from src_arms.rng import generator_from_state, make_generator
+
+# Versión del formato de state_dict
+STATE_VERSION = 1
+
 class Algorithm(ABC):
-    def __init__(self, k: int):
+    # Las subclases que necesitan la varianza empírica de cada brazo (p. ej. UCB-V) lo activan
+    track_variance: bool = False
+    # Atributos que no se guardan en state_dict: el tamaño y el modo los fija reset y el generador
+    # se guarda aparte. Las subclases añaden los que derivan de los parámetros del constructor
+    _TRANSIENT_STATE: Tuple[str, ...] = ('k', 'runs', '_rows', 'rng')
+
+    def __init__(self, k: int, rng=None):
         """
         Inicializa el algoritmo con k brazos.
         :param k: Número de brazos.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
         """
         # Número de brazos
         self.k: int = k
+        # Número de ejecuciones simuladas a la vez (None en modo escalar)
+        self.runs: Optional[int] = None
+        self._rows: Optional[np.ndarray] = None
+        # Generador aleatorio de la política
+        self.rng: np.random.Generator = make_generator(rng)
         # Número de veces que se ha seleccionado cada brazo
         self.counts: np.ndarray = np.zeros(k, dtype=int)
         # Recompensa promedio estimada de cada brazo
         self.values: np.ndarray = np.zeros(k, dtype=float)
+        # Suma de cuadrados de las desviaciones respecto de la media (solo con track_variance)
+        self.squares: Optional[np.ndarray] = np.zeros(k, dtype=float) if self.track_variance else None
 
     @abstractmethod
-    def select_arm(self) -> int:
+    def select_arm(self) -> Union[int, np.ndarray]:
         """
         Selecciona un brazo basado en la política del algoritmo.
+
+        En modo por lotes (ver reset) devuelve un vector con el brazo elegido en cada ejecución.
         :return: Índice del brazo seleccionado.
         """
         raise NotImplementedError("Este método debe ser implementado por la subclase.")
 
-    def update(self, chosen_arm: int, reward: float):
+    def update(self, chosen_arm: Union[int, np.ndarray], reward: Union[float, np.ndarray]):
         """
         Actualiza las recompensas promedio estimadas de cada brazo.
+
+        En modo por lotes chosen_arm y reward son vectores con un elemento por ejecución.
         :param chosen_arm: Índice del brazo que fue tirado.
         :param reward: Recompensa obtenida.
         """
-        self.counts[chosen_arm] += 1  # Incrementa el conteo del brazo seleccionado
+        # En modo por lotes se indexa la fila de cada ejecución junto con su brazo
+        index = chosen_arm if self.runs is None else (self._rows, chosen_arm)
 
-        n = self.counts[chosen_arm]  # Número de veces que el brazo seleccionado ha sido seleccionado
-        value = self.values[chosen_arm]  # Valor actual del brazo seleccionado
+        self.counts[index] += 1  # Incrementa el conteo del brazo seleccionado
+
+        n = self.counts[index]  # Número de veces que el brazo seleccionado ha sido seleccionado
+        value = self.values[index]  # Valor actual del brazo seleccionado
 
         # Actualización incremental de la recompensa promedio
         # value = value + (reward - value) / n
 
-        self.values[chosen_arm] = value + (reward - value) / n
+        self.values[index] = value + (reward - value) / n
+
+        # Algoritmo de Welford: suma de cuadrados estable aunque la media sea grande
+        if self.squares is not None:
+            self.squares[index] += (reward - value) * (reward - self.values[index])
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las estimaciones con un lote de observaciones de una sola vez.
+
+        Equivale a llamar a update(arms[i], rewards[i]) en orden para cada i, pero agrega
+        las observaciones por brazo con np.bincount en lugar de hacer una escritura indexada
+        por observación. Las subclases con estado adicional lo redefinen. Solo en modo escalar.
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        self._update_aggregated(*self._aggregate(arms, rewards))
+
+    def _update_aggregated(self, arms: np.ndarray, rewards: np.ndarray, n: np.ndarray, sums: np.ndarray):
+        """
+        Actualiza counts, values y squares con un lote ya agregado por _aggregate.
+
+        Las subclases que redefinen update_batch agregan el lote una sola vez y lo llaman
+        con el resultado antes de actualizar su propio estado.
+        :param arms: Brazos tirados (array plano).
+        :param rewards: Recompensa de cada observación (array plano).
+        :param n: Número de observaciones de cada brazo.
+        :param sums: Suma de las recompensas de cada brazo.
+        """
+        if not arms.size:
+            return
+
+        old_counts, old_values = self.counts.copy(), self.values.copy()
+        self.counts += n
+        # La media de todas las observaciones no depende de su orden
+        self.values += (sums - n * old_values) / np.maximum(self.counts, 1)
+
+        # Combinación de sumas de cuadrados de dos grupos (Chan et al.)
+        if self.squares is not None:
+            batch_means = sums / np.maximum(n, 1)
+            batch_squares = np.bincount(arms, weights=(rewards - batch_means[arms]) ** 2, minlength=self.k)
+            self.squares += batch_squares + (batch_means - old_values) ** 2 * n * old_counts / np.maximum(self.counts, 1)
+
+    def _aggregate(self, arms, rewards):
+        """
+        Valida un lote de observaciones y calcula cuántas y cuánto suman las de cada brazo.
+
+        :return: Tupla (arms, rewards, n, sums) con los arrays planos y los agregados por brazo.
+        """
+        assert self.runs is None, "Las actualizaciones por lotes solo están disponibles en modo escalar."
+        arms = np.asarray(arms, dtype=np.intp).ravel()
+        rewards = np.asarray(rewards, dtype=float).ravel()
+        assert arms.shape == rewards.shape, "Debe haber una recompensa por cada brazo tirado."
+
+        n = np.bincount(arms, minlength=self.k)
+        sums = np.bincount(arms, weights=rewards, minlength=self.k)
+        return arms, rewards, n, sums
 
-    def reset(self):
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos con el estado actual, sin recibir ninguna recompensa entre ellos.
+
+        Modela la entrega de varias decisiones antes de que vuelvan sus recompensas (que se
+        notifican después con update_batch). Por defecto llama n veces a select_arm; las
+        políticas aleatorizadas lo redefinen con una sola llamada vectorizada. Solo en modo escalar.
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        return np.array([self.select_arm() for _ in range(n)], dtype=int)
+
+    def state_dict(self) -> dict:
+        """
+        Devuelve una instantánea del estado del algoritmo para restaurarla con load_state_dict.
+
+        Incluye una copia de todos los arrays de estado (counts, values y los propios de cada
+        política, también los privados, como los contadores de época de UCB2), los atributos
+        escalares y el estado del generador aleatorio. Las estructuras derivadas (buffers del
+        muestreo softmax, árbol de UCB1Tree y los atributos de _TRANSIENT_STATE de cada clase)
+        no se guardan: se reconstruyen en __init__ o reset.
+        :return: Diccionario con version, class, k, runs, rng, scalars y arrays.
+        """
+        arrays, scalars = {}, {}
+        for name, value in vars(self).items():
+            if name in self._TRANSIENT_STATE:
+                continue
+            if isinstance(value, np.ndarray):
+                arrays[name] = np.array(value)
+            elif isinstance(value, np.generic):
+                scalars[name] = value.item()
+            elif value is None or isinstance(value, (bool, int, float, str)):
+                scalars[name] = value
+        return {'version': STATE_VERSION, 'class': type(self).__name__, 'k': self.k, 'runs': self.runs,
+                'rng': self.rng.bit_generator.state, 'scalars': scalars, 'arrays': arrays}
+
+    def load_state_dict(self, state: dict, copy: bool = True):
+        """
+        Restaura un estado obtenido con state_dict en un algoritmo de la misma clase y número de brazos.
+
+        El algoritmo se reinicia (con el número de ejecuciones del estado) para reconstruir
+        sus estructuras derivadas y después se sobrescriben sus atributos. Con copy=True los
+        arrays se copian sobre los buffers existentes; con copy=False se usan los del estado
+        sin copiarlos (p. ej. arrays de solo lectura abiertos con memmap para réplicas que
+        solo eligen brazos: update fallará al intentar escribir en ellos).
+        :param state: Estado devuelto por state_dict.
+        :param copy: Si es False los arrays del estado se asignan sin copiar.
+        :raises ValueError: Si la versión del estado no está soportada.
+        """
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f"Versión de estado no soportada: {state.get('version')} (se admite {STATE_VERSION}).")
+        assert state['class'] == type(self).__name__, \
+            f"El estado es de {state['class']} y no puede cargarse en {type(self).__name__}."
+        assert state['k'] == self.k, "El estado no tiene el mismo número de brazos que el algoritmo."
+
+        self.reset(state['runs'])
+        self.rng = generator_from_state(state['rng'])
+        for name, value in state['scalars'].items():
+            if name not in self._TRANSIENT_STATE:
+                setattr(self, name, value)
+        for name, value in state['arrays'].items():
+            if name in self._TRANSIENT_STATE:
+                continue  # Derivado de los parámetros del constructor (estados guardados antes de declararlo)
+            current = getattr(self, name, None)
+            if (copy and isinstance(current, np.ndarray) and current.flags.writeable
+                    and current.shape == value.shape and current.dtype == value.dtype):
+                # Copia en el buffer existente: conserva los arrays compartidos (p. ej. probabilities del muestreador)
+                np.copyto(current, value)
+            else:
+                setattr(self, name, np.array(value) if copy else value)
+
+    def get_variances(self) -> np.ndarray:
+        """
+        Devuelve la varianza empírica (sesgada) de las recompensas de cada brazo.
+
+        Requiere track_variance; los brazos sin seleccionar tienen varianza 0.
+        :return: Array con la forma de values.
+        """
+        assert self.squares is not None, "El algoritmo no registra la suma de cuadrados (track_variance)."
+        return self.squares / np.maximum(self.counts, 1)
+
+    def reset(self, runs: Optional[int] = None, rng=None):
         """
         Reinicia el estado del algoritmo (opcional).
+
+        Si se indica runs, el algoritmo pasa a modo por lotes: counts y values son
+        matrices (runs x k) y select_arm/update trabajan con un vector de ejecuciones.
+        :param runs: (Opcional) Número de ejecuciones independientes simuladas a la vez.
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        assert runs is None or runs > 0, "El número de ejecuciones debe ser mayor que 0."
+
+        if rng is not None:
+            self.rng = make_generator(rng)
+        self.runs = runs
+        self._rows = None if runs is None else np.arange(runs)
+        self.counts = np.zeros(self._state_shape(), dtype=int)
+        self.values = np.zeros(self._state_shape(), dtype=float)
+        self.squares = np.zeros(self._state_shape(), dtype=float) if self.track_variance else None
+
+    def _state_shape(self) -> Tuple[int, ...]:
+        """
+        Devuelve la forma de los arrays de estado: (k,) o (runs, k) en modo por lotes.
         """
-        self.counts = np.zeros(self.k, dtype=int)
-        self.values = np.zeros(self.k, dtype=float)
\ No newline at end of file
+        return (self.k,) if self.runs is None else (self.runs, self.k)
@@ -4,17 +4,18 @@ from src_algorithms.algorithm import Algorithm
 
 class EpsilonGreedy(Algorithm):
 
-    def __init__(self, k: int, epsilon: float = 0.1):
+    def __init__(self, k: int, epsilon: float = 0.1, rng=None):
         """
         Inicializa el algoritmo epsilon-greedy.
 
         :param k: Número de brazos.
         :param epsilon: Probabilidad de exploración (seleccionar un brazo al azar).
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
         :raises ValueError: Si epsilon no está en [0, 1].
         """
         assert 0 <= epsilon <= 1, "El parámetro epsilon debe estar entre 0 y 1."
 
-        super().__init__(k)
+        super().__init__(k, rng)
         self.epsilon = epsilon
 
     def select_arm(self) -> int:
@@ -22,12 +23,45 @@ class EpsilonGreedy(Algorithm):
         Selecciona un brazo basado en la política epsilon-greedy.
         :return: índice del brazo seleccionado.
         """
+        if self.runs is not None:
+            return self._select_arms()
 
-        if np.random.random() < self.epsilon:
+        if self.rng.random() < self.epsilon:
             # Selecciona un brazo al azar
-            chosen_arm = np.random.choice(self.k)
+            chosen_arm = self.rng.integers(self.k)
         else:
             # Selecciona el brazo con la recompensa promedio estimada más alta
             chosen_arm = np.argmax(self.values)
 
-        return chosen_arm
\ No newline at end of file
+        return chosen_arm
+
+    def _select_arms(self) -> np.ndarray:
+        """
+        Selecciona un brazo en cada ejecución del lote (argmax por fila).
+        :return: vector con el brazo seleccionado en cada ejecución.
+        """
+        chosen_arms = np.argmax(self.values, axis=1)
+
+        explore = self.rng.random(self.runs) < self.epsilon
+        n_explore = np.count_nonzero(explore)
+        if n_explore:
+            chosen_arms[explore] = self.rng.integers(self.k, size=n_explore)
+
+        return chosen_arms
+
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos con las estimaciones actuales en una sola llamada vectorizada.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        chosen_arms = np.full(n, np.argmax(self.values))
+
+        explore = self.rng.random(n) < self.epsilon
+        n_explore = np.count_nonzero(explore)
+        if n_explore:
+            chosen_arms[explore] = self.rng.integers(self.k, size=n_explore)
+
+        return chosen_arms
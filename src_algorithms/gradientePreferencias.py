@@ -12,27 +12,29 @@ with the additional restriction that it may not be used for commercial purposes.
 For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
+from typing import Optional
+
 import numpy as np
 from src_algorithms.algorithm import Algorithm
+from src_algorithms.softmaxKernel import SoftmaxSampler
 
 class GradientPreference(Algorithm):
 
-    def __init__(self, k: int, alpha: float = 0.1):
+    def __init__(self, k: int, alpha: float = 0.1, rng=None):
         """
         Inicializa el algoritmo de gradiente de preferencias.
 
         :param k: Número de brazos.
         :param alpha: Tasa de aprendizaje para actualizar las preferencias (H).
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
 
         """
         assert 0 < alpha, "El parámetro alpha debe ser mayor que 0."
         
-        super().__init__(k)
+        super().__init__(k, rng)
         
-        self.preferences = np.zeros(k) # Inicializa las preferencias Ht(a)
         self.alpha = alpha # Tasa de aprendizaje
-        self.probabilities = np.ones(k) / k # Probabilidad de seleccionar cada brazo
-        """Las probabilidades deben comenzar con una distribución uniforme."""
+        self.reset() # Inicializa las preferencias Ht(a) y las probabilidades πt(a)
 
     def select_arm(self) -> int:
         """
@@ -44,10 +46,8 @@ class GradientPreference(Algorithm):
         
         :return: índice del brazo seleccionado.
         """
-        exp_preferences = np.exp(self.preferences)
-        self.probabilities = exp_preferences / np.sum(exp_preferences)  # Cálculo de πt(a)
-        
-        return np.random.choice(self.k, p=self.probabilities) # Devuelve el brazo basado en πt(a)
+        # Calcula πt(a) sobre self.probabilities (buffer del núcleo) y devuelve el brazo basado en πt(a)
+        return self._sampler.sample(self.preferences, self.rng)
 
     def update(self, chosen_arm: int, reward: float) -> None:
         """
@@ -61,7 +61,7 @@ class GradientPreference(Algorithm):
           - H(a) es la preferencia del brazo a.
           - alpha es la tasa de aprendizaje.
           - reward es la recompensa obtenida.
-          - recompensa promedio.
+          - recompensa promedio de los pasos anteriores (0 antes de la primera recompensa).
           - I(a == chosen_arm) es 1 si a es el brazo seleccionado y 0 en caso contrario.
           - P(a) es la probabilidad de seleccionar el brazo a calculada en select_arm().
         
@@ -69,23 +69,71 @@ class GradientPreference(Algorithm):
         :param reward: La recompensa obtenida al seleccionar ese brazo.
 
         """
-        average_reward = np.mean(self.values)  # R̄t (recompensa promedio estimada)
+        # Forma vectorizada: H -= alpha * (R - R̄) * π y H[a] += alpha * (R - R̄).
+        # En modo por lotes, step es un vector y se aplica a la fila de cada ejecución.
+        step = self.alpha * (reward - self.average_reward)
+        if self.runs is None:
+            self.preferences -= step * self.probabilities
+            self.preferences[chosen_arm] += step
+        else:
+            self.preferences -= step[:, np.newaxis] * self.probabilities
+            self.preferences[self._rows, chosen_arm] += step
 
-        # Actualización de las preferencias usando el Gradiente de Preferencias
-        for a in range(self.k):
-            if a == chosen_arm:
-                self.preferences[a] += self.alpha * (reward - average_reward) * (1 - self.probabilities[a])
-            else:
-                self.preferences[a] -= self.alpha * (reward - average_reward) * self.probabilities[a]
+        # R̄t es la media de las recompensas anteriores, actualizada de forma incremental en O(1)
+        self.steps += 1
+        self.average_reward = self.average_reward + (reward - self.average_reward) / self.steps
 
         """En Gradiente de Preferencias, no debemos actualizar las recompensas de la forma estándar, 
         ya que el algoritmo solo trabaja con preferencias. Elimina la línea de super().update(chosen_arm, reward)."""
 
-    def reset(self):
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos de la distribución softmax de las preferencias actuales.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        return self._sampler.sample_many(self.preferences, self.rng, n)
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las preferencias con un lote de recompensas como un único paso de gradiente.
+
+        La actualización secuencial depende del orden (cada paso cambia P y la recompensa
+        promedio), pero las decisiones de un lote se tomaron todas con la misma distribución
+        P, así que se suman los gradientes de todas las observaciones calculados con esa P y
+        con la recompensa promedio anterior al lote:
+
+            H(a) <- H(a) + alpha * sum_i (R_i - R̄) * (I(a == A_i) - P(a))
+
+        Después la recompensa promedio incorpora todas las recompensas del lote.
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        arms, rewards, _, _ = self._aggregate(arms, rewards)
+        if not arms.size:
+            return
+
+        steps = self.alpha * (rewards - self.average_reward)
+        self.preferences -= steps.sum() * self.probabilities
+        self.preferences += np.bincount(arms, weights=steps, minlength=self.k)
+
+        self.steps += arms.size
+        self.average_reward = self.average_reward + (rewards.sum() - arms.size * self.average_reward) / self.steps
+
+    def reset(self, runs: Optional[int] = None, rng=None):
         """
         Reinicia el estado del algoritmo, incluidos los parámetros Ht(a) y las probabilidades.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
         """
-        self.counts = np.zeros(self.k, dtype=int)
-        self.values = np.zeros(self.k, dtype=float)
-        self.preferences = np.zeros(self.k)
-        self.probabilities = np.ones(self.k) / self.k
+        super().reset(runs, rng)
+        self.preferences = np.zeros(self._state_shape()) # Preferencias Ht(a)
+        self.steps = 0 # Número de recompensas recibidas
+        self.average_reward = 0.0 if runs is None else np.zeros(runs) # R̄t
+        self._sampler = SoftmaxSampler(self._state_shape())
+        # Probabilidad de seleccionar cada brazo; comparte memoria con el núcleo softmax,
+        # que la actualiza en cada select_arm. Comienza con una distribución uniforme.
+        self.probabilities = self._sampler.probabilities
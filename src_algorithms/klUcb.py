@@ -0,0 +1,161 @@
+"""
+Module: src_algorithms/klUcb.py
+Description: Implementación de KL-UCB (Bernoulli, Binomial y Gaussiano) con un resolvedor vectorizado del índice.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from src_algorithms.algorithm import Algorithm
+from src_algorithms.ucb1 import UCB1
+
+# Margen para evitar log(0) en la divergencia de Bernoulli
+EPS = 1e-15
+
+
+def kl_bernoulli(p, q):
+    """
+    Divergencia de Kullback-Leibler entre dos distribuciones de Bernoulli, elemento a elemento.
+
+    :param p: Probabilidad de éxito de la primera distribución.
+    :param q: Probabilidad de éxito de la segunda distribución.
+    :return: kl(p, q) = p log(p / q) + (1 - p) log((1 - p) / (1 - q)).
+    """
+    p = np.clip(p, EPS, 1 - EPS)
+    q = np.clip(q, EPS, 1 - EPS)
+    return p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q))
+
+
+def kl_ucb_bernoulli(p, d, q0=None, tol: float = 1e-6, max_iter: int = 50) -> np.ndarray:
+    """
+    Calcula el mayor q en [p, 1] tal que kl(p, q) <= d para todos los elementos a la vez.
+
+    f(q) = kl(p, q) - d es creciente y convexa en [p, 1], así que se aplica Newton con
+    salvaguarda sobre todo el array: cada elemento mantiene un intervalo [lo, hi] que
+    contiene la raíz (hi parte de cotas superiores cerradas) y los pasos de Newton que
+    salen de él se recortan a hi, o al punto medio si no son válidos. Con q0, la cota del
+    paso anterior, basta normalmente con 2-3 iteraciones.
+
+    :param p: Array de medias empíricas en [0, 1].
+    :param d: Array (o escalar) de umbrales de divergencia, no negativos.
+    :param q0: (Opcional) Estimación inicial de la solución (arranque en caliente).
+    :param tol: Tolerancia absoluta en q.
+    :param max_iter: Número máximo de iteraciones.
+    :return: Array con la cota superior de cada elemento.
+    """
+    p = np.minimum(np.maximum(p, 0.0), 1.0)
+    d = np.broadcast_to(d, p.shape)
+    pc = np.minimum(np.maximum(p, EPS), 1 - EPS)
+    lo = p  # f(lo) = -d <= 0
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Dos cotas superiores de la raíz: Pinsker, kl(p, q) >= 2 (q - p)^2, y la que resulta de
+        # p log(p / q) >= p log(p), ajustada cerca de 1, donde Newton avanzaría muy despacio
+        tail = 1 - (1 - p) * np.exp((pc * np.log(pc) - d) / (1 - pc))
+        hi = np.maximum(np.minimum(np.minimum(p + np.sqrt(d / 2), tail), 1.0), lo)
+        q = hi if q0 is None else np.minimum(np.maximum(q0, lo), hi)
+
+        # f(q) = offset - p log(q) - (1 - p) log(1 - q): la parte que no depende de q se calcula una vez
+        offset = pc * np.log(pc) + (1 - pc) * np.log1p(-pc) - d
+        for _ in range(max_iter):
+            qc = np.minimum(np.maximum(q, EPS), 1 - EPS)
+            f = offset - pc * np.log(qc) - (1 - pc) * np.log1p(-qc)
+            below = f < 0
+            lo = np.where(below, q, lo)
+            hi = np.where(below, hi, q)
+
+            # Paso de Newton, f'(q) = (q - p) / (q (1 - q)). f es convexa: desde la izquierda
+            # Newton puede pasarse de la raíz, pero desde hi converge de forma monótona; si el
+            # paso no es válido (NaN) se usa el punto medio
+            candidate = np.minimum(q - f * qc * (1 - qc) / (qc - pc), hi)
+            candidate = np.where(candidate >= lo, candidate, (lo + hi) / 2)
+
+            converged = np.abs(candidate - q).max() <= tol
+            q = candidate
+            if converged:
+                break
+    return q
+
+
+class KLUCB(UCB1):
+    # Ensayos por brazo: vista de solo lectura derivada de n
+    _TRANSIENT_STATE = UCB1._TRANSIENT_STATE + ('_trials',)
+
+    def __init__(self, k: int, n: Union[int, Sequence[int]] = 1, c: float = 0.0, rng=None):
+        """
+        Inicializa KL-UCB para recompensas Bernoulli o Binomiales.
+
+        El índice de cada brazo es n * q, con q la mayor probabilidad compatible con la media
+        observada: counts * n * kl(values / n, q) <= log(t) + c log(log(t)). Es mucho más
+        ajustado que el bonus de Hoeffding de UCB1 cuando la media está cerca de 0 o de n.
+        Los índices de todos los brazos (y de todas las ejecuciones en modo por lotes) se
+        calculan con kl_ucb_bernoulli partiendo de los del paso anterior.
+
+        :param k: Número de brazos.
+        :param n: Número de ensayos de cada brazo (1 para Bernoulli; común o uno por brazo).
+        :param c: Coeficiente del término log(log(t)) del umbral (c = 0 en la práctica, c = 3 en teoría).
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert c >= 0, "El parámetro c debe ser mayor o igual que 0."
+        assert np.all(np.asarray(n) > 0), "El número de ensayos n debe ser mayor que 0."
+
+        # UCB1 exige c > 0; aquí c = 0 es válido, así que se inicializa directamente Algorithm
+        Algorithm.__init__(self, k, rng)
+        self.n = n
+        self.c = c
+        self._trials = np.broadcast_to(np.asarray(n, dtype=float), (k,))
+        self.reset()
+
+    def _threshold(self, t, counts: np.ndarray) -> np.ndarray:
+        """
+        Calcula el umbral de divergencia (log(t) + c log(log(t))) / counts de cada brazo.
+        """
+        log_t = np.log(t)
+        return (log_t + self.c * np.log(np.maximum(log_t, 1.0))) / counts
+
+    def _ucb_values(self, t, counts: np.ndarray) -> np.ndarray:
+        """
+        Calcula el índice KL-UCB de cada brazo, arrancando el resolvedor desde el paso anterior.
+        """
+        self._bounds = kl_ucb_bernoulli(self.values / self._trials, self._threshold(t, counts) / self._trials,
+                                        self._bounds)
+        return self._trials * self._bounds
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        self._bounds = None  # Cota q del paso anterior (arranque en caliente)
+
+
+class GaussianKLUCB(KLUCB):
+
+    def __init__(self, k: int, sigma: float = 1.0, c: float = 0.0, rng=None):
+        """
+        Inicializa KL-UCB para recompensas normales de desviación estándar sigma.
+
+        Para normales kl(mu, mu') = (mu - mu')^2 / (2 sigma^2), así que el índice tiene forma
+        cerrada: values + sigma * sqrt(2 (log(t) + c log(log(t))) / counts).
+
+        :param k: Número de brazos.
+        :param sigma: Desviación estándar (o cota subgaussiana) de las recompensas.
+        :param c: Coeficiente del término log(log(t)) del umbral.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert sigma > 0, "La desviación estándar sigma debe ser positiva."
+        self.sigma = sigma
+        super().__init__(k, 1, c, rng)
+
+    def _ucb_values(self, t, counts: np.ndarray) -> np.ndarray:
+        return self.values + self.sigma * np.sqrt(2 * self._threshold(t, counts))
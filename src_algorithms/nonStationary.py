@@ -0,0 +1,475 @@
+"""
+Module: src_algorithms/nonStationary.py
+Description: Variantes de paso constante, descontadas y de ventana deslizante de epsilon-greedy, UCB1 y softmax.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from typing import Optional
+
+import numpy as np
+
+from src_algorithms.algorithm import Algorithm
+from src_algorithms.epsilon_greedy import EpsilonGreedy
+from src_algorithms.softMax import Softmax
+from src_algorithms.ucb1 import UCB1
+
+# Peso máximo de una observación antes de renormalizar las sumas descontadas
+MAX_DISCOUNT_WEIGHT = 1e150
+
+
+class ConstantStepEstimates(Algorithm):
+    """
+    Estimación de valores con paso constante: value += alpha * (reward - value).
+
+    Da más peso a las recompensas recientes (media ponderada exponencial), por lo que las
+    estimaciones siguen a las recompensas cuando estas cambian. counts sigue contando las
+    selecciones de cada brazo.
+
+    Se combina con una política poniéndola detrás en la herencia, p. ej.
+    class ConstantStepUCB1(UCB1, ConstantStepEstimates); la subclase fija alpha.
+    """
+
+    alpha: float
+
+    def update(self, chosen_arm, reward):
+        """
+        Actualiza la estimación del brazo seleccionado con paso constante.
+
+        :param chosen_arm: Índice del brazo que fue tirado (vector en modo por lotes).
+        :param reward: Recompensa obtenida (vector en modo por lotes).
+        """
+        index = chosen_arm if self.runs is None else (self._rows, chosen_arm)
+        self.counts[index] += 1
+        self.values[index] += self.alpha * (reward - self.values[index])
+
+    def update_batch(self, arms, rewards):
+        """
+        Aplica en orden un lote de observaciones con paso constante, agregadas por brazo.
+
+        Tras n observaciones r_1..r_n de un brazo, value = (1 - alpha)^n value +
+        sum_j alpha (1 - alpha)^(n - j) r_j: cada observación pesa menos cuantas más
+        observaciones posteriores del mismo brazo haya en el lote.
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        arms, rewards, n, _ = self._aggregate(arms, rewards)
+        if not arms.size:
+            return
+
+        # Número de observaciones posteriores del mismo brazo dentro del lote
+        order = np.argsort(arms, kind='stable')
+        later = np.empty(arms.size, dtype=int)
+        later[order] = np.cumsum(n)[arms[order]] - 1 - np.arange(arms.size)
+
+        decay = 1 - self.alpha
+        self.counts += n
+        self.values *= decay ** n
+        self.values += np.bincount(arms, weights=self.alpha * decay ** later * rewards, minlength=self.k)
+
+
+class DiscountedEstimates(Algorithm):
+    """
+    Estimación de valores descontada: cada observación pierde un factor gamma por paso.
+
+    El valor de cada brazo es S_i / N_i, con S_i = sum gamma^(t-s) r_s y N_i = sum gamma^(t-s)
+    sobre sus selecciones. En lugar de multiplicar por gamma las sumas de los k brazos en
+    cada paso, cada observación se suma con un peso global w = gamma^(-s) que crece con el
+    tiempo: el cociente S_i / N_i no depende de la escala, así que cada paso solo actualiza
+    el brazo elegido (O(1)), y los recuentos descontados reales son N_i / w. Cuando w supera
+    MAX_DISCOUNT_WEIGHT se reescalan todas las sumas (O(k) cada muchos pasos).
+
+    Se combina con una política poniéndola detrás en la herencia; la subclase fija gamma.
+    """
+
+    gamma: float
+
+    def update(self, chosen_arm, reward):
+        """
+        Actualiza las sumas descontadas del brazo seleccionado.
+
+        :param chosen_arm: Índice del brazo que fue tirado (vector en modo por lotes).
+        :param reward: Recompensa obtenida (vector en modo por lotes).
+        """
+        index = chosen_arm if self.runs is None else (self._rows, chosen_arm)
+        weight = self._weight
+        self.counts[index] += 1
+        self._weights[index] += weight
+        self._sums[index] += weight * reward
+        self.values[index] = self._sums[index] / self._weights[index]
+        self._total += weight
+
+        # Las observaciones futuras pesan 1 / gamma veces más que la actual
+        self._weight = weight / self.gamma
+        if self._weight > MAX_DISCOUNT_WEIGHT:
+            scale = 1.0 / self._weight
+            self._weights *= scale
+            self._sums *= scale
+            self._total *= scale
+            self._weight = 1.0
+
+    def update_batch(self, arms, rewards):
+        """
+        Aplica en orden un lote de observaciones descontadas, agregadas por brazo.
+
+        Se reescala todo para que la siguiente observación pese 1: el estado anterior se
+        multiplica por gamma^m / w y la observación i del lote (de m) pesa gamma^(m - i).
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        arms, rewards, n, _ = self._aggregate(arms, rewards)
+        if not arms.size:
+            return
+
+        scale = self.gamma ** arms.size / self._weight
+        weights = self.gamma ** np.arange(arms.size, 0, -1, dtype=float)
+        self._weights *= scale
+        self._sums *= scale
+        self._total *= scale
+        self._weights += np.bincount(arms, weights=weights, minlength=self.k)
+        self._sums += np.bincount(arms, weights=weights * rewards, minlength=self.k)
+        self._total += weights.sum()
+        self._weight = 1.0
+
+        self.counts += n
+        # El cociente de los brazos sin observaciones nuevas no cambia al reescalar
+        touched = (n > 0) & (self._weights > 0)
+        self.values[touched] = self._sums[touched] / self._weights[touched]
+
+    def _effective_counts(self):
+        """
+        Devuelve los recuentos descontados de cada brazo y su suma.
+        """
+        return self._weights / self._weight, self._total / self._weight
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo y las sumas descontadas.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        self._weight = 1.0  # Peso de la próxima observación (gamma^-t, común a todas las ejecuciones)
+        self._weights = np.zeros(self._state_shape())  # Suma de los pesos de cada brazo
+        self._sums = np.zeros(self._state_shape())  # Suma de recompensas ponderadas de cada brazo
+        self._total = 0.0 if runs is None else np.zeros(runs)  # Suma de los pesos de todos los brazos
+
+
+class SlidingWindowEstimates(Algorithm):
+    """
+    Estimación de valores sobre las últimas window observaciones.
+
+    Las observaciones de la ventana se guardan en un buffer circular (brazo y recompensa) y
+    se mantienen el número de observaciones y la suma de recompensas de cada brazo dentro de
+    la ventana: cada paso añade la nueva observación y retira la más antigua, actualizando
+    solo esos dos brazos (O(1)). Cada vez que el buffer da la vuelta, las sumas se recalculan
+    exactamente a partir del buffer para no acumular error de redondeo (O(window + k) cada
+    window pasos, O(1) amortizado). Un brazo sin observaciones en la ventana vale 0.
+
+    Se combina con una política poniéndola detrás en la herencia; la subclase fija window.
+    """
+
+    window: int
+
+    def update(self, chosen_arm, reward):
+        """
+        Añade la observación a la ventana y retira la más antigua si está llena.
+
+        :param chosen_arm: Índice del brazo que fue tirado (vector en modo por lotes).
+        :param reward: Recompensa obtenida (vector en modo por lotes).
+        """
+        if self.runs is not None:
+            self._update_rows(chosen_arm, reward)
+        else:
+            head = self._head
+            self.counts[chosen_arm] += 1
+            if self._filled == self.window:
+                evicted = self._ring_arms[head]
+                self._window_counts[evicted] -= 1
+                self._window_sums[evicted] -= self._ring_rewards[head]
+                self.values[evicted] = self._window_value(evicted)
+
+            self._ring_arms[head] = chosen_arm
+            self._ring_rewards[head] = reward
+            self._window_counts[chosen_arm] += 1
+            self._window_sums[chosen_arm] += reward
+            self.values[chosen_arm] = self._window_sums[chosen_arm] / self._window_counts[chosen_arm]
+
+        self._head = (self._head + 1) % self.window
+        if self._head == 0:
+            self._filled = self.window
+            self._recompute()
+        elif self._filled < self.window:
+            self._filled += 1
+
+    def update_batch(self, arms, rewards):
+        """
+        Añade a la ventana un lote de observaciones y recalcula sus estadísticas.
+
+        Solo las últimas window observaciones del lote pueden quedar en la ventana; se
+        escriben en el buffer circular de una vez y las sumas de la ventana se recalculan
+        exactamente con np.bincount (O(window + k) por lote).
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        arms, rewards, n, _ = self._aggregate(arms, rewards)
+        if not arms.size:
+            return
+
+        self.counts += n
+        keep = min(arms.size, self.window)
+        positions = (self._head + np.arange(arms.size - keep, arms.size)) % self.window
+        self._ring_arms[positions] = arms[-keep:]
+        self._ring_rewards[positions] = rewards[-keep:]
+        self._head = (self._head + arms.size) % self.window
+        self._filled = min(self.window, self._filled + arms.size)
+
+        # Hasta llenarse, la ventana ocupa las primeras posiciones del buffer
+        ring_arms, ring_rewards = self._ring_arms[:self._filled], self._ring_rewards[:self._filled]
+        self._window_counts = np.bincount(ring_arms, minlength=self.k)
+        self._window_sums = np.bincount(ring_arms, weights=ring_rewards, minlength=self.k)
+        self.values = np.where(self._window_counts > 0, self._window_sums / np.maximum(self._window_counts, 1), 0.0)
+
+    def _update_rows(self, chosen_arms: np.ndarray, rewards: np.ndarray):
+        """
+        Añade a la ventana de cada ejecución del lote su observación (modo por lotes).
+        """
+        index = (self._rows, chosen_arms)
+        head = self._head
+        self.counts[index] += 1
+        if self._filled == self.window:
+            old = (self._rows, self._ring_arms[:, head])
+            self._window_counts[old] -= 1
+            self._window_sums[old] -= self._ring_rewards[:, head]
+            self.values[old] = self._window_value(old)
+
+        self._ring_arms[:, head] = chosen_arms
+        self._ring_rewards[:, head] = rewards
+        self._window_counts[index] += 1
+        self._window_sums[index] += rewards
+        self.values[index] = self._window_sums[index] / self._window_counts[index]
+
+    def _window_value(self, index):
+        """
+        Media de las recompensas en la ventana de los brazos indicados (0 si no tienen observaciones).
+        """
+        counts = self._window_counts[index]
+        if self.runs is None:
+            return self._window_sums[index] / counts if counts else 0.0
+        return np.where(counts > 0, self._window_sums[index] / np.maximum(counts, 1), 0.0)
+
+    def _recompute(self):
+        """
+        Recalcula exactamente las sumas de la ventana a partir del buffer circular.
+        """
+        if self.runs is None:
+            self._window_sums = np.bincount(self._ring_arms, weights=self._ring_rewards, minlength=self.k)
+        else:
+            flat = (self._rows[:, np.newaxis] * self.k + self._ring_arms).ravel()
+            self._window_sums = np.bincount(flat, weights=self._ring_rewards.ravel(),
+                                            minlength=self.runs * self.k).reshape(self.runs, self.k)
+        self.values = np.where(self._window_counts > 0, self._window_sums / np.maximum(self._window_counts, 1), 0.0)
+
+    def _effective_counts(self):
+        """
+        Devuelve el número de observaciones de cada brazo en la ventana y el tamaño ocupado de la ventana.
+        """
+        return self._window_counts, self._filled
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo y vacía la ventana.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        ring_shape = (self.window,) if runs is None else (runs, self.window)
+        self._ring_arms = np.zeros(ring_shape, dtype=np.intp)  # Brazos de la ventana (buffer circular)
+        self._ring_rewards = np.zeros(ring_shape)  # Recompensas de la ventana
+        self._head = 0  # Posición de la próxima observación (común a todas las ejecuciones)
+        self._filled = 0  # Número de observaciones en la ventana
+        self._window_counts = np.zeros(self._state_shape(), dtype=int)
+        self._window_sums = np.zeros(self._state_shape())
+
+
+class _EffectiveCountsUCB1(UCB1):
+    """
+    UCB1 cuyo índice usa los recuentos efectivos del estimador (descontados o de la ventana).
+
+    Índice: value_i + c * sqrt(2 ln(N) / N_i), con N_i el recuento efectivo del brazo y N
+    su suma. Los brazos con N_i = 0 se eligen primero.
+    """
+
+    def select_arm(self):
+        """
+        Selecciona el brazo con mayor índice UCB1 sobre los recuentos efectivos.
+
+        :return: Índice del brazo seleccionado (vector en modo por lotes).
+        """
+        counts, total = self._effective_counts()
+        log_total = 2 * np.log(np.maximum(total, 1.0))
+        if self.runs is not None:
+            log_total = np.reshape(log_total, (-1, 1))
+        # Los brazos sin observaciones se descartan abajo; el mínimo solo evita dividir entre 0
+        bonus = self.c * np.sqrt(log_total / np.maximum(counts, 1e-300))
+        ucb_values = np.where(counts > 0, self.values + bonus, np.inf)
+        if self.runs is not None:
+            return np.argmax(ucb_values, axis=1)
+        return int(np.argmax(ucb_values))
+
+
+class ConstantStepEpsilonGreedy(EpsilonGreedy, ConstantStepEstimates):
+
+    def __init__(self, k: int, epsilon: float = 0.1, alpha: float = 0.1, rng=None):
+        """
+        Inicializa el algoritmo epsilon-greedy con estimaciones de paso constante.
+
+        :param k: Número de brazos.
+        :param epsilon: Probabilidad de exploración (seleccionar un brazo al azar).
+        :param alpha: Tamaño de paso de la actualización, en (0, 1].
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert 0 < alpha <= 1, "El tamaño de paso alpha debe estar en (0, 1]."
+        self.alpha = alpha
+        super().__init__(k, epsilon, rng)
+
+
+class DiscountedEpsilonGreedy(EpsilonGreedy, DiscountedEstimates):
+
+    def __init__(self, k: int, epsilon: float = 0.1, gamma: float = 0.99, rng=None):
+        """
+        Inicializa el algoritmo epsilon-greedy con estimaciones descontadas.
+
+        :param k: Número de brazos.
+        :param epsilon: Probabilidad de exploración (seleccionar un brazo al azar).
+        :param gamma: Factor de descuento por paso, en (0, 1].
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert 0 < gamma <= 1, "El factor de descuento gamma debe estar en (0, 1]."
+        self.gamma = gamma
+        super().__init__(k, epsilon, rng)
+        self.reset()
+
+
+class SlidingWindowEpsilonGreedy(EpsilonGreedy, SlidingWindowEstimates):
+
+    def __init__(self, k: int, epsilon: float = 0.1, window: int = 1000, rng=None):
+        """
+        Inicializa el algoritmo epsilon-greedy con estimaciones de ventana deslizante.
+
+        :param k: Número de brazos.
+        :param epsilon: Probabilidad de exploración (seleccionar un brazo al azar).
+        :param window: Número de observaciones recientes sobre las que se estiman los valores.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert window > 0, "El tamaño de la ventana debe ser mayor que 0."
+        self.window = window
+        super().__init__(k, epsilon, rng)
+        self.reset()
+
+
+class ConstantStepUCB1(UCB1, ConstantStepEstimates):
+
+    def __init__(self, k: int, c: float = 1.0, alpha: float = 0.1, rng=None):
+        """
+        Inicializa el algoritmo UCB1 con estimaciones de paso constante.
+
+        :param k: Número de brazos.
+        :param c: Parámetro de ajuste de exploración (por defecto c = 1).
+        :param alpha: Tamaño de paso de la actualización, en (0, 1].
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert 0 < alpha <= 1, "El tamaño de paso alpha debe estar en (0, 1]."
+        self.alpha = alpha
+        super().__init__(k, c, rng)
+
+
+class DiscountedUCB1(_EffectiveCountsUCB1, DiscountedEstimates):
+
+    def __init__(self, k: int, c: float = 1.0, gamma: float = 0.99, rng=None):
+        """
+        Inicializa el algoritmo UCB1 descontado (D-UCB).
+
+        :param k: Número de brazos.
+        :param c: Parámetro de ajuste de exploración (por defecto c = 1).
+        :param gamma: Factor de descuento por paso, en (0, 1].
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert 0 < gamma <= 1, "El factor de descuento gamma debe estar en (0, 1]."
+        self.gamma = gamma
+        super().__init__(k, c, rng)
+
+
+class SlidingWindowUCB1(_EffectiveCountsUCB1, SlidingWindowEstimates):
+
+    def __init__(self, k: int, c: float = 1.0, window: int = 1000, rng=None):
+        """
+        Inicializa el algoritmo UCB1 de ventana deslizante (SW-UCB).
+
+        :param k: Número de brazos.
+        :param c: Parámetro de ajuste de exploración (por defecto c = 1).
+        :param window: Número de observaciones recientes sobre las que se estiman los valores.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert window > 0, "El tamaño de la ventana debe ser mayor que 0."
+        self.window = window
+        super().__init__(k, c, rng)
+
+
+class ConstantStepSoftmax(Softmax, ConstantStepEstimates):
+
+    def __init__(self, k: int, tau: float = 1.0, alpha: float = 0.1, rng=None):
+        """
+        Inicializa el algoritmo softmax con estimaciones de paso constante.
+
+        :param k: Número de brazos.
+        :param tau: Parámetro de temperatura que controla el grado de exploración.
+        :param alpha: Tamaño de paso de la actualización, en (0, 1].
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert 0 < alpha <= 1, "El tamaño de paso alpha debe estar en (0, 1]."
+        self.alpha = alpha
+        super().__init__(k, tau, rng)
+
+
+class DiscountedSoftmax(Softmax, DiscountedEstimates):
+
+    def __init__(self, k: int, tau: float = 1.0, gamma: float = 0.99, rng=None):
+        """
+        Inicializa el algoritmo softmax con estimaciones descontadas.
+
+        :param k: Número de brazos.
+        :param tau: Parámetro de temperatura que controla el grado de exploración.
+        :param gamma: Factor de descuento por paso, en (0, 1].
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert 0 < gamma <= 1, "El factor de descuento gamma debe estar en (0, 1]."
+        self.gamma = gamma
+        super().__init__(k, tau, rng)
+
+
+class SlidingWindowSoftmax(Softmax, SlidingWindowEstimates):
+
+    def __init__(self, k: int, tau: float = 1.0, window: int = 1000, rng=None):
+        """
+        Inicializa el algoritmo softmax con estimaciones de ventana deslizante.
+
+        :param k: Número de brazos.
+        :param tau: Parámetro de temperatura que controla el grado de exploración.
+        :param window: Número de observaciones recientes sobre las que se estiman los valores.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert window > 0, "El tamaño de la ventana debe ser mayor que 0."
+        self.window = window
+        super().__init__(k, tau, rng)
@@ -12,11 +12,14 @@ with the additional restriction that it may not be used for commercial purposes.
 For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
+from typing import Optional
+
 import numpy as np
 from src_algorithms.algorithm import Algorithm
+from src_algorithms.softmaxKernel import SoftmaxSampler
 class Softmax(Algorithm):
     
-    def __init__(self, k: int, tau: float = 1.0):
+    def __init__(self, k: int, tau: float = 1.0, rng=None):
         """
         Inicializa el algoritmo softmax.
 
@@ -24,14 +27,16 @@ class Softmax(Algorithm):
         :param tau: Parámetro de temperatura que controla el grado de exploración.
                     Valores bajos (tau cercano a 0) hacen que la selección sea casi greedy,
                     mientras que valores altos favorecen la exploración.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
         :raises ValueError: Si tau no es mayor que 0.
         """
         # if tau <= 0:
         #     raise ValueError("El parámetro tau debe ser mayor que 0.")
         assert 0 < tau, "El parámetro tau debe ser mayor que 0."
         
-        super().__init__(k)
+        super().__init__(k, rng)
         self.tau = tau
+        self.reset()
 
     def select_arm(self) -> int:
         """
@@ -46,21 +51,31 @@ class Softmax(Algorithm):
 
         :return: índice del brazo seleccionado.
         """
-        
-        "Numerador: exponencial de la estimacion de la recompensa de cada brazo dividida por tau"
-        expon = np.exp(self.values / self.tau)
-
-        "Denominador: sumatorio de la exponencial de la estimacion de la recompensa de cada brazo dividida por tau"
-        sum_expon = np.sum(expon)
-        
-        "Probabilidad de seleccionar cada brazo calculada con la formula softmax"
-        probab = expon / sum_expon 
-        
-        chosen_arm = np.random.choice(self.k, p=probab)
-        return chosen_arm
+        # El núcleo resta el máximo antes de exp, lo que evita desbordamientos con tau pequeño
+        return self._sampler.sample(self.values, self.rng, 1.0 / self.tau)
     
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos de la distribución softmax actual con una sola búsqueda vectorizada.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        return self._sampler.sample_many(self.values, self.rng, n, 1.0 / self.tau)
+
     def update(self, chosen_arm: int, reward: float) -> None:
         """
         Actualiza la estimación de recompensa para el brazo seleccionado.
         """
         super().update(chosen_arm, reward)  # Usa la actualización de la clase abstracta Algorithm
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo y los buffers del muestreo softmax.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        self._sampler = SoftmaxSampler(self._state_shape())
@@ -0,0 +1,104 @@
+"""
+Module: src_algorithms/softmaxKernel.py
+Description: Núcleo de muestreo softmax compartido por Softmax y GradientPreference.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from typing import Tuple, Union
+
+import numpy as np
+
+class SoftmaxSampler:
+
+    def __init__(self, shape: Tuple[int, ...]):
+        """
+        Inicializa el muestreador con buffers reservados de antemano.
+
+        :param shape: Forma de las puntuaciones: (k,) o (runs, k) en modo por lotes.
+        """
+        assert len(shape) in (1, 2) and shape[-1] > 0, "La forma debe ser (k,) o (runs, k) con k > 0."
+
+        self.shape = shape
+        self.k = shape[-1]
+        # Distribución softmax de la última llamada a sample (inicialmente uniforme)
+        self.probabilities = np.full(shape, 1.0 / self.k)
+        # Función de distribución acumulada de la última llamada a sample
+        self.cumulative = np.empty(shape)
+        if len(shape) == 2:
+            # Desplazamiento de cada fila para buscar todas las ejecuciones en un único vector ordenado
+            self._offsets = np.arange(shape[0], dtype=float)
+            self._row_starts = np.arange(shape[0]) * self.k
+            self._max = np.empty((shape[0], 1))
+
+    def sample(self, scores: np.ndarray, rng: np.random.Generator,
+               scale: float = 1.0) -> Union[int, np.ndarray]:
+        """
+        Calcula softmax(scale * scores) y muestrea un brazo por fila por inversión de la CDF.
+
+        Se resta el máximo antes de la exponencial, de modo que exp nunca desborda aunque
+        las puntuaciones sean grandes o la temperatura pequeña. Todos los cálculos se
+        hacen sobre los buffers del muestreador; tras la llamada, probabilities contiene
+        la distribución usada.
+        :param scores: Puntuaciones de cada brazo, con la forma del muestreador.
+        :param rng: Generador aleatorio con el que muestrear.
+        :param scale: Factor que multiplica las puntuaciones (1 / tau en Softmax).
+        :return: Índice del brazo seleccionado, o vector con uno por ejecución en modo por lotes.
+        """
+        probabilities, cumulative = self.probabilities, self.cumulative
+        np.multiply(scores, scale, out=probabilities)
+
+        if probabilities.ndim == 1:
+            probabilities -= probabilities.max()
+            np.exp(probabilities, out=probabilities)
+            np.cumsum(probabilities, out=cumulative)
+            total = cumulative[-1]
+            probabilities /= total
+            arm = int(cumulative.searchsorted(rng.random() * total, side='right'))
+            return min(arm, self.k - 1)
+
+        np.max(probabilities, axis=1, keepdims=True, out=self._max)
+        probabilities -= self._max
+        np.exp(probabilities, out=probabilities)
+        np.cumsum(probabilities, axis=1, out=cumulative)
+        totals = cumulative[:, -1:]
+        probabilities /= totals
+        cumulative /= totals
+
+        # Cada fila normalizada está en [0, 1]; al sumar el índice de fila el vector completo
+        # queda ordenado y una sola búsqueda binaria resuelve todas las ejecuciones
+        cumulative += self._offsets[:, np.newaxis]
+        thresholds = rng.random(self.shape[0])
+        thresholds += self._offsets
+        chosen_arms = cumulative.ravel().searchsorted(thresholds, side='right') - self._row_starts
+        cumulative -= self._offsets[:, np.newaxis]
+        return np.minimum(chosen_arms, self.k - 1)
+
+    def sample_many(self, scores: np.ndarray, rng: np.random.Generator, n: int,
+                    scale: float = 1.0) -> np.ndarray:
+        """
+        Calcula softmax(scale * scores) una vez y muestrea n brazos de esa distribución.
+
+        Solo para muestreadores de forma (k,); como sample, deja en probabilities la distribución usada.
+        :param scores: Puntuaciones de cada brazo.
+        :param rng: Generador aleatorio con el que muestrear.
+        :param n: Número de brazos a muestrear.
+        :param scale: Factor que multiplica las puntuaciones.
+        :return: Array con los n brazos muestreados.
+        """
+        assert len(self.shape) == 1, "sample_many solo admite muestreadores de forma (k,)."
+        probabilities, cumulative = self.probabilities, self.cumulative
+        np.multiply(scores, scale, out=probabilities)
+        probabilities -= probabilities.max()
+        np.exp(probabilities, out=probabilities)
+        np.cumsum(probabilities, out=cumulative)
+        total = cumulative[-1]
+        probabilities /= total
+        chosen_arms = cumulative.searchsorted(rng.random(n) * total, side='right')
+        return np.minimum(chosen_arms, self.k - 1)
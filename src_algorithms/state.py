@@ -0,0 +1,130 @@
+"""
+Module: src_algorithms/state.py
+Description: Guardado y carga del estado de los algoritmos en un fichero binario compacto (cabecera JSON y arrays alineados).
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from src_algorithms.algorithm import Algorithm
+
+# Firma de los ficheros de estado
+MAGIC = b'KBRSTATE'
+# Alineación (en bytes) del inicio de cada array, válida para cualquier tipo y para memmap
+ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _encode(value):
+    """
+    Convierte los arrays que pueda contener el estado del generador (p. ej. Philox) a JSON.
+    """
+    if isinstance(value, np.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo no serializable en el estado: {type(value).__name__}")
+
+
+def _decode(value: dict):
+    if '__ndarray__' in value:
+        return np.array(value['__ndarray__'], dtype=value['dtype'])
+    return value
+
+
+def save_state(algorithm: Algorithm, path: str):
+    """
+    Guarda el estado de un algoritmo (state_dict) en un fichero binario.
+
+    El fichero empieza con la firma MAGIC y la longitud de una cabecera JSON (versión,
+    clase, escalares, estado del generador y tipo, forma y posición de cada array); a
+    continuación van los bytes de cada array, cada uno alineado a ALIGNMENT bytes, de modo
+    que load_state puede leerlos directamente o abrirlos con memmap. Se escribe en un
+    fichero temporal que sustituye al destino al terminar, así que un proceso que se
+    interrumpa nunca deja un estado a medias.
+
+    :param algorithm: Algoritmo a guardar.
+    :param path: Ruta del fichero.
+    """
+    state = algorithm.state_dict()
+    arrays = {name: np.ascontiguousarray(values) for name, values in state.pop('arrays').items()}
+
+    layout, offset = {}, 0
+    for name, values in arrays.items():
+        layout[name] = {'dtype': values.dtype.str, 'shape': list(values.shape), 'offset': offset}
+        offset = _aligned(offset + values.nbytes)
+    state['arrays'] = layout
+    header = json.dumps(state, default=_encode).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<Q', len(header)))
+        file.write(header)
+        for name, values in arrays.items():
+            file.seek(data_start + layout[name]['offset'])
+            file.write(values.data)
+        file.truncate(data_start + offset)
+    os.replace(temporary, path)
+
+
+def read_state(path: str, mmap: bool = False) -> dict:
+    """
+    Lee un fichero de estado y devuelve el diccionario de state_dict.
+
+    :param path: Ruta del fichero.
+    :param mmap: Si es True los arrays se abren con memmap en modo solo lectura en lugar de leerse.
+    :return: Estado con el formato de state_dict.
+    :raises ValueError: Si el fichero no es un fichero de estado.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un fichero de estado de algoritmo.")
+        (length,) = struct.unpack('<Q', file.read(8))
+        state = json.loads(file.read(length).decode('utf-8'), object_hook=_decode)
+        data_start = _aligned(len(MAGIC) + 8 + length)
+
+        arrays = {}
+        for name, spec in state['arrays'].items():
+            dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+            count = int(np.prod(shape))
+            if mmap and count:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=data_start + spec['offset'], shape=shape)
+            else:
+                file.seek(data_start + spec['offset'])
+                arrays[name] = np.fromfile(file, dtype=dtype, count=count).reshape(shape)
+    state['arrays'] = arrays
+    return state
+
+
+def load_state(algorithm: Algorithm, path: str, mmap: bool = False) -> Algorithm:
+    """
+    Restaura en un algoritmo el estado guardado con save_state.
+
+    Con mmap=True los arrays no se copian en memoria: el algoritmo usa directamente los del
+    fichero, abiertos en modo solo lectura, y la carga no depende del número de brazos. Es
+    la opción para réplicas que solo eligen brazos; update fallará en ellas (y también select_arm
+    en UCB2, que registra el inicio de cada época al elegir).
+
+    :param algorithm: Algoritmo de la misma clase y número de brazos que el guardado.
+    :param path: Ruta del fichero.
+    :param mmap: Si es True los arrays se abren con memmap en modo solo lectura.
+    :return: El propio algoritmo, con el estado restaurado.
+    """
+    algorithm.load_state_dict(read_state(path, mmap), copy=not mmap)
+    return algorithm
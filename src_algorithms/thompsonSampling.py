@@ -0,0 +1,233 @@
+"""
+Module: src_algorithms/thompsonSampling.py
+Description: Implementación de Thompson Sampling con posteriores conjugadas (Beta y Normal-Gamma) para el problema de los k-brazos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from src_algorithms.algorithm import Algorithm
+
+
+class BetaThompsonSampling(Algorithm):
+    # Ensayos por brazo y escala de las muestras: vistas de solo lectura derivadas de n
+    _TRANSIENT_STATE = Algorithm._TRANSIENT_STATE + ('_trials', '_scale')
+
+    def __init__(self, k: int, n: Union[int, Sequence[int]] = 1, alpha0: float = 1.0, beta0: float = 1.0, rng=None):
+        """
+        Inicializa Thompson Sampling con posterior Beta para recompensas Bernoulli o Binomiales.
+
+        Cada brazo tiene una posterior Beta(alpha, beta) sobre su probabilidad de éxito p. Una
+        recompensa r de n ensayos suma r éxitos a alpha y n - r fracasos a beta. En cada paso
+        se muestrean las k posteriores con una sola llamada a rng.beta y se elige el brazo con
+        mayor recompensa esperada muestreada (n * p).
+
+        :param k: Número de brazos.
+        :param n: Número de ensayos de cada brazo (1 para Bernoulli; común o uno por brazo).
+        :param alpha0: Parámetro alpha de la priori Beta (éxitos ficticios).
+        :param beta0: Parámetro beta de la priori Beta (fracasos ficticios).
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert alpha0 > 0 and beta0 > 0, "Los parámetros de la priori Beta deben ser positivos."
+        assert np.all(np.asarray(n) > 0), "El número de ensayos n debe ser mayor que 0."
+
+        super().__init__(k, rng)
+        self.n = n
+        self.alpha0 = alpha0
+        self.beta0 = beta0
+        self._trials = np.broadcast_to(np.asarray(n, dtype=float), (k,))
+        self._scale = None if np.all(self._trials == self._trials[0]) else self._trials  # Solo si n varía por brazo
+        self.reset()
+
+    def select_arm(self):
+        """
+        Selecciona el brazo con mayor recompensa esperada según una muestra de cada posterior.
+
+        :return: Índice del brazo seleccionado (vector con uno por ejecución en modo por lotes).
+        """
+        samples = self.rng.beta(self.alpha, self.beta)
+        if self._scale is not None:
+            samples *= self._scale
+        if self.runs is not None:
+            return np.argmax(samples, axis=1)
+        return int(np.argmax(samples))
+
+    def update(self, chosen_arm, reward):
+        """
+        Actualiza la media del brazo seleccionado y su posterior Beta.
+
+        :param chosen_arm: Índice del brazo que fue tirado (vector en modo por lotes).
+        :param reward: Número de éxitos obtenidos (vector en modo por lotes).
+        """
+        trials = self._trials[chosen_arm]
+        assert np.all((0 <= reward) & (reward <= trials)), \
+            "La recompensa debe estar entre 0 y el número de ensayos n del brazo."
+        super().update(chosen_arm, reward)
+        index = chosen_arm if self.runs is None else (self._rows, chosen_arm)
+        self.alpha[index] += reward
+        self.beta[index] += trials - reward
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las medias y las posteriores Beta con un lote de observaciones.
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Número de éxitos de cada observación.
+        """
+        arms, rewards, n, sums = self._aggregate(arms, rewards)
+        assert np.all((rewards >= 0) & (rewards <= self._trials[arms])), \
+            "Cada recompensa debe estar entre 0 y el número de ensayos n de su brazo."
+        self._update_aggregated(arms, rewards, n, sums)
+        self.alpha += sums
+        self.beta += n * self._trials - sums
+
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos con n muestras independientes de las posteriores, en una sola llamada a rng.beta.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        samples = self.rng.beta(self.alpha, self.beta, size=(n, self.k))
+        if self._scale is not None:
+            samples *= self._scale
+        return np.argmax(samples, axis=1)
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo y las posteriores a la priori.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        self.alpha = np.full(self._state_shape(), float(self.alpha0))  # Éxitos (más la priori)
+        self.beta = np.full(self._state_shape(), float(self.beta0))  # Fracasos (más la priori)
+
+
+class GaussianThompsonSampling(Algorithm):
+
+    def __init__(self, k: int, mu0: float = 0.0, kappa0: float = 0.01, alpha0: float = 1.0, beta0: float = 1.0,
+                 sigma: Optional[float] = None, rng=None):
+        """
+        Inicializa Thompson Sampling con posterior Normal-Gamma para recompensas normales.
+
+        Con varianza desconocida (sigma None) cada brazo tiene una posterior Normal-Gamma sobre
+        su media mu y su precisión lambda: lambda ~ Gamma(alpha, beta) y mu | lambda ~
+        N(mean, 1 / (kappa * lambda)). Con sigma conocida la posterior de la media es
+        N(mean, sigma^2 / kappa). En cada paso se muestrean las k posteriores con una llamada
+        vectorizada por variable y se elige el brazo con mayor media muestreada. Cada
+        observación actualiza la posterior de su brazo en O(1).
+
+        :param k: Número de brazos.
+        :param mu0: Media a priori.
+        :param kappa0: Número de observaciones ficticias de la media a priori (confianza en mu0).
+        :param alpha0: Parámetro de forma de la priori Gamma de la precisión.
+        :param beta0: Parámetro de tasa de la priori Gamma de la precisión.
+        :param sigma: (Opcional) Desviación estándar conocida de las recompensas.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert kappa0 > 0, "El parámetro kappa0 debe ser positivo."
+        assert alpha0 > 0 and beta0 > 0, "Los parámetros de la priori Gamma deben ser positivos."
+        assert sigma is None or sigma > 0, "La desviación estándar sigma debe ser positiva."
+
+        super().__init__(k, rng)
+        self.mu0 = mu0
+        self.kappa0 = kappa0
+        self.alpha0 = alpha0
+        self.beta0 = beta0
+        self.sigma = sigma
+        self.reset()
+
+    def select_arm(self):
+        """
+        Selecciona el brazo con mayor media según una muestra de cada posterior.
+
+        :return: Índice del brazo seleccionado (vector con uno por ejecución en modo por lotes).
+        """
+        if self.sigma is None:
+            precision = self.rng.gamma(self.alpha, 1.0 / self.beta)
+            std = 1.0 / np.sqrt(self.kappa * precision)
+        else:
+            std = self.sigma / np.sqrt(self.kappa)
+        samples = self.rng.normal(self.mean, std)
+        if self.runs is not None:
+            return np.argmax(samples, axis=1)
+        return int(np.argmax(samples))
+
+    def update(self, chosen_arm, reward):
+        """
+        Actualiza la media del brazo seleccionado y su posterior con una observación.
+
+        :param chosen_arm: Índice del brazo que fue tirado (vector en modo por lotes).
+        :param reward: Recompensa obtenida (vector en modo por lotes).
+        """
+        super().update(chosen_arm, reward)
+        index = chosen_arm if self.runs is None else (self._rows, chosen_arm)
+        kappa, mean = self.kappa[index], self.mean[index]
+        self.beta[index] += kappa * (reward - mean) ** 2 / (2 * (kappa + 1))
+        self.alpha[index] += 0.5
+        self.mean[index] = (kappa * mean + reward) / (kappa + 1)
+        self.kappa[index] = kappa + 1
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las medias y las posteriores con un lote de observaciones.
+
+        La actualización conjugada con las n observaciones de un brazo (media m y suma de
+        cuadrados de las desviaciones S) equivale a aplicarlas una a una:
+        kappa' = kappa + n, mean' = (kappa mean + n m) / kappa', alpha' = alpha + n / 2 y
+        beta' = beta + S / 2 + kappa n (m - mean)^2 / (2 kappa').
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        arms, rewards, n, sums = self._aggregate(arms, rewards)
+        self._update_aggregated(arms, rewards, n, sums)
+        batch_means = sums / np.maximum(n, 1)
+        squares = np.bincount(arms, weights=(rewards - batch_means[arms]) ** 2, minlength=self.k)
+
+        kappa = self.kappa + n
+        self.beta += squares / 2 + self.kappa * n * (batch_means - self.mean) ** 2 / (2 * kappa)
+        self.alpha += n / 2
+        self.mean = (self.kappa * self.mean + sums) / kappa
+        self.kappa = kappa
+
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos con n muestras independientes de las posteriores, en una llamada vectorizada por variable.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        shape = (n, self.k)
+        if self.sigma is None:
+            precision = self.rng.gamma(self.alpha, 1.0 / self.beta, size=shape)
+            std = 1.0 / np.sqrt(self.kappa * precision)
+        else:
+            std = self.sigma / np.sqrt(self.kappa)
+        return np.argmax(self.rng.normal(self.mean, std, size=shape), axis=1)
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo y las posteriores a la priori.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        shape = self._state_shape()
+        self.mean = np.full(shape, float(self.mu0))  # Media a posteriori
+        self.kappa = np.full(shape, float(self.kappa0))  # Observaciones (más las ficticias) de la media
+        self.alpha = np.full(shape, float(self.alpha0))  # Forma de la posterior de la precisión
+        self.beta = np.full(shape, float(self.beta0))  # Tasa de la posterior de la precisión
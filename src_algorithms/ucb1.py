@@ -11,21 +11,25 @@ with the additional restriction that it may not be used for commercial purposes.
 
 For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
+from typing import Optional
+
 import numpy as np
 from src_algorithms.algorithm import Algorithm
 
 class UCB1(Algorithm):
 
-    def __init__(self, k: int, c: float = 1.0):
+    def __init__(self, k: int, c: float = 1.0, rng=None):
         """
         Inicializa el algoritmo UCB1.
 
         :param k: Número de brazos.
         :param c: Parámetro de ajuste de exploración (por defecto c = 1).
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
         """
         assert c > 0, "El parámetro c debe ser mayor que 0."
-        super().__init__(k)
+        super().__init__(k, rng)
         self.c = c
+        self.reset()
 
     def select_arm(self) -> int:
         """
@@ -33,20 +37,107 @@ class UCB1(Algorithm):
         
         :return: Índice del brazo seleccionado.
         """
+        if self.runs is not None:
+            return self._select_arms()
+
         # Si algún brazo no ha sido seleccionado, lo seleccionamos primero (exploración inicial)
-        if 0 in self.counts:
-            return int(np.argmin(self.counts))
+        if self._first_unplayed() < self.k:
+            return self._next_unplayed
 
-        # Calcular t como el número total de iteraciones
-        t = np.sum(self.counts)
+        # t es el número total de iteraciones, mantenido incrementalmente en update
+        t = self.t
         # Calculamos UCB1 para cada brazo
-        ucb_values = self.values + self.c * np.sqrt((2 * np.log(t)) / self.counts)
+        ucb_values = self._ucb_values(t, self.counts)
         # Seleccionamos el brazo con el mayor valor de UCB1
         return int(np.argmax(ucb_values))
 
-    def reset(self):
+    def _select_arms(self) -> np.ndarray:
+        """
+        Selecciona un brazo en cada ejecución del lote (argmax por fila del índice UCB1).
+
+        :return: Vector con el brazo seleccionado en cada ejecución.
+        """
+        t = self.t[:, np.newaxis]
+        if self._next_unplayed >= self.k:
+            ucb_values = self._ucb_values(t, self.counts)
+            return np.argmax(ucb_values, axis=1)
+
+        # Las filas con brazos sin probar se resuelven después, se evita dividir entre 0
+        counts = np.maximum(self.counts, 1)
+        ucb_values = self._ucb_values(np.maximum(t, 1), counts)
+        chosen_arms = np.argmax(ucb_values, axis=1)
+
+        # Exploración inicial en las ejecuciones que aún tienen algún brazo sin seleccionar
+        unexplored = np.min(self.counts, axis=1) == 0
+        if not unexplored.any():
+            self._next_unplayed = self.k  # Ninguna fila volverá a tener brazos sin probar
+        chosen_arms[unexplored] = np.argmin(self.counts[unexplored], axis=1)
+        return chosen_arms
+
+    def _ucb_values(self, t, counts: np.ndarray) -> np.ndarray:
+        """
+        Calcula el índice UCB1 de cada brazo; las variantes de UCB redefinen este método.
+
+        :param t: Número total de iteraciones (vector columna en modo por lotes).
+        :param counts: Número de selecciones de cada brazo (todas mayores que 0).
+        :return: Índice de cada brazo, con la forma de values.
+        """
+        return self.values + self.c * np.sqrt((2 * np.log(t)) / counts)
+
+    def _first_unplayed(self) -> int:
+        """
+        Avanza el puntero de exploración inicial hasta el primer brazo sin seleccionar.
+
+        counts nunca decrece, así que el puntero solo avanza y el coste total es O(k).
+        :return: Índice del primer brazo sin seleccionar, o k si ya se han probado todos.
+        """
+        while self._next_unplayed < self.k and self.counts[self._next_unplayed] != 0:
+            self._next_unplayed += 1
+        return self._next_unplayed
+
+    def update(self, chosen_arm, reward):
+        """
+        Actualiza la estimación del brazo seleccionado y el número total de iteraciones.
+
+        :param chosen_arm: Índice del brazo que fue tirado.
+        :param reward: Recompensa obtenida.
+        """
+        super().update(chosen_arm, reward)
+        self.t += 1
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las estimaciones con un lote de observaciones y avanza el número total de iteraciones.
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        super().update_batch(arms, rewards)
+        self.t += np.size(arms)
+
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos con el estado actual.
+
+        La política es determinista: mientras haya brazos sin seleccionar se reparten entre
+        ellos las n decisiones y, si no, las n decisiones son el brazo de mayor índice.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        unplayed = np.flatnonzero(self.counts == 0)
+        if unplayed.size:
+            return np.resize(unplayed, n)
+        return np.full(n, int(self.select_arm()))
+
+    def reset(self, runs: Optional[int] = None, rng=None):
         """
         Reinicia el estado del algoritmo.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
         """
-        self.counts = np.zeros(self.k, dtype=int)
-        self.values = np.zeros(self.k, dtype=float)
+        super().reset(runs, rng)
+        self.t = 0 if runs is None else np.zeros(runs, dtype=int)  # Número total de iteraciones
+        self._next_unplayed = 0  # Primer brazo que puede no haberse seleccionado todavía
@@ -0,0 +1,311 @@
+"""
+Module: src_algorithms/ucb1Tree.py
+Description: Implementación de UCB1 con un árbol de torneo cinético para problemas con muchos brazos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import math
+from typing import Optional
+
+import numpy as np
+from src_algorithms.ucb1 import UCB1
+
+# Error relativo máximo admitido entre el índice UCB1 en coma flotante y su aproximación lineal en g
+TOLERANCE = 1e-13
+
+class UCB1Tree(UCB1):
+    # El árbol se reconstruye a partir de counts y values en la siguiente selección
+    _TRANSIENT_STATE = UCB1._TRANSIENT_STATE + ('_size', '_v', '_n', '_w', '_winner', '_expiry', '_sub_expiry',
+                                                '_tied', '_exact', '_spread')
+
+    def __init__(self, k: int, c: float = 1.0, rng=None):
+        """
+        Inicializa el algoritmo UCB1 con árbol de torneo.
+
+        El índice UCB1 se escribe como v_i + g(t) * w_i, con g(t) = c * sqrt(2 ln t) común a
+        todos los brazos y w_i = 1 / sqrt(n_i). Un árbol de torneo guarda en cada nodo el
+        brazo ganador de su subárbol y el valor de g a partir del cual ese resultado puede
+        cambiar (certificado). Así, cada paso solo recalcula el camino del brazo actualizado
+        y los nodos cuyo certificado ha caducado, en lugar de recorrer los k brazos.
+
+        Los nodos comparan el índice calculado con las mismas operaciones que UCB1 y, ante
+        empate, gana el hijo izquierdo (menor índice), como en np.argmax. Cuando el redondeo
+        puede decidir el resultado (p. ej. medias que difieren en el último bit), el nodo se
+        marca como empatado y guarda una cota de lo que el máximo de su subárbol puede superar
+        a su ganador; la selección desciende entonces por ambos hijos de los nodos empatados y
+        compara los candidatos. Así se seleccionan los mismos brazos que UCB1.
+
+        :param k: Número de brazos.
+        :param c: Parámetro de ajuste de exploración (por defecto c = 1).
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        super().__init__(k, c, rng)
+
+    def select_arm(self) -> int:
+        """
+        Selecciona un brazo basado en la política UCB1 consultando la raíz del árbol.
+
+        :return: Índice del brazo seleccionado.
+        """
+        # En modo por lotes y durante la exploración inicial se usa UCB1 directamente
+        if self.runs is not None or self._first_unplayed() < self.k:
+            return super().select_arm()
+
+        log_t, g = self._exploration()
+        if self._winner is None:
+            self._build(log_t, g)
+        elif self._sub_expiry[1] <= g:
+            self._refresh(1, log_t, g)
+        if self._exact[1]:
+            return self._winner[1]  # Sin empates por redondeo: la raíz es el argmax exacto
+        return self._search(log_t)
+
+    def update(self, chosen_arm: int, reward: float):
+        """
+        Actualiza la estimación del brazo seleccionado y el camino del árbol hasta la raíz.
+
+        :param chosen_arm: Índice del brazo que fue tirado.
+        :param reward: Recompensa obtenida.
+        """
+        super().update(chosen_arm, reward)
+        if self._winner is None or self.runs is not None:
+            return
+
+        self._v[chosen_arm] = float(self.values[chosen_arm])
+        self._n[chosen_arm] = int(self.counts[chosen_arm])
+        self._w[chosen_arm] = 1.0 / math.sqrt(self.counts[chosen_arm])
+        log_t, g = self._exploration()
+        node = (self._size + chosen_arm) >> 1
+        while node:
+            self._play(node, log_t, g)
+            node >>= 1
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las estimaciones con un lote de observaciones; el árbol se reconstruye en la siguiente selección.
+
+        :param arms: Secuencia de brazos tirados.
+        :param rewards: Recompensa de cada observación.
+        """
+        super().update_batch(arms, rewards)
+        self._winner = None
+
+    def reset(self, runs: Optional[int] = None, rng=None):
+        """
+        Reinicia el estado del algoritmo. El árbol se construye al terminar la exploración inicial.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
+        """
+        super().reset(runs, rng)
+        self._size = 1 << max(self.k - 1, 0).bit_length()  # Número de hojas (potencia de 2)
+        self._v = None  # Valores estimados por hoja (-inf en las hojas de relleno)
+        self._n = None  # Número de selecciones por hoja
+        self._w = None  # 1 / sqrt(n_i) por hoja (0 en las hojas de relleno)
+        self._winner = None  # Brazo ganador de cada nodo (raíz en 1, hojas desde size)
+        self._expiry = None  # g a partir del cual el resultado del nodo puede cambiar
+        self._sub_expiry = None  # Mínimo de _expiry en el subárbol de cada nodo
+        self._tied = None  # Nodos en los que el redondeo puede decidir el ganador
+        self._exact = None  # Nodos cuyo ganador es el argmax exacto de su subárbol (sin empates por debajo)
+        self._spread = None  # Cota de lo que el máximo del subárbol puede superar al índice del ganador
+
+    def _exploration(self):
+        """
+        Calcula los factores de exploración del paso actual.
+
+        :return: Tupla (2 ln t, g) con el término que usa UCB1 (calculado igual que en
+                 _ucb_values) y el factor común g = c * sqrt(2 ln t) de los certificados.
+        """
+        log_t = float(2 * np.log(self.t))
+        return log_t, self.c * math.sqrt(log_t)
+
+    def _index(self, arm: int, log_t: float) -> float:
+        """
+        Calcula el índice UCB1 de una hoja con las mismas operaciones que _ucb_values.
+
+        :param arm: Índice de la hoja.
+        :param log_t: Término 2 ln t del paso actual.
+        :return: Índice UCB1 del brazo (-inf en las hojas de relleno).
+        """
+        if arm >= self.k:
+            return -math.inf
+        return self._v[arm] + self.c * math.sqrt(log_t / self._n[arm])
+
+    def _build(self, log_t: float, g: float):
+        """
+        Construye el árbol completo nivel a nivel de forma vectorizada, con las mismas reglas que _play.
+
+        :param log_t: Término 2 ln t del paso actual.
+        :param g: Factor de exploración actual.
+        """
+        size = self._size
+        v = np.full(size, -np.inf)
+        v[:self.k] = self.values
+        n = np.zeros(size, dtype=int)
+        n[:self.k] = self.counts
+        w = np.zeros(size)
+        w[:self.k] = 1.0 / np.sqrt(self.counts)
+        index = np.full(size, -np.inf)
+        index[:self.k] = self._ucb_values(self.t, self.counts)
+
+        winner = np.zeros(2 * size, dtype=int)
+        expiry = np.full(2 * size, np.inf)
+        sub_expiry = np.full(2 * size, np.inf)
+        tied = np.zeros(2 * size, dtype=bool)
+        exact = np.ones(2 * size, dtype=bool)
+        spread = np.zeros(2 * size)
+        winner[size:] = np.arange(size)
+
+        level = size >> 1
+        while level:
+            nodes = np.arange(level, 2 * level)
+            a, b = winner[2 * nodes], winner[2 * nodes + 1]
+            spread_a, spread_b = spread[2 * nodes], spread[2 * nodes + 1]
+            exact_a, exact_b = exact[2 * nodes], exact[2 * nodes + 1]
+            padding = index[b] == -np.inf
+            same = ~padding & (n[a] == n[b])
+
+            # Mismas selecciones: gana la mayor media y hay empate si el perdedor es el izquierdo
+            by_value = v[a] >= v[b]
+            spread_o = np.where(by_value, spread_b, spread_a)
+            same_tied = ~by_value | (spread_o > 0)
+            same_spread = np.maximum(spread_a, spread_b)
+
+            # Distintas selecciones: certificado con margen o empate
+            left = index[a] >= index[b]
+            x, y = np.where(left, a, b), np.where(left, b, a)
+            spread_x, spread_y = np.where(left, spread_a, spread_b), np.where(left, spread_b, spread_a)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                gap = index[x] - index[y]
+                error = TOLERANCE * (np.abs(index[x]) + np.abs(index[y]) + 1)
+                margin = spread_y + error
+                dw = w[y] - w[x]
+                strict = gap > 2 * margin
+                certificate = np.where(dw > 0, g + (gap - margin) / dw, np.inf)
+                tie = np.where(dw != 0, g + error / np.abs(dw), np.inf)
+                tie_spread = np.maximum(spread_x, spread_y - gap + 2 * error)
+
+            winner[nodes] = np.where(padding, a, np.where(same, np.where(by_value, a, b), x))
+            tied[nodes] = ~padding & np.where(same, same_tied, ~strict)
+            exact[nodes] = np.where(padding, exact_a,
+                                    np.where(same, ~same_tied & np.where(by_value, exact_a, exact_b),
+                                             strict & np.where(left, exact_a, exact_b)))
+            spread[nodes] = np.where(padding, spread_a,
+                                     np.where(same, same_spread, np.where(strict, spread_x, tie_spread)))
+            expiry[nodes] = np.where(padding | same, np.inf, np.where(strict, certificate, tie))
+            sub_expiry[nodes] = np.minimum(expiry[nodes],
+                                           np.minimum(sub_expiry[2 * nodes], sub_expiry[2 * nodes + 1]))
+            level >>= 1
+
+        # Listas de Python: el acceso elemento a elemento es mucho más rápido que en numpy
+        self._v, self._n, self._w = v.tolist(), n.tolist(), w.tolist()
+        self._winner, self._expiry, self._sub_expiry = winner.tolist(), expiry.tolist(), sub_expiry.tolist()
+        self._tied, self._exact, self._spread = tied.tolist(), exact.tolist(), spread.tolist()
+
+    def _play(self, node: int, log_t: float, g: float):
+        """
+        Recalcula el ganador y el certificado de un nodo a partir de los ganadores de sus hijos.
+
+        Si ambos brazos tienen las mismas selecciones, su bono es idéntico y, como el redondeo
+        es monótono, el de mayor media nunca tiene menor índice: el resultado no caduca, pero
+        si el perdedor es el hijo izquierdo puede empatar y ganar, así que el nodo queda
+        empatado. Si no, cuando la ventaja del ganador x sobre el perdedor y supera con
+        holgura el margen (la cota del subárbol de y más el error de redondeo), el certificado
+        caduca cuando la ventaja baja al margen; en otro caso el nodo queda empatado hasta que
+        la diferencia se mueve más que el error de redondeo.
+
+        :param node: Índice del nodo interno.
+        :param log_t: Término 2 ln t del paso actual.
+        :param g: Factor de exploración actual.
+        """
+        winner, spread, exact = self._winner, self._spread, self._exact
+        left, right = 2 * node, 2 * node + 1
+        a, b = winner[left], winner[right]
+        index_a, index_b = self._index(a, log_t), self._index(b, log_t)
+        v, n, w = self._v, self._n, self._w
+
+        if index_b == -math.inf:
+            # El hijo derecho es de relleno
+            winner[node], tied, exact[node], spread[node], expiry = a, False, exact[left], spread[left], math.inf
+        elif n[a] == n[b]:
+            # Mismo bono: gana la mayor media; empate si el perdedor es el izquierdo o tiene empates
+            if v[a] >= v[b]:
+                x, exact_x, tied = a, exact[left], spread[right] > 0
+            else:
+                x, exact_x, tied = b, exact[right], True
+            winner[node], exact[node], expiry = x, exact_x and not tied, math.inf
+            spread[node] = max(spread[left], spread[right])
+        else:
+            # Ante empate gana el hijo izquierdo (menor índice), igual que np.argmax
+            if index_a >= index_b:
+                x, index_x, index_y, spread_x, spread_y, exact_x = a, index_a, index_b, spread[left], spread[right], exact[left]
+            else:
+                x, index_x, index_y, spread_x, spread_y, exact_x = b, index_b, index_a, spread[right], spread[left], exact[right]
+            y = b if x == a else a
+            gap = index_x - index_y
+            error = TOLERANCE * (abs(index_x) + abs(index_y) + 1)
+            margin = spread_y + error
+            dw = w[y] - w[x]
+            tied = gap <= 2 * margin
+            if tied:
+                # Caduca cuando la diferencia se ha movido más que el error de redondeo
+                expiry = g + error / abs(dw)
+                spread_x = max(spread_x, spread_y - gap + 2 * error)
+            else:
+                # El índice de y gana dw por unidad de g: caduca cuando la ventaja baja al margen
+                expiry = g + (gap - margin) / dw if dw > 0 else math.inf
+            winner[node], exact[node], spread[node] = x, exact_x and not tied, spread_x
+
+        self._tied[node] = tied
+        self._expiry[node] = expiry
+        self._sub_expiry[node] = min(expiry, self._sub_expiry[left], self._sub_expiry[right])
+
+    def _refresh(self, node: int, log_t: float, g: float):
+        """
+        Rehace, de abajo arriba, los nodos del subárbol cuyo certificado ha caducado.
+
+        :param node: Índice del nodo raíz del subárbol.
+        :param log_t: Término 2 ln t del paso actual.
+        :param g: Factor de exploración actual.
+        """
+        if self._sub_expiry[node] > g or node >= self._size:
+            return
+        self._refresh(2 * node, log_t, g)
+        self._refresh(2 * node + 1, log_t, g)
+        self._play(node, log_t, g)
+
+    def _search(self, log_t: float) -> int:
+        """
+        Busca el argmax exacto descendiendo por ambos hijos de los nodos empatados.
+
+        El recorrido es en profundidad y de izquierda a derecha, así que cada subárbol que se
+        visita contiene brazos de mayor índice que el mejor candidato: se descarta si su cota
+        (índice del ganador más spread) no lo supera.
+
+        :param log_t: Término 2 ln t del paso actual.
+        :return: Brazo de mayor índice UCB1 (el de menor índice ante empate).
+        """
+        winner, tied, exact, spread = self._winner, self._tied, self._exact, self._spread
+        best, best_index = -1, -math.inf
+        stack = [1]
+        while stack:
+            node = stack.pop()
+            arm = winner[node]
+            index = self._index(arm, log_t)
+            if index + spread[node] <= best_index:
+                continue
+            if exact[node]:
+                if index > best_index:
+                    best, best_index = arm, index
+            elif tied[node]:
+                stack.extend((2 * node + 1, 2 * node))
+            else:
+                stack.append(2 * node if winner[2 * node] == arm else 2 * node + 1)
+        return best
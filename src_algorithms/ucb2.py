@@ -13,13 +13,31 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 import math
-import random
+from typing import Dict, List, Optional
+
 import numpy as np
-import math
 from src_algorithms.algorithm import Algorithm
 
+# Tablas de duraciones de época tau(r) = ceil((1 + alpha_param)^r), memorizadas por alpha_param
+_TAU_TABLES: Dict[float, List[int]] = {}
+
+
+def _tau_table(alpha_param: float, size: int) -> List[int]:
+    """
+    Devuelve la tabla compartida de duraciones de época de alpha_param con al menos size entradas.
+
+    :param alpha_param: Parámetro de exploración de UCB2.
+    :param size: Número mínimo de entradas de la tabla.
+    :return: Lista con tau(r) para r = 0, 1, 2, ...
+    """
+    table = _TAU_TABLES.setdefault(alpha_param, [])
+    while len(table) < size:
+        table.append(int(math.ceil((1 + alpha_param) ** len(table))))
+    return table
+
+
 class UCB2(Algorithm):
-    def __init__(self, k: int, alpha_param: float):
+    def __init__(self, k: int, alpha_param: float, rng=None):
         """
         Inicializa el algoritmo UCB2.
 
@@ -29,33 +47,47 @@ class UCB2(Algorithm):
             Número de brazos.
         alpha_param : float
             Parámetro de exploración que afecta la duración de las épocas (0 < alpha_param < 1).
+        rng : Generator o int, opcional
+            Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
         """
         assert 0 < alpha_param < 1, "El parámetro alpha_param debe estar en (0,1)."
-        super().__init__(k)
+        super().__init__(k, rng)
         self.alpha_param = alpha_param
-        # Contador de épocas para cada brazo (inicializado a 0 para todos)
-        self.r = np.zeros(k, dtype=int)
-        self.__current_arm = None      # Brazo que se está jugando actualmente
-        self.__next_update = 0         # Instante en el que se cambiará el brazo actual
+        self.__taus = _tau_table(alpha_param, 64)  # Tabla compartida de duraciones de época
+        self.reset()
 
-    def reset(self):
+    def reset(self, runs: Optional[int] = None, rng=None):
         """
         Restablece todas las variables a su estado inicial.
+
+        :param runs: (Opcional) Número de ejecuciones simuladas a la vez (modo por lotes).
+        :param rng: (Opcional) Generador aleatorio o semilla con la que volver a sembrar la política.
         """
-        super().reset()
-        self.r = np.zeros(self.k, dtype=int)
-        self.__current_arm = None
-        self.__next_update = 0
+        super().reset(runs, rng)
+        # Contador de épocas para cada brazo (inicializado a 0 para todos)
+        self.r = np.zeros(self._state_shape(), dtype=int)
+        self.__max_r = 0               # Mayor contador de épocas alcanzado
+        self.__next_unplayed = 0       # Primer brazo que puede no haberse jugado todavía
+        if runs is None:
+            self.total_count = 0           # Número total de jugadas (suma de counts)
+            self.__current_arm = None      # Brazo que se está jugando actualmente
+            self.__next_update = 0         # Instante en el que se cambiará el brazo actual
+        else:
+            self.total_count = np.zeros(runs, dtype=int)
+            self.__current_arm = np.zeros(runs, dtype=int)
+            self.__next_update = np.zeros(runs, dtype=int)
 
     def __tau(self, r_val: int) -> int:
         """
         Calcula la duración de la época para un contador de época r_val,
-        usando la fórmula ceil((1 + alpha_param)^r_val).
+        usando la fórmula ceil((1 + alpha_param)^r_val) memorizada en la tabla compartida.
 
         :param r_val: Número de épocas acumuladas para un brazo.
         :return: Duración de la época.
         """
-        return int(math.ceil((1 + self.alpha_param) ** r_val))
+        if r_val >= len(self.__taus):
+            _tau_table(self.alpha_param, 2 * r_val + 1)
+        return self.__taus[r_val]
     
     def __bonus(self, total_count: int, r_val: int) -> float:
         """
@@ -78,41 +110,110 @@ class UCB2(Algorithm):
         :param arm: Índice del brazo a asignar.
         """
         self.__current_arm = arm
+        r_val = int(self.r[arm])
         # Actualiza el instante del próximo cambio sumando la diferencia entre épocas
-        self.__next_update += max(1, self.__tau(self.r[arm] + 1) - self.__tau(self.r[arm]))
-        self.r[arm] += 1
+        self.__next_update += max(1, self.__tau(r_val + 1) - self.__tau(r_val))
+        self.r[arm] = r_val + 1
+        self.__max_r = max(self.__max_r, r_val + 1)
 
     def select_arm(self) -> int:
         """
         Selecciona el brazo a jugar en función de la estrategia UCB2.
 
+        El total de jugadas se mantiene incrementalmente, la exploración inicial avanza un
+        puntero en lugar de recorrer los brazos y el bonus se calcula una sola vez por cada
+        contador de épocas distinto, de modo que la secuencia de selecciones es idéntica a
+        la de recalcular todo en cada paso.
+
         :return: Índice del brazo seleccionado.
         """
-        # Asegurarse de que cada brazo se juegue al menos una vez
-        for arm in range(self.k):
-            if self.counts[arm] == 0:
+        if self.runs is not None:
+            return self._select_arms()
+
+        # Asegurarse de que cada brazo se juegue al menos una vez (counts nunca decrece,
+        # así que el primer brazo sin jugar solo puede avanzar)
+        if self.__next_unplayed < self.k:
+            while self.__next_unplayed < self.k and self.counts[self.__next_unplayed] != 0:
+                self.__next_unplayed += 1
+            if self.__next_unplayed < self.k:
+                arm = self.__next_unplayed
                 self.__set_arm(arm)
                 return arm
 
-        total_counts = int(np.sum(self.counts))
+        total_counts = self.total_count
         # Si aún no se ha completado la "época" del brazo actual, continuar con él
         if self.__next_update > total_counts:
             return self.__current_arm
 
-        # Calcular el valor UCB2 para cada brazo
-        ucb_values = np.zeros(self.k)
-        for arm in range(self.k):
-            bonus = self.__bonus(total_counts, self.r[arm])
-            ucb_values[arm] = self.values[arm] + bonus
+        # Calcular el valor UCB2 para cada brazo: el bonus solo depende del contador de épocas
+        bonus = np.array([self.__bonus(total_counts, r_val) for r_val in range(self.__max_r + 1)])
+        ucb_values = self.values + bonus[self.r]
 
         # Escoger el brazo con el valor UCB2 máximo
         max_ucb = np.max(ucb_values)
         # En caso de empate, se elige uno al azar
         candidates = np.where(ucb_values == max_ucb)[0]
-        chosen_arm = int(random.choice(candidates))
+        chosen_arm = int(self.rng.choice(candidates))
         self.__set_arm(chosen_arm)
         return chosen_arm
 
+    def _select_arms(self) -> np.ndarray:
+        """
+        Selecciona el brazo a jugar en cada ejecución del lote.
+
+        Cada fila sigue la misma lógica que select_arm: primero se juega cada brazo una vez,
+        después se mantiene el brazo actual hasta que termina su época y, al terminar, se
+        elige el brazo de mayor índice UCB2 deshaciendo empates al azar.
+
+        :return: Vector con el brazo seleccionado en cada ejecución.
+        """
+        total_counts = self.total_count
+        chosen_arms = self.__current_arm.copy()
+
+        # La exploración inicial solo se comprueba mientras alguna fila tenga brazos sin jugar
+        needs_init = np.zeros(self.runs, dtype=bool)
+        if self.__next_unplayed < self.k:
+            unexplored = self.counts == 0
+            needs_init = np.any(unexplored, axis=1)
+            if not needs_init.any():
+                self.__next_unplayed = self.k
+            chosen_arms[needs_init] = np.argmax(unexplored[needs_init], axis=1)
+
+        needs_choice = ~needs_init & (self.__next_update <= total_counts)
+
+        rows = np.flatnonzero(needs_choice)
+        if rows.size:
+            tau_values = self.__tau_array(self.r[rows])
+            bonus = np.sqrt((1. + self.alpha_param) * np.log((math.e * total_counts[rows, np.newaxis]) / tau_values)
+                            / (2 * tau_values))
+            ucb_values = self.values[rows] + bonus
+
+            # Empates deshechos al azar: clave aleatoria solo para los candidatos de cada fila
+            candidates = ucb_values == np.max(ucb_values, axis=1, keepdims=True)
+            keys = np.where(candidates, self.rng.random(candidates.shape), -1.0)
+            chosen_arms[rows] = np.argmax(keys, axis=1)
+
+        # Las filas que empiezan época actualizan su contador de épocas e instante de cambio
+        rows = np.flatnonzero(needs_init | needs_choice)
+        arms = chosen_arms[rows]
+        r_values = self.r[rows, arms]
+        self.__next_update[rows] += np.maximum(1, self.__tau_array(r_values + 1) - self.__tau_array(r_values))
+        self.r[rows, arms] += 1
+
+        self.__current_arm = chosen_arms
+        return chosen_arms
+
+    def __tau_array(self, r_values: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de __tau para un array de contadores de época.
+
+        :param r_values: Contadores de época.
+        :return: Duración de la época para cada contador.
+        """
+        if r_values.size:
+            self.__tau(int(r_values.max()))  # Asegura que la tabla cubre todos los contadores
+        return np.array(self.__taus)[r_values]
+
     def update(self, chosen_arm: int, reward: float):
         """
         Actualiza las estadísticas tras jugar un brazo y observar la recompensa.
@@ -122,7 +223,47 @@ class UCB2(Algorithm):
         """
         # Se utiliza el método update de la clase base para actualizar counts y values
         super().update(chosen_arm, reward)
+        self.total_count += 1
+
+    def update_batch(self, arms, rewards):
+        """
+        Actualiza las estadísticas con un lote de observaciones.
 
+        :param arms: Secuencia de brazos jugados.
+        :param rewards: Recompensa de cada observación.
+        """
+        super().update_batch(arms, rewards)
+        self.total_count += np.size(arms)
+
+    def select_batch(self, n: int) -> np.ndarray:
+        """
+        Elige n brazos siguiendo las épocas de UCB2, sin recibir recompensas entre ellos.
+
+        Cada decisión cuenta como una jugada del brazo (counts y total_count) aunque su
+        recompensa llegue después: el brazo actual se repite hasta el final de su época y
+        entonces se elige el siguiente con los valores actuales, empezando su época. Al
+        terminar se restauran counts y total_count, que avanzan con update_batch; las épocas
+        iniciadas quedan registradas.
+
+        :param n: Número de decisiones.
+        :return: Array con los n brazos elegidos.
+        """
+        assert self.runs is None, "Las selecciones por lotes solo están disponibles en modo escalar."
+        chosen_arms = np.empty(n, dtype=int)
+        counts, total_count, next_unplayed = self.counts.copy(), self.total_count, self.__next_unplayed
+        filled = 0
+        try:
+            while filled < n:
+                arm = self.select_arm()
+                # El brazo se mantiene el resto de su época (al menos una jugada)
+                span = min(max(1, self.__next_update - self.total_count), n - filled)
+                chosen_arms[filled:filled + span] = arm
+                filled += span
+                self.counts[arm] += span
+                self.total_count += span
+        finally:
+            self.counts, self.total_count, self.__next_unplayed = counts, total_count, next_unplayed
+        return chosen_arms
 
 # """
 # Module: src_algorithms/ucb2.py
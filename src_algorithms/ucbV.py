@@ -0,0 +1,48 @@
+"""
+Module: src_algorithms/ucbV.py
+Description: Implementación del algoritmo UCB-V (UCB con estimación de la varianza) para el problema de los k-brazos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import numpy as np
+from src_algorithms.ucb1 import UCB1
+
+
+class UCBV(UCB1):
+    # UCB-V necesita la varianza empírica de cada brazo
+    track_variance = True
+
+    def __init__(self, k: int, b: float = 1.0, zeta: float = 1.2, c: float = 1.0, rng=None):
+        """
+        Inicializa el algoritmo UCB-V.
+
+        El índice de cada brazo es values + sqrt(2 V e / counts) + 3 c b e / counts, con
+        e = zeta log(t) y V la varianza empírica de sus recompensas: los brazos con poca
+        varianza reciben un bonus mucho menor que con UCB1.
+
+        :param k: Número de brazos.
+        :param b: Amplitud del rango de las recompensas.
+        :param zeta: Factor de exploración del término log(t) (zeta > 1, necesario para la cota de regret).
+        :param c: Peso del término de rango 3 b e / counts.
+        :param rng: Generador aleatorio o semilla de la política (por defecto uno nuevo sin semilla).
+        """
+        assert b > 0, "La amplitud b debe ser mayor que 0."
+        assert zeta > 1, "El parámetro zeta debe ser mayor que 1."
+        super().__init__(k, c, rng)
+        self.b = b
+        self.zeta = zeta
+
+    def _ucb_values(self, t, counts: np.ndarray) -> np.ndarray:
+        """
+        Calcula el índice UCB-V de cada brazo.
+        """
+        exploration = self.zeta * np.log(t) / counts
+        variances = self.squares / counts
+        return self.values + np.sqrt(2 * variances * exploration) + 3 * self.c * self.b * exploration
@@ -3,7 +3,10 @@ from .arm import Arm
 from .armNormal import ArmNormal
 from .armBernoulli import ArmBernoulli
 from .armBinomial import ArmBinomial
+from .armArray import ArmArray
+from .driftingArms import DriftingArms, RandomWalkNormal, PiecewiseBernoulli, ScheduledArms
 from .bandit import Bandit
+from .rng import make_generator, default_generator, generator_from_state
 
 # Lista de módulos o clases públicas
-__all__ = ['Arm', 'ArmNormal', 'Bandit', 'ArmBernoulli', 'ArmBinomial']
\ No newline at end of file
+__all__ = ['Arm', 'ArmNormal', 'Bandit', 'ArmBernoulli', 'ArmBinomial', 'ArmArray', 'DriftingArms', 'RandomWalkNormal', 'PiecewiseBernoulli', 'ScheduledArms', 'make_generator', 'default_generator', 'generator_from_state']
\ No newline at end of file
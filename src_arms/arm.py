@@ -1,25 +1,91 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def sample_grid(k: int, low: float, high: float, decimals: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws k distinct values from the grid of multiples of 10**-decimals in [low, high].
+
+    The grid indices are sampled without replacement in a single call, so the cost does
+    not depend on how close k is to the grid size.
+
+    :param k: Number of values to draw.
+    :param low: Lower bound of the range (included).
+    :param high: Upper bound of the range (included).
+    :param decimals: Number of decimals of the grid.
+    :param rng: Random generator to draw from.
+    :return: Array of k distinct values, in random order.
+    """
+    scale = 10 ** decimals
+    first, last = int(np.ceil(round(low * scale, 6))), int(np.floor(round(high * scale, 6)))
+    assert k <= last - first + 1, \
+        f"Cannot draw {k} distinct values with {decimals} decimals in [{low}, {high}]; increase decimals."
+
+    return (first + rng.choice(last - first + 1, k, replace=False)) / scale
 
 
 class Arm(ABC):
+    # Subclasses declare their parameters in __slots__, so arms carry no per-instance __dict__
+    __slots__ = ()
 
     @classmethod
-    def generate_arms(cls, k: int):
+    def generate_arms(cls, k: int, rng=None, **options) -> List['Arm']:
         """
         Generates a list of arms with random parameters.
 
         :param k: Number of arms to generate.
+        :param rng: Random generator or seed (defaults to the shared default generator).
+        :param options: Ranges and grid of the parameters, as accepted by generate_parameters.
         :return: List of arms.
         """
+        return cls.from_parameters(cls.generate_parameters(k, rng=rng, **options))
+
+    @classmethod
+    def generate_parameters(cls, k: int, rng=None, **options) -> Dict[str, np.ndarray]:
+        """
+        Generates the parameters of k arms with distinct random values, without creating the arms.
+
+        :param k: Number of arms to generate.
+        :param rng: Random generator or seed (defaults to the shared default generator).
+        :return: Dictionary mapping each parameter name to an array with one entry per arm.
+        :raises NotImplementedError: If not implemented in the subclass.
+        """
+        raise NotImplementedError("This method must be implemented by the subclass.")
+
+    @classmethod
+    def from_parameters(cls, parameters: Dict[str, np.ndarray]) -> List['Arm']:
+        """
+        Creates one arm per entry of the parameter arrays (the inverse of stack_parameters).
+
+        :param parameters: Dictionary mapping each parameter name to an array with one entry per arm.
+        :return: List of arms.
+        """
+        names = list(parameters)
+        columns = [np.asarray(parameters[name]).tolist() for name in names]
+        return [cls(**dict(zip(names, values))) for values in zip(*columns)]
+
+    @classmethod
+    def expected_values(cls, parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Computes the expected reward of every arm described by the parameter arrays.
+
+        :param parameters: Dictionary of parameter arrays, as returned by stack_parameters.
+        :return: Array with the expected value of each arm.
+        :raises NotImplementedError: If not implemented in the subclass.
+        """
         raise NotImplementedError("This method must be implemented by the subclass.")
 
     @abstractmethod
-    def pull(self):
+    def pull(self, rng=None):
         """
         Generates a reward based on the arm's distribution.
 
         This method must be implemented by derived classes.
 
+        :param rng: Random generator to draw from (defaults to the shared default generator).
+
         :raises NotImplementedError: If not implemented in the subclass.
         """
         raise NotImplementedError("This method must be implemented by the subclass.")
@@ -29,4 +95,30 @@ class Arm(ABC):
         """
         Calculates and returns the expected value of the arm's reward.
         """
-        raise NotImplementedError("This method must be implemented by the subclass.")
\ No newline at end of file
+        raise NotImplementedError("This method must be implemented by the subclass.")
+
+    @classmethod
+    def stack_parameters(cls, arms: List['Arm']) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Packs the parameters of a list of arms of this class into contiguous arrays.
+
+        Subclasses that implement sample_parameters override this method. The default
+        returns None, which makes the bandit fall back to calling pull on each arm.
+
+        :param arms: List of arms of this class.
+        :return: Dictionary mapping each parameter name to an array with one entry per arm, or None.
+        """
+        return None
+
+    @classmethod
+    def sample_parameters(cls, parameters: Dict[str, np.ndarray], size=None, rng=None) -> np.ndarray:
+        """
+        Draws rewards for arrays of parameters in a single NumPy call.
+
+        :param parameters: Dictionary of parameter arrays, as returned by stack_parameters (or a slice of it).
+        :param size: Shape of the output; parameter arrays are broadcast against it.
+        :param rng: Random generator to draw from (defaults to the shared default generator).
+        :return: Array of rewards.
+        :raises NotImplementedError: If not implemented in the subclass.
+        """
+        raise NotImplementedError("This method must be implemented by the subclass.")
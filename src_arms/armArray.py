@@ -0,0 +1,155 @@
+"""
+Module: src_arms/armArray.py
+Description: Representación de un conjunto de brazos de la misma clase como arrays de parámetros (structure of arrays).
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from functools import cached_property
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
+from src_arms.arm import Arm
+
+
+class ArmArray:
+    """
+    Secuencia de k brazos de una misma clase guardada como un array por parámetro.
+
+    Se comporta como una lista de brazos de solo lectura: len, iteración e indexación
+    devuelven objetos Arm (con __slots__) creados bajo demanda a partir de los arrays, de
+    modo que la memoria por brazo se reduce a sus parámetros (8-16 bytes). Los valores
+    esperados, el brazo óptimo y los gaps se calculan con NumPy una sola vez y se guardan,
+    por lo que construir varios bandidos sobre el mismo ArmArray no repite ningún cálculo.
+
+    Los arrays no deben modificarse una vez creado el ArmArray.
+    """
+
+    def __init__(self, arm_class: Type[Arm], parameters: Dict[str, np.ndarray]):
+        """
+        Inicializa el conjunto de brazos.
+
+        :param arm_class: Clase de todos los brazos (debe implementar sample_parameters).
+        :param parameters: Diccionario que asocia a cada parámetro un array con un valor por brazo.
+        """
+        parameters = {name: np.asarray(values) for name, values in parameters.items()}
+        sizes = {values.shape for values in parameters.values()}
+        assert len(sizes) == 1 and len(next(iter(sizes))) == 1, \
+            "Todos los parámetros deben ser vectores con un valor por brazo."
+
+        self.arm_class = arm_class
+        self.parameters = parameters
+        self._k = len(next(iter(parameters.values())))
+
+    @classmethod
+    def stack(cls, arms: List[Arm]) -> Optional['ArmArray']:
+        """
+        Agrupa una lista de brazos en un ArmArray si todos son de la misma clase.
+
+        :param arms: Lista de brazos.
+        :return: ArmArray con sus parámetros, o None si los brazos son heterogéneos o su
+                 clase no tiene muestreo vectorizado.
+        """
+        if isinstance(arms, ArmArray):
+            return arms
+        if not arms:
+            return None
+
+        arm_class = type(arms[0])
+        if any(type(arm) is not arm_class for arm in arms):
+            return None
+
+        parameters = arm_class.stack_parameters(arms)
+        return cls(arm_class, parameters) if parameters is not None else None
+
+    def __len__(self) -> int:
+        return self._k
+
+    def __getitem__(self, index: int) -> Arm:
+        """
+        Devuelve el brazo de la posición indicada, creado a partir de los arrays.
+
+        :param index: Índice del brazo.
+        :return: Brazo de la clase del conjunto.
+        :raises IndexError: Si el índice está fuera de rango.
+        """
+        return self.arm_class(**{name: values[index].item() for name, values in self.parameters.items()})
+
+    def __iter__(self):
+        names = list(self.parameters)
+        for values in zip(*(self.parameters[name].tolist() for name in names)):
+            yield self.arm_class(**dict(zip(names, values)))
+
+    def pull(self, index: int, rng=None):
+        """
+        Genera una recompensa del brazo indicado sin crear el objeto Arm.
+
+        :param index: Índice del brazo.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Recompensa obtenida del brazo.
+        """
+        return self.arm_class.sample_parameters({name: values[index] for name, values in self.parameters.items()},
+                                                None, rng)
+
+    def take(self, indices) -> Dict[str, np.ndarray]:
+        """
+        Devuelve los parámetros de los brazos indicados.
+
+        :param indices: Array de índices de brazos.
+        :return: Diccionario de arrays de parámetros con la forma de indices.
+        """
+        return {name: values[indices] for name, values in self.parameters.items()}
+
+    def sample(self, size, rng=None) -> np.ndarray:
+        """
+        Genera una recompensa de cada brazo con una sola llamada a NumPy.
+
+        :param size: Forma de la salida; su última dimensión debe ser k.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Array de recompensas.
+        """
+        return self.arm_class.sample_parameters(self.parameters, size, rng)
+
+    @cached_property
+    def expected_values(self) -> np.ndarray:
+        """
+        Valor esperado de la recompensa de cada brazo.
+        """
+        try:
+            return self.arm_class.expected_values(self.parameters)
+        except NotImplementedError:
+            return np.array([arm.get_expected_value() for arm in self])
+
+    @cached_property
+    def optimal_arm(self) -> int:
+        """
+        Índice del brazo con mayor valor esperado.
+        """
+        return int(np.argmax(self.expected_values))
+
+    @cached_property
+    def gaps(self) -> np.ndarray:
+        """
+        Diferencia entre el valor esperado del brazo óptimo y el de cada brazo.
+        """
+        return self.expected_values[self.optimal_arm] - self.expected_values
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memoria ocupada por los arrays de parámetros, en bytes.
+        """
+        return sum(values.nbytes for values in self.parameters.values())
+
+    def __str__(self):
+        """
+        Representación en cadena del conjunto de brazos.
+        """
+        return f"ArmArray({self.arm_class.__name__}, k={self._k}, parámetros={list(self.parameters)})"
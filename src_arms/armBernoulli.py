@@ -13,9 +13,12 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 import numpy as np
 
-from src_arms.arm import Arm
+from src_arms.arm import Arm, sample_grid
+from src_arms.rng import default_generator, make_generator
 
 class ArmBernoulli(Arm):
+    # Sin __dict__: cada brazo guarda solo sus parámetros
+    __slots__ = ('p',)
 
     def __init__(self, p: float):
         """
@@ -27,15 +30,40 @@ class ArmBernoulli(Arm):
 
         self.p = p
 
-    def pull(self):
+    def pull(self, rng=None):
         """
         Genera una recompensa siguiendo una distribución Bernoulli.
 
+        :param rng: Generador aleatorio (por defecto el generador compartido).
         :return: Recompensa obtenida del brazo.
         """
-        reward = np.random.binomial(1, self.p)
+        rng = default_generator() if rng is None else rng
+        reward = rng.binomial(1, self.p)
         return reward
     
+    @classmethod
+    def stack_parameters(cls, arms):
+        """
+        Agrupa los parámetros (p) de una lista de brazos en arrays contiguos.
+
+        :param arms: Lista de brazos ArmBernoulli.
+        :return: Diccionario con un array por parámetro.
+        """
+        return {'p': np.array([arm.p for arm in arms], dtype=float)}
+
+    @classmethod
+    def sample_parameters(cls, parameters, size=None, rng=None):
+        """
+        Genera recompensas de una distribución Bernoulli para arrays de parámetros en una sola llamada.
+
+        :param parameters: Diccionario de arrays de parámetros.
+        :param size: Forma de la salida.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Array de recompensas.
+        """
+        rng = default_generator() if rng is None else rng
+        return rng.binomial(1, parameters['p'], size)
+
     def get_expected_value(self) -> float:
         """
         Devuelve el valor esperado de la distribución Bernoulli.
@@ -54,27 +82,46 @@ class ArmBernoulli(Arm):
         return f"ArmBernoulli(p={self.p})"
     
     @classmethod
-    def generate_arms(cls, k: int, p_min: float = 0.1, p_max: float = 0.9):
+    def expected_values(cls, parameters):
+        """
+        Devuelve el valor esperado de cada brazo a partir de los arrays de parámetros.
+
+        :param parameters: Diccionario de arrays de parámetros.
+        :return: Array con las probabilidades de éxito.
+        """
+        return np.asarray(parameters['p'], dtype=float)
+
+    @classmethod
+    def generate_parameters(cls, k: int, p_min: float = 0.1, p_max: float = 0.9, decimals: int = 2, rng=None):
+        """
+        Genera los parámetros de k brazos con probabilidades únicas en el rango [p_min, p_max].
+
+        Las probabilidades se eligen sin reemplazamiento entre los múltiplos de 10**-decimals
+        del rango, todas a la vez (con 2 decimales y el rango por defecto hay 81 valores).
+
+        :param k: Número de brazos a generar.
+        :param p_min: Valor mínimo de la probabilidad.
+        :param p_max: Valor máximo de la probabilidad.
+        :param decimals: Número de decimales de las probabilidades (la rejilla debe tener al menos k valores).
+        :param rng: Generador aleatorio o semilla (por defecto el generador compartido).
+        :return: Diccionario con el array 'p'.
+        """
+        assert k > 0, "El número de brazos k debe ser mayor que 0."
+        assert 0 <= p_min < p_max <= 1, "Debe cumplirse 0 <= p_min < p_max <= 1."
+
+        rng = default_generator() if rng is None else make_generator(rng)
+        return {'p': sample_grid(k, p_min, p_max, decimals, rng)}
+
+    @classmethod
+    def generate_arms(cls, k: int, p_min: float = 0.1, p_max: float = 0.9, decimals: int = 2, rng=None):
         """
         Genera k brazos con probabilidades únicas en el rango [p_min, p_max].
 
         :param k: Número de brazos a generar.
         :param p_min: Valor mínimo de la probabilidad.
         :param p_max: Valor máximo de la probabilidad.
+        :param decimals: Número de decimales de las probabilidades.
+        :param rng: Generador aleatorio o semilla (por defecto el generador compartido).
         :return: Lista de brazos generados.
         """
-
-        "Normas:"
-        assert k > 0, "El número de brazos k debe ser mayor que 0."
-        assert p_min < p_max, "El valor de p_min debe ser menor que p_max."
-
-        # Generar k valores únicos de p
-        p_values = set()
-        while len(p_values) < k:
-            p = round(np.random.uniform(p_min, p_max), 2)
-            p_values.add(p)
-
-        # Crear brazos con las probabilidades generadas
-        arms = [ArmBernoulli(p) for p in p_values]
-        
-        return arms
\ No newline at end of file
+        return cls.from_parameters(cls.generate_parameters(k, p_min, p_max, decimals, rng))
@@ -15,8 +15,11 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 import numpy as np
 
 from src_arms.arm import Arm
+from src_arms.rng import default_generator, make_generator
 
 class ArmBinomial(Arm):
+    # Sin __dict__: cada brazo guarda solo sus parámetros
+    __slots__ = ('n', 'p')
 
     def __init__(self, n:int, p:float):
         """
@@ -31,16 +34,42 @@ class ArmBinomial(Arm):
         self.n = n
         self.p = p
 
-    def pull(self):
+    def pull(self, rng=None):
 
         """
         Genera una recompensa siguiendo una distribución Binomial.
 
+        :param rng: Generador aleatorio (por defecto el generador compartido).
         :return: Recompensa obtenida del brazo.
         """
-        reward = np.random.binomial(self.n, self.p)
+        rng = default_generator() if rng is None else rng
+        reward = rng.binomial(self.n, self.p)
         return reward
 
+    @classmethod
+    def stack_parameters(cls, arms):
+        """
+        Agrupa los parámetros (n, p) de una lista de brazos en arrays contiguos.
+
+        :param arms: Lista de brazos ArmBinomial.
+        :return: Diccionario con un array por parámetro.
+        """
+        return {'n': np.array([arm.n for arm in arms], dtype=int),
+                'p': np.array([arm.p for arm in arms], dtype=float)}
+
+    @classmethod
+    def sample_parameters(cls, parameters, size=None, rng=None):
+        """
+        Genera recompensas de una distribución Binomial para arrays de parámetros en una sola llamada.
+
+        :param parameters: Diccionario de arrays de parámetros.
+        :param size: Forma de la salida.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Array de recompensas.
+        """
+        rng = default_generator() if rng is None else rng
+        return rng.binomial(parameters['n'], parameters['p'], size)
+
     def get_expected_value(self) -> float:
         """
         Devuelve el valor esperado de la distribución Binomial.
@@ -60,7 +89,52 @@ class ArmBinomial(Arm):
         return f"ArmBinomial(n={self.n}, p={self.p})"
 
     @classmethod
-    def generate_arms(cls, k: int, n_min: int = 2, n_max: int = 20, p_min: float = 0.1, p_max: float = 0.9):
+    def expected_values(cls, parameters):
+        """
+        Devuelve el valor esperado (n * p) de cada brazo a partir de los arrays de parámetros.
+
+        :param parameters: Diccionario de arrays de parámetros.
+        :return: Array con los valores esperados.
+        """
+        return np.asarray(parameters['n']) * np.asarray(parameters['p'], dtype=float)
+
+    @classmethod
+    def generate_parameters(cls, k: int, n_min: int = 2, n_max: int = 20, p_min: float = 0.1, p_max: float = 0.9,
+                            decimals: int = 2, rng=None):
+        """
+        Genera los parámetros de k brazos con pares (n, p) únicos dentro de los rangos especificados.
+
+        Los pares se eligen sin reemplazamiento, todos a la vez, entre las combinaciones de
+        los enteros de [n_min, n_max] y los múltiplos de 10**-decimals de [p_min, p_max].
+
+        :param k: Número de brazos a generar.
+        :param n_min: Valor mínimo de n (ensayos).
+        :param n_max: Valor máximo de n (ensayos).
+        :param p_min: Valor mínimo de la probabilidad de éxito.
+        :param p_max: Valor máximo de la probabilidad de éxito.
+        :param decimals: Número de decimales de las probabilidades.
+        :param rng: Generador aleatorio o semilla (por defecto el generador compartido).
+        :return: Diccionario con los arrays 'n' y 'p'.
+        """
+        assert k > 0, "El número de brazos k debe ser mayor que 0."
+        assert 0 < n_min < n_max, "Debe cumplirse 0 < n_min < n_max."
+        assert 0 <= p_min < p_max <= 1, "Debe cumplirse 0 <= p_min < p_max <= 1."
+
+        rng = default_generator() if rng is None else make_generator(rng)
+
+        # Cada par (n, p) es un índice de la rejilla producto: n varía en las filas y p en las columnas
+        scale = 10 ** decimals
+        first, last = int(np.ceil(round(p_min * scale, 6))), int(np.floor(round(p_max * scale, 6)))
+        n_values, p_values = n_max - n_min + 1, last - first + 1
+        assert k <= n_values * p_values, \
+            f"No hay {k} pares (n, p) distintos con {decimals} decimales en los rangos indicados."
+
+        cells = rng.choice(n_values * p_values, k, replace=False)
+        return {'n': n_min + cells // p_values, 'p': (first + cells % p_values) / scale}
+
+    @classmethod
+    def generate_arms(cls, k: int, n_min: int = 2, n_max: int = 20, p_min: float = 0.1, p_max: float = 0.9,
+                      decimals: int = 2, rng=None):
         """
         Genera k brazos con parámetros únicos dentro de los rangos especificados.
 
@@ -69,32 +143,8 @@ class ArmBinomial(Arm):
         :param n_max: Valor máximo de n (ensayos).
         :param p_min: Valor mínimo de la probabilidad de éxito.
         :param p_max: Valor máximo de la probabilidad de éxito.
+        :param decimals: Número de decimales de las probabilidades.
+        :param rng: Generador aleatorio o semilla (por defecto el generador compartido).
         :return: Lista de brazos generados.
         """
-        "Normas:"
-
-        assert k > 0, "El número de brazos k debe ser mayor que 0."
-        assert n_min < n_max, "n_min debe ser menor que n_max."
-        assert p_min < p_max , "p_min debe ser menor que p_max"
-
-        arms = []
-
-        while len(arms) < k:
-            p = round(np.random.uniform(p_min, p_max), 2)
-            n = round(np.random.randint(n_min, n_max + 1),2)
-            arm = ArmBinomial(n, p)
-            
-            """ 
-            Se pueden generar brazos repetidos, lo que hace que no se incluyan en la lista y no se genern k brazos.
-            Por lo que se añade la siguiente condición para que se añadan a la lista de brazos generados.
-            """
-            if arm not in arms: 
-                arms.append(arm) 
-
-        # arms = []
-        # for _ in range(k):
-        #     n = np.random.randint(n_min, n_max + 1)  # Selecciona un número de ensayos aleatorio
-        #     p = round(np.random.uniform(p_min, p_max), 2)  # Selecciona una probabilidad aleatoria
-        #     arms.append(ArmBinomial(n, p))
-
-        return arms
\ No newline at end of file
+        return cls.from_parameters(cls.generate_parameters(k, n_min, n_max, p_min, p_max, decimals, rng))
@@ -13,10 +13,14 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 import numpy as np
 
-from src_arms.arm import Arm
+from src_arms.arm import Arm, sample_grid
+from src_arms.rng import default_generator, make_generator
 
 
 class ArmNormal(Arm):
+    # Sin __dict__: cada brazo guarda solo sus parámetros
+    __slots__ = ('mu', 'sigma')
+
     def __init__(self, mu: float, sigma: float):
         """
         Inicializa el brazo con distribución normal.
@@ -29,15 +33,41 @@ class ArmNormal(Arm):
         self.mu = mu
         self.sigma = sigma
 
-    def pull(self):
+    def pull(self, rng=None):
         """
         Genera una recompensa siguiendo una distribución normal.
 
+        :param rng: Generador aleatorio (por defecto el generador compartido).
         :return: Recompensa obtenida del brazo.
         """
-        reward = np.random.normal(self.mu, self.sigma)
+        rng = default_generator() if rng is None else rng
+        reward = rng.normal(self.mu, self.sigma)
         return reward
 
+    @classmethod
+    def stack_parameters(cls, arms):
+        """
+        Agrupa los parámetros (mu, sigma) de una lista de brazos en arrays contiguos.
+
+        :param arms: Lista de brazos ArmNormal.
+        :return: Diccionario con un array por parámetro.
+        """
+        return {'mu': np.array([arm.mu for arm in arms], dtype=float),
+                'sigma': np.array([arm.sigma for arm in arms], dtype=float)}
+
+    @classmethod
+    def sample_parameters(cls, parameters, size=None, rng=None):
+        """
+        Genera recompensas de una distribución normal para arrays de parámetros en una sola llamada.
+
+        :param parameters: Diccionario de arrays de parámetros.
+        :param size: Forma de la salida.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Array de recompensas.
+        """
+        rng = default_generator() if rng is None else rng
+        return rng.normal(parameters['mu'], parameters['sigma'], size)
+
     def get_expected_value(self) -> float:
         """
         Devuelve el valor esperado de la distribución normal.
@@ -56,28 +86,52 @@ class ArmNormal(Arm):
         return f"ArmNormal(mu={self.mu}, sigma={self.sigma})"
 
     @classmethod
-    def generate_arms(cls, k: int, mu_min: float = 1, mu_max: float = 10.0):
+    def expected_values(cls, parameters):
         """
-        Genera k brazos con medias únicas en el rango [mu_min, mu_max].
+        Devuelve el valor esperado de cada brazo a partir de los arrays de parámetros.
+
+        :param parameters: Diccionario de arrays de parámetros.
+        :return: Array con las medias.
+        """
+        return np.asarray(parameters['mu'], dtype=float)
+
+    @classmethod
+    def generate_parameters(cls, k: int, mu_min: float = 1, mu_max: float = 10.0, sigma: float = 1.0,
+                            decimals: int = 2, rng=None):
+        """
+        Genera los parámetros de k brazos con medias únicas en el rango [mu_min, mu_max].
+
+        Las medias se eligen sin reemplazamiento entre los múltiplos de 10**-decimals del
+        rango, todas a la vez, por lo que el coste es lineal en k.
 
         :param k: Número de brazos a generar.
         :param mu_min: Valor mínimo de la media.
         :param mu_max: Valor máximo de la media.
-        :return: Lista de brazos generados.
+        :param sigma: Desviación estándar común de los brazos.
+        :param decimals: Número de decimales de las medias (la rejilla debe tener al menos k valores).
+        :param rng: Generador aleatorio o semilla (por defecto el generador compartido).
+        :return: Diccionario con los arrays 'mu' y 'sigma'.
         """
+        rng = default_generator() if rng is None else make_generator(rng)
         assert k > 0, "El número de brazos k debe ser mayor que 0."
         assert mu_min < mu_max, "El valor de mu_min debe ser menor que mu_max."
+        assert sigma > 0, "La desviación estándar sigma debe ser positiva."
 
-        # Generar k- valores únicos de mu con decimales
-        mu_values = set()
-        while len(mu_values) < k:
-            mu = np.random.uniform(mu_min, mu_max)
-            mu = round(mu, 2)
-            mu_values.add(mu)
-
-        mu_values = list(mu_values)
-        sigma = 1.0
+        mu = sample_grid(k, mu_min, mu_max, decimals, rng)
+        return {'mu': mu, 'sigma': np.full(k, float(sigma))}
 
-        arms = [ArmNormal(mu, sigma) for mu in mu_values]
+    @classmethod
+    def generate_arms(cls, k: int, mu_min: float = 1, mu_max: float = 10.0, sigma: float = 1.0,
+                      decimals: int = 2, rng=None):
+        """
+        Genera k brazos con medias únicas en el rango [mu_min, mu_max].
 
-        return arms
\ No newline at end of file
+        :param k: Número de brazos a generar.
+        :param mu_min: Valor mínimo de la media.
+        :param mu_max: Valor máximo de la media.
+        :param sigma: Desviación estándar común de los brazos.
+        :param decimals: Número de decimales de las medias.
+        :param rng: Generador aleatorio o semilla (por defecto el generador compartido).
+        :return: Lista de brazos generados.
+        """
+        return cls.from_parameters(cls.generate_parameters(k, mu_min, mu_max, sigma, decimals, rng))
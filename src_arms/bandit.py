@@ -1,60 +1,199 @@
 # bandit.py
-from typing import List
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 import numpy as np
 
 from src_arms.arm import Arm
+from src_arms.armArray import ArmArray
+from src_arms.driftingArms import DriftingArms
 
 
 class Bandit:
-    def __init__(self, arms: List[Arm]):
+    def __init__(self, arms: Union[List[Arm], ArmArray, DriftingArms]):
         """
         Initializes the bandit with a list of arms.
 
-        :param arms: List of instances of classes derived from Arm.
-        :type arms: list of Arm
+        Arms of a single class are packed into an ArmArray (structure of arrays), which
+        holds the parameters, expected values, optimal arm and gaps as NumPy arrays, and
+        which then replaces the list as the arms attribute (a read-only sequence of Arm
+        objects). Passing an ArmArray, such as the arms of another bandit, reuses it without
+        any copy or per-arm work, so Bandit(bandit.arms) is cheap even for bandits built
+        from a list.
+
+        With DriftingArms the bandit is non-stationary: pulls take the time step t, and
+        optimal_arms/optimal_rewards give the optimal arm of every step. The attributes
+        expected_rewards, optimal_arm and gaps then describe the arms at step 0.
+
+        :param arms: List of instances of classes derived from Arm, an ArmArray or DriftingArms.
+        :type arms: list of Arm, ArmArray or DriftingArms
         """
-        self.arms = arms
         self.k = len(arms)
-        self.expected_rewards = self.get_expected_rewards()
-        self.optimal_arm = self.get_optimal_arm()
+        self.stationary = not isinstance(arms, DriftingArms)
+        # Parameters of all arms packed into contiguous arrays (None if arms are heterogeneous
+        # or their class has no vectorized sampler)
+        self._array = ArmArray.stack(arms) if self.stationary else arms.initial
+        # The packed arms replace the list, so that bandits built from these arms reuse them
+        self.arms = self._array if self.stationary and self._array is not None else arms
+        if self._array is not None:
+            self.expected_rewards = self._array.expected_values
+            self.optimal_arm = self._array.optimal_arm
+            self.gaps = self._array.gaps
+        else:
+            self.expected_rewards = self.get_expected_rewards()
+            self.optimal_arm = self.get_optimal_arm()
+            self.gaps = self.expected_rewards[self.optimal_arm] - self.expected_rewards
+
+    @classmethod
+    def from_parameters(cls, arm_class: Type[Arm], parameters: Dict[str, np.ndarray]) -> 'Bandit':
+        """
+        Builds an array-backed bandit directly from parameter arrays, without creating arm objects.
+
+        :param arm_class: Class of every arm (must implement sample_parameters).
+        :param parameters: Dictionary mapping each parameter name to an array with one entry per arm.
+        :return: Bandit over the arms described by the arrays.
+        """
+        return cls(ArmArray(arm_class, parameters))
+
+    @classmethod
+    def generate(cls, arm_class: Type[Arm], k: int, rng=None, **options) -> 'Bandit':
+        """
+        Generates an array-backed bandit of k arms with distinct random parameters.
+
+        :param arm_class: Class of the arms (ArmNormal, ArmBernoulli, ArmBinomial...).
+        :param k: Number of arms.
+        :param rng: Random generator or seed (defaults to the shared default generator).
+        :param options: Ranges and grid of the parameters, as accepted by arm_class.generate_parameters.
+        :return: Bandit over the generated arms.
+        """
+        return cls.from_parameters(arm_class, arm_class.generate_parameters(k, rng=rng, **options))
+
+    @property
+    def arm_class(self) -> Optional[Type[Arm]]:
+        """
+        Class shared by all arms, or None if the arms are heterogeneous.
+        """
+        return self._array.arm_class if self._array is not None else None
+
+    @property
+    def parameters(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Parameter arrays of the arms, or None if the arms are heterogeneous.
+        """
+        return self._array.parameters if self._array is not None else None
 
-    def pull_arm(self, index: int) -> float:
+    def pull_arm(self, index: int, rng=None, t: int = 0) -> float:
         """
         Pulls a specific arm and returns the reward.
 
         :param index: Index of the arm to pull (0 to k-1).
+        :param rng: Random generator to draw from (defaults to the shared default generator).
+        :param t: Time step of the pull (only used by non-stationary bandits).
         :return: Reward obtained from the arm.
         :raises IndexError: If the index is out of the valid range.
         """
         if index < 0 or index >= self.k:
             raise IndexError("Arm index out of range.")
 
-        reward = self.arms[index].pull()
+        if not self.stationary:
+            return self.arms.pull(index, t, rng)
+        if self.arms is self._array:
+            return self._array.pull(index, rng)
+
+        reward = self.arms[index].pull(rng)
         return reward
 
+    def pull_many(self, indices, rng=None, t: int = 0) -> np.ndarray:
+        """
+        Pulls a vector (or any array) of arms at once and returns one reward per index.
+
+        When all arms share a class with a vectorized sampler the rewards are drawn in a
+        single NumPy call; otherwise each arm's pull method is called in turn.
+
+        :param indices: Array of arm indices (0 to k-1).
+        :param rng: Random generator to draw from (defaults to the shared default generator).
+        :param t: Time step of the pulls (only used by non-stationary bandits).
+        :return: Array of rewards with the same shape as indices.
+        :raises IndexError: If any index is out of the valid range.
+        """
+        indices = np.asarray(indices)
+        if indices.size and (indices.min() < 0 or indices.max() >= self.k):
+            raise IndexError("Arm index out of range.")
+
+        if not self.stationary:
+            return self.arms.pull_many(indices, t, rng)
+
+        if self._array is None:
+            rewards = [self.arms[index].pull(rng) for index in indices.ravel()]
+            return np.array(rewards, dtype=float).reshape(indices.shape)
+
+        return self._array.arm_class.sample_parameters(self._array.take(indices), indices.shape, rng)
+
+    def sample(self, shape: Tuple[int, ...] = (), rng=None, start: int = 0) -> np.ndarray:
+        """
+        Draws rewards for every arm of the bandit.
+
+        :param shape: Leading shape of the sample; the output has shape shape + (k,). For
+                      non-stationary bandits its last axis indexes consecutive time steps.
+        :param rng: Random generator to draw from (defaults to the shared default generator).
+        :param start: Time step of the first sample along the last axis of shape (non-stationary bandits).
+        :return: Array of rewards where the last axis indexes the arm.
+        """
+        if not self.stationary:
+            return self.arms.sample(shape, start, rng)
+
+        size = tuple(shape) + (self.k,)
+        if self._array is None:
+            indices = np.broadcast_to(np.arange(self.k), size)
+            return self.pull_many(indices, rng)
+
+        return self._array.sample(size, rng)
+
+    def optimal_arms(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns the optimal arm at every time step in [start, stop).
+
+        :param start: First time step (included).
+        :param stop: Last time step (excluded).
+        :return: Array of arm indices, one per step.
+        """
+        if not self.stationary:
+            return self.arms.optimal_arms(start, stop)
+        return np.full(stop - start, self.optimal_arm)
+
+    def optimal_rewards(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns the expected reward of the optimal arm at every time step in [start, stop).
+
+        :param start: First time step (included).
+        :param stop: Last time step (excluded).
+        :return: Array of expected rewards, one per step.
+        """
+        if not self.stationary:
+            return self.arms.optimal_values(start, stop)
+        return np.full(stop - start, self.expected_rewards[self.optimal_arm], dtype=float)
+
     def get_optimal_arm(self) -> int:
         """
-        Identifies the arm with the highest expected reward.
+        Identifies the arm with the highest expected reward (cached in the optimal_arm attribute).
 
         :return: Index of the optimal arm.
         """
 
-        optimal_arm = np.argmax(self.expected_rewards)
+        optimal_arm = int(np.argmax(self.expected_rewards))
         return optimal_arm
 
-    def get_expected_rewards(self) -> List[float]:
+    def get_expected_rewards(self) -> np.ndarray:
         """
-        Returns the reward of each arm in the bandit.
+        Returns the expected reward of each arm in the bandit.
 
-        :return: List of rewards for each arm.
-        :rtype: list of float or int
+        :return: Array of expected rewards for each arm.
         """
-        rewards = [arm.get_expected_value() for arm in self.arms]
-        return rewards
+        if self._array is not None:
+            return self._array.expected_values
+        return np.array([arm.get_expected_value() for arm in self.arms])
 
     def get_expected_value(self, numer_arm):
-        return self.arms[numer_arm].get_expected_value()
+        return self.expected_rewards[numer_arm]
 
     def __len__(self):
         """
@@ -0,0 +1,407 @@
+"""
+Module: src_arms/driftingArms.py
+Description: Brazos no estacionarios cuyos parámetros varían con el tiempo (deriva, cambios por tramos y cambios programados).
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence, Type, Union
+
+import numpy as np
+
+from src_arms.arm import Arm
+from src_arms.armArray import ArmArray
+from src_arms.armBernoulli import ArmBernoulli
+from src_arms.armNormal import ArmNormal
+from src_arms.rng import make_generator
+
+# Memoria (en bytes) que pueden ocupar los bloques de parámetros que se mantienen generados
+CACHE_BYTES = 256 * 2 ** 20
+
+
+class DriftingArms(ABC):
+    """
+    Conjunto de k brazos de una misma clase cuyos parámetros dependen del paso de tiempo.
+
+    La trayectoria de los parámetros es un escenario fijo, determinado por seed y común a
+    todas las ejecuciones y algoritmos, igual que los parámetros de un bandido estacionario.
+    Se calcula de forma perezosa y vectorizada por bloques de block_size pasos: cada bloque
+    es un array (block_size x k) por parámetro, generado con su propio generador a partir
+    del estado al final del bloque anterior. Se guardan los estados al comienzo de cada
+    bloque (un vector de k valores) y tantos bloques como caben en CACHE_BYTES, cada uno
+    con sus parámetros (block_size x k por parámetro) y el brazo óptimo y su valor esperado
+    en cada paso, de modo que tirar de un brazo solo indexa arrays ya calculados y la
+    memoria no crece con la longitud de la trayectoria.
+
+    Cuando la caché está llena se descarta el último bloque añadido en lugar del menos
+    usado: el motor serie recorre la trayectoria desde el paso 0 en cada ejecución y, con
+    LRU, una trayectoria que no cabe entera se regeneraría completa en cada una; así solo
+    se regeneran los bloques que no caben.
+
+    Como secuencia (len, indexación, iteración) se comporta como los brazos en el paso 0.
+    """
+
+    def __init__(self, arm_class: Type[Arm], k: int, block_size: int = 1024, seed=None):
+        """
+        Inicializa el conjunto de brazos.
+
+        :param arm_class: Clase de los brazos (debe implementar sample_parameters y expected_values).
+        :param k: Número de brazos.
+        :param block_size: Número de pasos de cada bloque de parámetros.
+        :param seed: (Opcional) Semilla de la trayectoria de los parámetros.
+        """
+        assert k > 0, "El número de brazos k debe ser mayor que 0."
+        assert block_size > 0, "El tamaño de bloque debe ser mayor que 0."
+
+        self.arm_class = arm_class
+        self.k = k
+        self.block_size = block_size
+        self.seed_sequence = np.random.SeedSequence(seed)
+        # Estado al comienzo de cada bloque ya alcanzado
+        self._states = [self._initial_state()]
+        # Bloques en memoria (índice -> (parámetros, brazo óptimo y su valor esperado en cada paso)) y cuántos caben
+        self._blocks: Dict[int, tuple] = {}
+        self._capacity = None
+
+    @abstractmethod
+    def _initial_state(self):
+        """
+        Devuelve el estado en el paso 0.
+        """
+        raise NotImplementedError("Este método debe ser implementado por la subclase.")
+
+    @abstractmethod
+    def _generate(self, block: int, state, rng: np.random.Generator):
+        """
+        Genera los parámetros de un bloque de pasos.
+
+        :param block: Índice del bloque (pasos [block * block_size, (block + 1) * block_size)).
+        :param state: Estado al comienzo del bloque.
+        :param rng: Generador propio del bloque.
+        :return: Tupla (diccionario de arrays (block_size x k), estado al comienzo del bloque siguiente).
+        """
+        raise NotImplementedError("Este método debe ser implementado por la subclase.")
+
+    def _entry(self, block: int) -> tuple:
+        """
+        Devuelve un bloque en memoria, generándolo (y los anteriores que falten) si no lo está.
+
+        :return: Tupla (diccionario de parámetros, brazo óptimo de cada paso, su valor esperado).
+        """
+        if block in self._blocks:
+            return self._blocks[block]
+
+        for previous in range(len(self._states) - 1, block):
+            # El estado del bloque siguiente solo se conoce generando el anterior
+            self._states.append(self._compute(previous)[1])
+        parameters, next_state = self._compute(block)
+        if block + 1 == len(self._states):
+            self._states.append(next_state)
+        expected = self.arm_class.expected_values(parameters)
+        optimal = np.argmax(expected, axis=1)
+        entry = (parameters, optimal, expected[np.arange(len(optimal)), optimal])
+
+        if self._capacity is None:
+            # Los arrays con algún paso 0 (broadcast_to) no ocupan memoria propia
+            size = sum(values.nbytes for values in parameters.values() if 0 not in values.strides)
+            size += entry[1].nbytes + entry[2].nbytes
+            self._capacity = max(2, CACHE_BYTES // size)
+        if len(self._blocks) >= self._capacity:
+            self._blocks.popitem()  # El último añadido (ver la documentación de la clase)
+        self._blocks[block] = entry
+        return entry
+
+    def _block(self, block: int) -> Dict[str, np.ndarray]:
+        """
+        Devuelve los parámetros de un bloque.
+        """
+        return self._entry(block)[0]
+
+    def _compute(self, block: int):
+        """
+        Genera los parámetros de un bloque con su propio generador.
+
+        :return: Tupla (diccionario de parámetros, estado al comienzo del bloque siguiente).
+        """
+        rng = make_generator(np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(block,)))
+        return self._generate(block, self._states[block], rng)
+
+    def _gather(self, start: int, stop: int, item: Callable[[int], Union[dict, np.ndarray]]):
+        """
+        Concatena un elemento de los bloques (parámetros, óptimos...) en los pasos [start, stop).
+
+        :param item: Función que devuelve el elemento de un bloque a partir de su índice.
+        """
+        assert 0 <= start < stop, "Rango de pasos no válido."
+        first, last = start // self.block_size, (stop - 1) // self.block_size
+        if first == last:
+            offset = first * self.block_size
+            return _slice(item(first), start - offset, stop - offset)
+
+        parts = []
+        for block in range(first, last + 1):
+            offset = block * self.block_size
+            parts.append(_slice(item(block), max(start, offset) - offset,
+                                min(stop, offset + self.block_size) - offset))
+        if isinstance(parts[0], dict):
+            return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        return np.concatenate(parts)
+
+    def parameters_at(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """
+        Parámetros de los brazos en los pasos [start, stop).
+
+        :return: Diccionario de arrays (pasos x k).
+        """
+        return self._gather(start, stop, self._block)
+
+    def expected_values_at(self, start: int, stop: int) -> np.ndarray:
+        """
+        Valor esperado de cada brazo en los pasos [start, stop).
+
+        :return: Array (pasos x k).
+        """
+        return self.arm_class.expected_values(self.parameters_at(start, stop))
+
+    def optimal_arms(self, start: int, stop: int) -> np.ndarray:
+        """
+        Brazo óptimo de cada paso de [start, stop).
+
+        :return: Vector de índices de brazos.
+        """
+        return self._gather(start, stop, lambda block: self._entry(block)[1])
+
+    def optimal_values(self, start: int, stop: int) -> np.ndarray:
+        """
+        Valor esperado del brazo óptimo en cada paso de [start, stop).
+
+        :return: Vector de valores esperados.
+        """
+        return self._gather(start, stop, lambda block: self._entry(block)[2])
+
+    def pull(self, index: int, t: int, rng=None):
+        """
+        Genera una recompensa del brazo indicado en el paso t.
+
+        :param index: Índice del brazo.
+        :param t: Paso de tiempo.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Recompensa obtenida del brazo.
+        """
+        parameters = self._block(t // self.block_size)
+        row = t % self.block_size
+        return self.arm_class.sample_parameters({name: values[row, index] for name, values in parameters.items()},
+                                                None, rng)
+
+    def pull_many(self, indices: np.ndarray, t: int, rng=None) -> np.ndarray:
+        """
+        Genera una recompensa por cada índice de brazo, todos en el paso t.
+
+        :param indices: Array de índices de brazos.
+        :param t: Paso de tiempo.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Array de recompensas con la forma de indices.
+        """
+        parameters = self._block(t // self.block_size)
+        row = t % self.block_size
+        return self.arm_class.sample_parameters({name: values[row][indices] for name, values in parameters.items()},
+                                                indices.shape, rng)
+
+    def sample(self, shape, start: int, rng=None) -> np.ndarray:
+        """
+        Genera recompensas de todos los brazos en pasos consecutivos.
+
+        :param shape: Forma inicial de la muestra; su última dimensión son los pasos desde start.
+        :param start: Paso de tiempo de la primera fila.
+        :param rng: Generador aleatorio (por defecto el generador compartido).
+        :return: Array de forma shape + (k,).
+        """
+        shape = tuple(shape)
+        assert shape, "La muestra de un bandido no estacionario debe indicar el número de pasos."
+        parameters = self.parameters_at(start, start + shape[-1])
+        return self.arm_class.sample_parameters(parameters, shape + (self.k,), rng)
+
+    @cached_property
+    def initial(self) -> ArmArray:
+        """
+        Brazos en el paso 0.
+        """
+        return ArmArray(self.arm_class, {name: values[0] for name, values in self._block(0).items()})
+
+    def __len__(self) -> int:
+        return self.k
+
+    def __getitem__(self, index: int) -> Arm:
+        return self.initial[index]
+
+    def __iter__(self):
+        return iter(self.initial)
+
+    def __str__(self):
+        """
+        Representación en cadena del conjunto de brazos.
+        """
+        return f"{type(self).__name__}({self.arm_class.__name__}, k={self.k})"
+
+
+class RandomWalkNormal(DriftingArms):
+    """
+    Brazos normales cuya media sigue un paseo aleatorio gaussiano.
+
+    En cada paso la media de cada brazo recibe un incremento N(0, step_std). Si se indican
+    low y high, el paseo se refleja en los límites (se pliega la trayectoria sin límites,
+    que equivale a un paseo reflejado).
+    """
+
+    def __init__(self, mu: Sequence[float], sigma: Union[float, Sequence[float]] = 1.0, step_std: float = 0.01,
+                 low: Optional[float] = None, high: Optional[float] = None, block_size: int = 1024, seed=None):
+        """
+        Inicializa los brazos.
+
+        :param mu: Medias en el paso 0, una por brazo.
+        :param sigma: Desviación estándar de las recompensas (común o una por brazo).
+        :param step_std: Desviación estándar del incremento de la media en cada paso.
+        :param low: (Opcional) Límite inferior de las medias.
+        :param high: (Opcional) Límite superior de las medias.
+        :param block_size: Número de pasos de cada bloque de parámetros.
+        :param seed: (Opcional) Semilla de la trayectoria de las medias.
+        """
+        self.mu = np.asarray(mu, dtype=float)
+        self.sigma = np.broadcast_to(np.asarray(sigma, dtype=float), self.mu.shape)
+        assert np.all(self.sigma > 0), "La desviación estándar sigma debe ser positiva."
+        assert step_std >= 0, "La desviación estándar del paseo debe ser no negativa."
+        assert (low is None) == (high is None), "Hay que indicar los dos límites o ninguno."
+        assert low is None or (low < high and np.all((low <= self.mu) & (self.mu <= high))), \
+            "Las medias iniciales deben estar dentro de [low, high]."
+
+        self.step_std = step_std
+        self.low, self.high = low, high
+        super().__init__(ArmNormal, len(self.mu), block_size, seed)
+
+    def _initial_state(self):
+        return self.mu
+
+    def _generate(self, block, state, rng):
+        increments = rng.normal(0.0, self.step_std, (self.block_size, self.k))
+        # La fila j es el estado más los incrementos de los j pasos anteriores del bloque
+        walk = np.empty_like(increments)
+        walk[0] = state
+        np.cumsum(increments[:-1], axis=0, out=walk[1:])
+        walk[1:] += state
+        next_state = walk[-1] + increments[-1]
+
+        mu = walk if self.low is None else _reflect(walk, self.low, self.high)
+        return {'mu': mu, 'sigma': np.broadcast_to(self.sigma, mu.shape)}, next_state
+
+
+class PiecewiseBernoulli(DriftingArms):
+    """
+    Brazos Bernoulli con probabilidad constante a tramos.
+
+    En cada paso, cada brazo cambia con probabilidad change_rate su probabilidad de éxito
+    por un valor uniforme en [p_min, p_max], independientemente de los demás brazos.
+    """
+
+    def __init__(self, p: Sequence[float], change_rate: float = 1e-3, p_min: float = 0.1, p_max: float = 0.9,
+                 block_size: int = 1024, seed=None):
+        """
+        Inicializa los brazos.
+
+        :param p: Probabilidades de éxito en el paso 0, una por brazo.
+        :param change_rate: Probabilidad de que un brazo cambie en cada paso.
+        :param p_min: Valor mínimo de las nuevas probabilidades.
+        :param p_max: Valor máximo de las nuevas probabilidades.
+        :param block_size: Número de pasos de cada bloque de parámetros.
+        :param seed: (Opcional) Semilla de los cambios.
+        """
+        self.p = np.asarray(p, dtype=float)
+        assert np.all((0 <= self.p) & (self.p <= 1)), "La probabilidad p debe estar en el rango [0, 1]."
+        assert 0 <= change_rate <= 1, "La probabilidad de cambio debe estar en [0, 1]."
+        assert 0 <= p_min < p_max <= 1, "Debe cumplirse 0 <= p_min < p_max <= 1."
+
+        self.change_rate = change_rate
+        self.p_min, self.p_max = p_min, p_max
+        super().__init__(ArmBernoulli, len(self.p), block_size, seed)
+
+    def _initial_state(self):
+        return self.p
+
+    def _generate(self, block, state, rng):
+        changes = rng.random((self.block_size, self.k)) < self.change_rate
+        if block == 0:
+            changes[0] = False  # El paso 0 conserva las probabilidades iniciales
+
+        values = np.empty((self.block_size, self.k))
+        values[changes] = rng.uniform(self.p_min, self.p_max, np.count_nonzero(changes))
+        # Último paso del bloque (hasta el actual) en el que cambió cada brazo, o -1
+        last = np.maximum.accumulate(np.where(changes, np.arange(self.block_size)[:, np.newaxis], -1), axis=0)
+        p = np.where(last >= 0, values[np.maximum(last, 0), np.arange(self.k)], state)
+        return {'p': p}, p[-1]
+
+
+class ScheduledArms(DriftingArms):
+    """
+    Brazos cuyos parámetros cambian en pasos programados (cambios abruptos deterministas).
+
+    El tramo i usa los brazos segments[i] desde el paso change_points[i] hasta el
+    siguiente cambio. Todos los tramos deben tener el mismo número de brazos y la misma clase.
+    """
+
+    def __init__(self, change_points: Sequence[int], segments: List[Union[List[Arm], ArmArray]],
+                 block_size: int = 1024):
+        """
+        Inicializa los brazos.
+
+        :param change_points: Paso en el que comienza cada tramo (creciente, empezando en 0).
+        :param segments: Brazos de cada tramo (listas de brazos o ArmArray).
+        :param block_size: Número de pasos de cada bloque de parámetros.
+        """
+        self.change_points = np.asarray(change_points, dtype=np.int64)
+        assert len(self.change_points) == len(segments) > 0, "Debe haber un tramo por cambio."
+        assert self.change_points[0] == 0 and np.all(np.diff(self.change_points) > 0), \
+            "Los cambios deben ser crecientes y empezar en el paso 0."
+
+        arrays = [ArmArray.stack(arms) for arms in segments]
+        assert all(array is not None for array in arrays), "Los brazos de cada tramo deben ser de una misma clase."
+        arm_class = arrays[0].arm_class
+        assert all(array.arm_class is arm_class and len(array) == len(arrays[0]) for array in arrays), \
+            "Todos los tramos deben tener los mismos brazos (clase y número)."
+
+        # Parámetros de cada tramo apilados: (tramos x k) por parámetro
+        self.segment_parameters = {name: np.stack([array.parameters[name] for array in arrays])
+                                   for name in arrays[0].parameters}
+        super().__init__(arm_class, len(arrays[0]), block_size)
+
+    def _initial_state(self):
+        return None
+
+    def _generate(self, block, state, rng):
+        steps = block * self.block_size + np.arange(self.block_size)
+        segment = np.searchsorted(self.change_points, steps, side='right') - 1
+        return {name: values[segment] for name, values in self.segment_parameters.items()}, None
+
+
+def _slice(item, start: int, stop: int):
+    """
+    Selecciona las filas [start, stop) de un array o de cada array de un diccionario.
+    """
+    if isinstance(item, dict):
+        return {name: values[start:stop] for name, values in item.items()}
+    return item[start:stop]
+
+
+def _reflect(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Pliega valores sobre el intervalo [low, high] reflejándolos en sus extremos.
+    """
+    width = high - low
+    folded = np.mod(values - low, 2 * width)
+    return low + np.where(folded > width, 2 * width - folded, folded)
@@ -0,0 +1,75 @@
+"""
+Module: src_arms/rng.py
+Description: Creación de generadores aleatorios (numpy.random.Generator) para brazos y algoritmos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from typing import Optional
+
+import numpy as np
+
+# Generadores de bits admitidos (PCG64 por defecto; Philox admite saltos y flujos contrapuestos)
+BIT_GENERATORS = {
+    'PCG64': np.random.PCG64,
+    'PCG64DXSM': np.random.PCG64DXSM,
+    'Philox': np.random.Philox,
+    'SFC64': np.random.SFC64,
+}
+
+# Generador compartido que se usa cuando no se indica ninguno
+_default_generator: Optional[np.random.Generator] = None
+
+
+def make_generator(seed=None, bit_generator: str = 'PCG64') -> np.random.Generator:
+    """
+    Crea un generador aleatorio a partir de una semilla.
+
+    :param seed: Semilla (int, SeedSequence) o un Generator ya creado, que se devuelve tal cual.
+                 Si es None se usa entropía del sistema operativo.
+    :param bit_generator: Nombre del generador de bits: 'PCG64', 'PCG64DXSM', 'Philox' o 'SFC64'.
+    :return: Generador aleatorio.
+    :raises ValueError: Si el generador de bits no está soportado.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Generador de bits desconocido: {bit_generator}. Disponibles: {list(BIT_GENERATORS)}")
+
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seed))
+
+
+def generator_from_state(state: dict) -> np.random.Generator:
+    """
+    Crea un generador con el estado guardado de otro (bit_generator.state).
+
+    :param state: Estado del generador de bits, tal como lo devuelve Generator.bit_generator.state.
+    :return: Generador que continúa la secuencia del original.
+    :raises ValueError: Si el generador de bits no está soportado.
+    """
+    name = state['bit_generator']
+    if name not in BIT_GENERATORS:
+        raise ValueError(f"Generador de bits desconocido: {name}. Disponibles: {list(BIT_GENERATORS)}")
+
+    bit_generator = BIT_GENERATORS[name]()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
+
+
+def default_generator() -> np.random.Generator:
+    """
+    Devuelve el generador compartido que se usa cuando no se indica ninguno.
+
+    :return: Generador aleatorio del proceso.
+    """
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = make_generator()
+    return _default_generator
@@ -0,0 +1,11 @@
+# Importación de módulos o clases
+from .accumulators import Accumulator, DenseAccumulator, StreamingAccumulator
+from .reward_table import RewardTable
+from .runner import ENGINES, register_engine, run_experiment_complete
+from .sequential import run_sequential_comparison
+from .store import ResultStore
+from .trace import Trace, TraceRecorder
+from .sweep import expand_grid, run_sweep
+
+# Lista de módulos o clases públicas
+__all__ = ['Accumulator', 'DenseAccumulator', 'StreamingAccumulator', 'RewardTable', 'ENGINES', 'register_engine', 'run_experiment_complete', 'run_sequential_comparison', 'ResultStore', 'Trace', 'TraceRecorder', 'expand_grid', 'run_sweep']
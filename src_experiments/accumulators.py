@@ -0,0 +1,480 @@
+"""
+Module: src_experiments/accumulators.py
+Description: Acumuladores de resultados para los experimentos del problema de los k-brazos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from abc import ABC, abstractmethod
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src_arms import Bandit, make_generator
+
+
+class Accumulator(ABC):
+    """
+    Interfaz común de los acumuladores de resultados.
+
+    Los motores de ejecución entregan bloques de trayectorias (brazos elegidos y
+    recompensas obtenidas) y el acumulador se encarga de resumirlos. Así el bucle
+    interno del motor no hace ninguna contabilidad por paso.
+
+    Todos los acumuladores guardan además un resumen compacto de cada ejecución
+    terminada (recompensa media, porcentaje de selecciones óptimas y regret final),
+    con el que se calculan intervalos bootstrap.
+    """
+
+    # Cantidades resumidas (primer índice de los arrays de estadísticas)
+    REWARD, OPTIMAL, REGRET = 0, 1, 2
+
+    def begin(self, bandit: Bandit, n_algorithms: int, steps: int, runs: int):
+        """
+        Prepara el acumulador antes de comenzar un experimento.
+
+        :param bandit: Bandido sobre el que se ejecuta el experimento.
+        :param n_algorithms: Número de algoritmos comparados.
+        :param steps: Número de pasos de cada ejecución.
+        :param runs: Número de ejecuciones por algoritmo.
+        """
+        self.k = bandit.k
+        self.n_algorithms = n_algorithms
+        self.steps = steps
+        self.runs = runs
+        self.optimal_arm = bandit.optimal_arm
+        self.optimal_reward = bandit.get_expected_value(bandit.optimal_arm)
+        # Bandido no estacionario del que obtener el brazo óptimo de cada paso (None si es estacionario)
+        self._bandit = None if bandit.stationary else bandit
+        # Número de ejecuciones completadas por cada algoritmo
+        self.run_counts = np.zeros(n_algorithms, dtype=int)
+        # Resumen de cada ejecución terminada (cantidad x algoritmo x ejecución)
+        self.run_summaries = np.zeros((3, n_algorithms, runs))
+        self.completed = np.zeros((n_algorithms, runs), dtype=bool)
+        # Totales de las ejecuciones en curso: recompensa, selecciones óptimas y regret acumulado
+        self._run_totals: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def _optimal(self, start: int, stop: int):
+        """
+        Devuelve el brazo óptimo y su recompensa esperada en los pasos [start, stop).
+
+        :return: Tupla (brazo óptimo, recompensa óptima): escalares si el bandido es
+                 estacionario y vectores con un valor por paso si no lo es.
+        """
+        if self._bandit is None:
+            return self.optimal_arm, self.optimal_reward
+        return self._bandit.optimal_arms(start, stop), self._bandit.optimal_rewards(start, stop)
+
+    @abstractmethod
+    def add(self, algo_idx: int, run: int, start: int, arms: np.ndarray, rewards: np.ndarray):
+        """
+        Incorpora un bloque de trayectorias de un algoritmo.
+
+        :param algo_idx: Índice del algoritmo dentro de la lista comparada.
+        :param run: Índice de la primera ejecución del bloque.
+        :param start: Paso de tiempo en el que comienza el bloque.
+        :param arms: Brazos elegidos, matriz (ejecuciones x pasos del bloque).
+        :param rewards: Recompensas obtenidas, matriz (ejecuciones x pasos del bloque).
+        """
+        raise NotImplementedError("Este método debe ser implementado por la subclase.")
+
+    def merge(self, other: 'Accumulator', algo_idx: Optional[int] = None, run_offset: int = 0):
+        """
+        Incorpora los resultados de otro acumulador del mismo tipo (p. ej. de otro proceso).
+
+        :param other: Acumulador inicializado con los mismos parámetros.
+        :param algo_idx: (Opcional) Si se indica, other contiene un único algoritmo cuyos
+                         resultados se incorporan a la fila algo_idx.
+        :param run_offset: Índice que corresponde en este acumulador a la primera ejecución de other.
+        :raises NotImplementedError: Si el acumulador no admite combinarse.
+        """
+        raise NotImplementedError("Este acumulador no admite combinar resultados parciales.")
+
+    @abstractmethod
+    def results(self):
+        """
+        Devuelve los resultados resumidos del experimento.
+
+        :return: Tupla (rewards, optimal_selections, arm_stats, regret_accumulated).
+        """
+        raise NotImplementedError("Este método debe ser implementado por la subclase.")
+
+    def variances(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Devuelve la varianza muestral entre ejecuciones de cada resultado.
+
+        :return: Tupla (varianza de rewards, de optimal_selections y de regret_accumulated).
+        :raises NotImplementedError: Si el acumulador no registra varianzas.
+        """
+        raise NotImplementedError("Este acumulador no registra la varianza entre ejecuciones.")
+
+    @property
+    def checkpoints(self) -> np.ndarray:
+        """
+        Pasos de tiempo (empezando en 0) a los que corresponde cada columna de los resultados.
+        """
+        return np.arange(self.steps)
+
+    def confidence_bands(self, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula intervalos de confianza (aproximación normal) para la media de cada resultado.
+
+        :param confidence: Nivel de confianza de los intervalos.
+        :return: Tupla con las bandas de rewards, optimal_selections y regret_accumulated;
+                 cada banda es un array (2 x algoritmos x columnas) con el límite inferior y superior.
+        """
+        assert 0 < confidence < 1, "El nivel de confianza debe estar entre 0 y 1."
+
+        rewards, optimal_selections, _, regret_accumulated = self.results()
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        counts = np.maximum(self._sample_counts(), 1)
+
+        bands = []
+        for mean, variance in zip((rewards, optimal_selections, regret_accumulated), self.variances()):
+            half_width = z * np.sqrt(variance / counts)
+            bands.append(np.stack((mean - half_width, mean + half_width)))
+        return tuple(bands)
+
+    def bootstrap_intervals(self, confidence: float = 0.95, n_resamples: int = 1000,
+                            seed=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula intervalos bootstrap (percentiles) de la media de los resúmenes por ejecución.
+
+        Solo se usan los resúmenes compactos de las ejecuciones terminadas, por lo que el
+        coste no depende del número de pasos.
+        :param confidence: Nivel de confianza de los intervalos.
+        :param n_resamples: Número de remuestreos.
+        :param seed: (Opcional) Semilla o generador de los remuestreos.
+        :return: Tupla con los intervalos de la recompensa media, del porcentaje de selecciones
+                 óptimas y del regret final; cada uno es un array (2 x algoritmos).
+        """
+        assert 0 < confidence < 1, "El nivel de confianza debe estar entre 0 y 1."
+        assert n_resamples > 0, "El número de remuestreos debe ser mayor que 0."
+
+        rng = make_generator(seed)
+        quantiles = (0.5 - confidence / 2, 0.5 + confidence / 2)
+        intervals = np.full((3, 2, self.n_algorithms), np.nan)
+        for algo_idx in range(self.n_algorithms):
+            summaries = self.run_summaries[:, algo_idx, self.completed[algo_idx]]
+            n = summaries.shape[1]
+            if n == 0:
+                continue
+            resamples = rng.integers(0, n, size=(n_resamples, n))
+            means = summaries[:, resamples].mean(axis=2)
+            intervals[:, :, algo_idx] = np.quantile(means, quantiles, axis=1).T
+        return intervals[self.REWARD], intervals[self.OPTIMAL], intervals[self.REGRET]
+
+    def _sample_counts(self) -> np.ndarray:
+        """
+        Número de ejecuciones que contribuyen a cada resultado, con forma difundible a (algoritmos x columnas).
+        """
+        return self.run_counts[:, np.newaxis]
+
+    def _begin_arm_stats(self):
+        """
+        Reserva los acumulados por brazo, comunes a todos los acumuladores.
+        """
+        self.arm_rewards = np.zeros((self.n_algorithms, self.k))  # Recompensas acumuladas por brazo
+        self.arm_counts = np.zeros((self.n_algorithms, self.k))  # Número de selecciones por brazo
+
+    def _add_arm_stats(self, algo_idx: int, arms: np.ndarray, rewards: np.ndarray):
+        """
+        Incorpora un bloque de trayectorias a los acumulados por brazo.
+        """
+        flat_arms = arms.ravel()
+        self.arm_counts[algo_idx] += np.bincount(flat_arms, minlength=self.k)
+        self.arm_rewards[algo_idx] += np.bincount(flat_arms, weights=rewards.ravel(), minlength=self.k)
+
+    def _arm_stats(self) -> List[dict]:
+        """
+        Devuelve las estadísticas por brazo de cada algoritmo.
+        """
+        average_rewards = self.arm_rewards / np.maximum(self.arm_counts, 1)
+        return [{'average_rewards': average_rewards[idx], 'selection_counts': self.arm_counts[idx]}
+                for idx in range(self.n_algorithms)]
+
+    def _open_runs(self, algo_idx: int, run: int, start: int, n_runs: int) -> np.ndarray:
+        """
+        Devuelve los totales de las ejecuciones del bloque al comienzo del mismo.
+
+        :return: Array (3 x ejecuciones) con la recompensa total, las selecciones óptimas y el regret acumulado.
+        """
+        if start == 0:
+            self.run_counts[algo_idx] += n_runs
+            return np.zeros((3, n_runs))
+        return self._run_totals.pop((algo_idx, run))
+
+    def _close_runs(self, algo_idx: int, run: int, stop: int, totals: np.ndarray):
+        """
+        Guarda los totales de las ejecuciones del bloque al final del mismo, o su resumen si han terminado.
+        """
+        if stop < self.steps:
+            self._run_totals[(algo_idx, run)] = totals
+            return
+
+        rows = slice(run, run + totals.shape[1])
+        self.run_summaries[self.REWARD, algo_idx, rows] = totals[self.REWARD] / self.steps
+        self.run_summaries[self.OPTIMAL, algo_idx, rows] = totals[self.OPTIMAL] / self.steps * 100
+        self.run_summaries[self.REGRET, algo_idx, rows] = totals[self.REGRET]
+        self.completed[algo_idx, rows] = True
+
+    def _merged_rows(self, algo_idx: Optional[int]) -> slice:
+        """
+        Filas (algoritmos) de este acumulador que corresponden a las de otro en merge.
+        """
+        return slice(None) if algo_idx is None else slice(algo_idx, algo_idx + 1)
+
+    def _merge_runs(self, other: 'Accumulator', rows: slice, run_offset: int):
+        """
+        Incorpora los recuentos y resúmenes por ejecución de otro acumulador.
+        """
+        assert not other._run_totals, "Solo se pueden combinar acumuladores con todas sus ejecuciones completas."
+        runs = slice(run_offset, run_offset + other.runs)
+        summaries = self.run_summaries[:, rows, runs]
+        summaries[:, other.completed] = other.run_summaries[:, other.completed]
+        self.completed[rows, runs] |= other.completed
+        self.run_counts[rows] += other.run_counts
+        self.arm_rewards[rows] += other.arm_rewards
+        self.arm_counts[rows] += other.arm_counts
+
+
+class DenseAccumulator(Accumulator):
+    """
+    Acumulador que mantiene matrices densas (algoritmos x pasos), equivalente a la
+    función run_experiment_complete de los notebooks.
+
+    Si track_variance es True registra también, paso a paso, la suma de cuadrados de
+    las desviaciones entre ejecuciones (Welford, con la combinación por bloques de Chan)
+    de la recompensa, de la selección del brazo óptimo y del regret acumulado.
+    """
+
+    def __init__(self, track_variance: bool = True):
+        """
+        Inicializa el acumulador.
+
+        :param track_variance: Si es True registra la varianza entre ejecuciones de cada paso.
+        """
+        self.track_variance = track_variance
+
+    def begin(self, bandit: Bandit, n_algorithms: int, steps: int, runs: int):
+        super().begin(bandit, n_algorithms, steps, runs)
+        self.reward_sum = np.zeros((n_algorithms, steps))  # Suma de recompensas por paso
+        self.optimal_count = np.zeros((n_algorithms, steps))  # Selecciones del brazo óptimo por paso
+        self._begin_arm_stats()
+        if self.track_variance:
+            self.regret_sum = np.zeros((n_algorithms, steps))  # Suma del regret acumulado por paso
+            self.m2 = np.zeros((3, n_algorithms, steps))  # Suma de cuadrados de las desviaciones por paso
+
+    def add(self, algo_idx: int, run: int, start: int, arms: np.ndarray, rewards: np.ndarray):
+        n_runs, n = arms.shape
+        stop = start + n
+        totals = self._open_runs(algo_idx, run, start, n_runs)
+
+        optimal_arm, optimal_reward = self._optimal(start, stop)
+        optimal = arms == optimal_arm
+        regret = totals[self.REGRET][:, np.newaxis] + np.cumsum(optimal_reward - rewards, axis=1)
+
+        if self.track_variance:
+            # Todas las ejecuciones anteriores ya han pasado por las columnas del bloque
+            previous = self.run_counts[algo_idx] - n_runs
+            columns = (algo_idx, slice(start, stop))
+            for quantity, samples, sums, scale in ((self.REWARD, rewards, self.reward_sum, 1.0),
+                                                   (self.OPTIMAL, optimal * 100.0, self.optimal_count, 100.0),
+                                                   (self.REGRET, regret, self.regret_sum, 1.0)):
+                batch_mean = samples.mean(axis=0)
+                batch_m2 = ((samples - batch_mean) ** 2).sum(axis=0)
+                mean = sums[columns] * (scale / max(previous, 1))
+                _, self.m2[quantity][columns], _ = _combine(mean, self.m2[quantity][columns], previous,
+                                                            batch_mean, batch_m2, n_runs)
+            self.regret_sum[columns] += regret.sum(axis=0)
+
+        self.reward_sum[algo_idx, start:stop] += rewards.sum(axis=0)
+        self.optimal_count[algo_idx, start:stop] += optimal.sum(axis=0)
+        self._add_arm_stats(algo_idx, arms, rewards)
+
+        totals[self.REWARD] += rewards.sum(axis=1)
+        totals[self.OPTIMAL] += optimal.sum(axis=1)
+        totals[self.REGRET] = regret[:, -1]
+        self._close_runs(algo_idx, run, stop, totals)
+
+    def merge(self, other: 'DenseAccumulator', algo_idx: Optional[int] = None, run_offset: int = 0):
+        rows = self._merged_rows(algo_idx)
+        if self.track_variance:
+            count_a = self.run_counts[rows, np.newaxis]
+            count_b = other.run_counts[:, np.newaxis]
+            for quantity, sums_a, sums_b in ((self.REWARD, self.reward_sum[rows], other.reward_sum),
+                                             (self.OPTIMAL, self.optimal_count[rows] * 100.0, other.optimal_count * 100.0),
+                                             (self.REGRET, self.regret_sum[rows], other.regret_sum)):
+                _, self.m2[quantity, rows], _ = _combine(sums_a / np.maximum(count_a, 1), self.m2[quantity, rows], count_a,
+                                                         sums_b / np.maximum(count_b, 1), other.m2[quantity], count_b)
+            self.regret_sum[rows] += other.regret_sum
+
+        self.reward_sum[rows] += other.reward_sum
+        self.optimal_count[rows] += other.optimal_count
+        self._merge_runs(other, rows, run_offset)
+
+    def results(self):
+        runs = np.maximum(self.run_counts, 1)[:, np.newaxis]
+
+        rewards = self.reward_sum / runs
+        optimal_selections = (self.optimal_count / runs) * 100
+
+        # El regret medio acumulado es la suma acumulada del regret medio de cada paso
+        regret_accumulated = np.cumsum(self._optimal(0, self.steps)[1] - rewards, axis=1)
+
+        return rewards, optimal_selections, self._arm_stats(), regret_accumulated
+
+    def variances(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if not self.track_variance:
+            return super().variances()
+        variance = self.m2 / np.maximum(self.run_counts - 1, 1)[:, np.newaxis]
+        return variance[self.REWARD], variance[self.OPTIMAL], variance[self.REGRET]
+
+
+class StreamingAccumulator(Accumulator):
+    """
+    Acumulador en memoria constante respecto al horizonte.
+
+    Los pasos se agrupan en n_points intervalos (espaciados logarítmica o linealmente)
+    que terminan en los puntos de control checkpoints. Para cada intervalo se guarda,
+    sobre las ejecuciones, la media y la suma de cuadrados de desviaciones (Welford, con
+    la combinación por bloques de Chan) de tres cantidades por ejecución:
+
+      - la recompensa media del intervalo,
+      - el porcentaje de selecciones del brazo óptimo en el intervalo,
+      - el regret acumulado al final del intervalo.
+
+    El regret acumulado se calcula en flujo: cada par (algoritmo, ejecución) en curso
+    arrastra su regret total y las sumas parciales del intervalo abierto, de modo que la
+    memoria es O(algoritmos x n_points + ejecuciones simultáneas), sea cual sea steps.
+    Con n_points >= steps y espaciado lineal los resultados coinciden con DenseAccumulator.
+    """
+
+    def __init__(self, n_points: int = 1000, spacing: str = 'log'):
+        """
+        Inicializa el acumulador.
+
+        :param n_points: Número máximo de puntos de control (intervalos) por algoritmo.
+        :param spacing: Reparto de los puntos de control: 'log' (más densos al principio) o 'linear'.
+        """
+        assert n_points > 0, "El número de puntos de control debe ser mayor que 0."
+        assert spacing in ('log', 'linear'), "El espaciado debe ser 'log' o 'linear'."
+
+        self.n_points = n_points
+        self.spacing = spacing
+
+    def begin(self, bandit: Bandit, n_algorithms: int, steps: int, runs: int):
+        super().begin(bandit, n_algorithms, steps, runs)
+        n_points = min(self.n_points, steps)
+        if self.spacing == 'log':
+            ends = np.geomspace(1, steps, n_points)
+        else:
+            ends = np.linspace(steps / n_points, steps, n_points)
+        # Final (exclusivo) de cada intervalo, siempre terminando en steps
+        self._ends = np.unique(np.clip(np.round(ends).astype(np.intp), 1, steps))
+        self._ends[-1] = steps
+        self._sizes = np.diff(self._ends, prepend=0)  # Número de pasos de cada intervalo
+
+        shape = (3, n_algorithms, len(self._ends))
+        self.count = np.zeros(shape[1:], dtype=np.intp)  # Ejecuciones completadas en cada intervalo
+        self.mean = np.zeros(shape)  # Media sobre las ejecuciones
+        self.m2 = np.zeros(shape)  # Suma de cuadrados de las desviaciones respecto a la media
+        self._begin_arm_stats()
+        # Sumas parciales (recompensa y selecciones óptimas) del intervalo abierto de cada bloque en curso
+        self._partial: Dict[Tuple[int, int], np.ndarray] = {}
+
+    @property
+    def checkpoints(self) -> np.ndarray:
+        return self._ends - 1
+
+    def add(self, algo_idx: int, run: int, start: int, arms: np.ndarray, rewards: np.ndarray):
+        n_runs, n = arms.shape
+        stop = start + n
+        totals = self._open_runs(algo_idx, run, start, n_runs)
+        partial = self._partial.pop((algo_idx, run), np.zeros((2, n_runs)))
+        self._add_arm_stats(algo_idx, arms, rewards)
+
+        # Intervalos que terminan dentro del bloque: [first, last)
+        first = np.searchsorted(self._ends, start, side='right')
+        last = np.searchsorted(self._ends, stop, side='right')
+        bounds = self._ends[first:last]
+        if len(bounds) == 0 or bounds[-1] != stop:
+            bounds = np.append(bounds, stop)
+        bounds = np.concatenate(([start], bounds))
+        offsets = bounds[:-1] - start
+        lengths = np.diff(bounds)
+
+        # Sumas por segmento (cada segmento está dentro de un único intervalo)
+        reward_sums = np.add.reduceat(rewards, offsets, axis=1)
+        optimal_arm, optimal_reward = self._optimal(start, stop)
+        optimal_sums = np.add.reduceat(arms == optimal_arm, offsets, axis=1, dtype=np.intp)
+        optimal_reward_sums = (optimal_reward * lengths if self._bandit is None
+                               else np.add.reduceat(optimal_reward, offsets))
+        regret = totals[self.REGRET][:, np.newaxis] + np.cumsum(optimal_reward_sums - reward_sums, axis=1)
+        totals[self.REWARD] += reward_sums.sum(axis=1)
+        totals[self.OPTIMAL] += optimal_sums.sum(axis=1)
+        totals[self.REGRET] = regret[:, -1]
+        reward_sums[:, 0] += partial[self.REWARD]
+        optimal_sums[:, 0] += partial[self.OPTIMAL].astype(np.intp)
+
+        completed = last - first
+        if completed:
+            sizes = self._sizes[first:last]
+            samples = np.stack((reward_sums[:, :completed] / sizes,
+                                optimal_sums[:, :completed] / sizes * 100,
+                                regret[:, :completed]))
+            batch_mean = samples.mean(axis=1)
+            batch_m2 = ((samples - batch_mean[:, np.newaxis]) ** 2).sum(axis=1)
+            columns = (slice(None), algo_idx, slice(first, last))
+            self.mean[columns], self.m2[columns], self.count[algo_idx, first:last] = _combine(
+                self.mean[columns], self.m2[columns], self.count[algo_idx, first:last],
+                batch_mean, batch_m2, n_runs)
+
+        if stop < self.steps and completed < len(lengths):
+            self._partial[(algo_idx, run)] = np.stack((reward_sums[:, -1], optimal_sums[:, -1]))
+        self._close_runs(algo_idx, run, stop, totals)
+
+    def merge(self, other: 'StreamingAccumulator', algo_idx: Optional[int] = None, run_offset: int = 0):
+        rows = self._merged_rows(algo_idx)
+        self.mean[:, rows], self.m2[:, rows], self.count[rows] = _combine(
+            self.mean[:, rows], self.m2[:, rows], self.count[rows], other.mean, other.m2, other.count)
+        self._merge_runs(other, rows, run_offset)
+
+    def results(self):
+        """
+        Devuelve los resultados en los puntos de control (ver checkpoints).
+
+        rewards y optimal_selections son medias de cada intervalo; regret_accumulated es
+        el regret medio acumulado al final de cada intervalo.
+        :return: Tupla (rewards, optimal_selections, arm_stats, regret_accumulated).
+        """
+        return (self.mean[self.REWARD], self.mean[self.OPTIMAL], self._arm_stats(),
+                self.mean[self.REGRET])
+
+    def variances(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        variance = self.m2 / np.maximum(self.count - 1, 1)
+        return variance[self.REWARD], variance[self.OPTIMAL], variance[self.REGRET]
+
+    def _sample_counts(self) -> np.ndarray:
+        return self.count
+
+
+def _combine(mean_a: np.ndarray, m2_a: np.ndarray, count_a, mean_b: np.ndarray, m2_b: np.ndarray, count_b):
+    """
+    Combina dos resúmenes (media, suma de cuadrados de desviaciones, tamaño) con la fórmula de Chan.
+
+    :return: Tupla (media, m2, tamaño) del conjunto unido.
+    """
+    count = count_a + count_b
+    weight = count_b / np.maximum(count, 1)
+    delta = mean_b - mean_a
+    mean = mean_a + delta * weight
+    m2 = m2_a + m2_b + delta ** 2 * count_a * weight
+    return mean, m2, count
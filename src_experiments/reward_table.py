@@ -0,0 +1,179 @@
+"""
+Module: src_experiments/reward_table.py
+Description: Tablas de recompensas pregeneradas (números aleatorios comunes) para el problema de los k-brazos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+from typing import Optional
+
+import numpy as np
+
+from src_arms import Bandit, make_generator
+
+
+class RewardTable:
+    """
+    Tensor de recompensas (ejecuciones x pasos x k) compartido por todos los algoritmos.
+
+    La recompensa del brazo a en el paso t de la ejecución r es siempre la misma,
+    independientemente del algoritmo que lo tire (números aleatorios comunes). Así las
+    diferencias entre algoritmos no se deben al ruido del muestreo y hacen falta muchas
+    menos ejecuciones para compararlos con la misma confianza.
+
+    La tabla se genera por bloques (ejecución, bloque de pasos), cada uno con su propia
+    semilla derivada de seed, de modo que el contenido es idéntico en los tres modos de
+    almacenamiento:
+
+    - En memoria (por defecto): array de NumPy completo.
+    - En disco (path): fichero .npy abierto con np.memmap, para tablas mayores que la RAM.
+    - Perezoso (lazy=True): cada bloque se genera al leerlo, con memoria constante.
+    """
+
+    def __init__(self, bandit: Bandit, runs: int, steps: int, seed: Optional[int] = None,
+                 chunk_size: int = 1024, path: Optional[str] = None, lazy: bool = False,
+                 dtype=np.float64):
+        """
+        Inicializa la tabla de recompensas.
+
+        :param bandit: Bandido del que se muestrean las recompensas.
+        :param runs: Número de ejecuciones.
+        :param steps: Número de pasos de cada ejecución.
+        :param seed: (Opcional) Semilla de la tabla.
+        :param chunk_size: Número de pasos de cada bloque generado.
+        :param path: (Opcional) Fichero .npy en el que almacenar la tabla mediante memmap.
+        :param lazy: Si es True los bloques se generan bajo demanda y no se almacenan.
+        :param dtype: Tipo de dato de las recompensas almacenadas (p. ej. np.float32 o np.uint8).
+        """
+        assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+        assert steps > 0, "El número de pasos debe ser mayor que 0."
+        assert chunk_size > 0, "El tamaño de bloque debe ser mayor que 0."
+        assert not (lazy and path is not None), "Una tabla perezosa no se almacena en disco."
+
+        self.bandit = bandit
+        self.k = bandit.k
+        self.runs = runs
+        self.steps = steps
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self.lazy = lazy
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+        shape = (runs, steps, self.k)
+        if lazy:
+            self._table = None
+        else:
+            if path is not None:
+                self._table = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype, shape=shape)
+            else:
+                self._table = np.empty(shape, dtype=self.dtype)
+
+            for run in range(runs):
+                for chunk in range(self._n_chunks()):
+                    start = chunk * chunk_size
+                    self._table[run, start:start + chunk_size] = self._generate(run, chunk)
+
+            if path is not None:
+                self._table.flush()
+
+    @classmethod
+    def open(cls, path: str, bandit: Bandit, chunk_size: int = 1024) -> 'RewardTable':
+        """
+        Abre en modo solo lectura una tabla guardada previamente en disco.
+
+        :param path: Fichero .npy con la tabla.
+        :param bandit: Bandido con el que se generó la tabla.
+        :param chunk_size: Tamaño de bloque con el que se leerá la tabla.
+        :return: Tabla de recompensas respaldada por np.memmap.
+        """
+        table = cls.__new__(cls)
+        table._table = np.load(path, mmap_mode='r')
+        table.runs, table.steps, table.k = table._table.shape
+        assert table.k == bandit.k, "La tabla no corresponde al número de brazos del bandido."
+
+        table.bandit = bandit
+        table.chunk_size = chunk_size
+        table.dtype = table._table.dtype
+        table.path = path
+        table.lazy = False
+        table.seed_sequence = None
+        return table
+
+    def block(self, run_start: int, run_stop: int, start: int, stop: int) -> np.ndarray:
+        """
+        Devuelve las recompensas de un rango de ejecuciones y pasos.
+
+        :param run_start: Primera ejecución (incluida).
+        :param run_stop: Última ejecución (excluida).
+        :param start: Primer paso (incluido).
+        :param stop: Último paso (excluido).
+        :return: Array (ejecuciones x pasos x k) con las recompensas.
+        """
+        assert 0 <= run_start < run_stop <= self.runs, "Rango de ejecuciones fuera de la tabla."
+        assert 0 <= start < stop <= self.steps, "Rango de pasos fuera de la tabla."
+
+        if self._table is not None:
+            return self._table[run_start:run_stop, start:stop]
+
+        rewards = np.empty((run_stop - run_start, stop - start, self.k), dtype=self.dtype)
+        first_chunk, last_chunk = start // self.chunk_size, (stop - 1) // self.chunk_size
+        for chunk in range(first_chunk, last_chunk + 1):
+            chunk_start = chunk * self.chunk_size
+            # Intersección del bloque generado con el rango solicitado
+            lo, hi = max(start, chunk_start), min(stop, chunk_start + self.chunk_size)
+            for run in range(run_start, run_stop):
+                rewards[run - run_start, lo - start:hi - start] = self._generate(run, chunk)[lo - chunk_start:hi - chunk_start]
+
+        return rewards
+
+    def __getstate__(self):
+        """
+        Al serializar (p. ej. hacia otro proceso) una tabla en disco no se copia su contenido:
+        el receptor vuelve a abrir el fichero en modo solo lectura.
+        """
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state['_table'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.path is not None:
+            self._table = np.load(self.path, mmap_mode='r')
+
+    def _n_chunks(self) -> int:
+        """
+        Número de bloques de pasos en los que se divide cada ejecución.
+        """
+        return -(-self.steps // self.chunk_size)
+
+    def _generate(self, run: int, chunk: int) -> np.ndarray:
+        """
+        Genera el bloque de recompensas (pasos del bloque x k) de una ejecución.
+
+        Cada bloque usa un generador independiente derivado de la semilla de la tabla y
+        de su posición, por lo que puede regenerarse en cualquier orden.
+
+        :param run: Índice de la ejecución.
+        :param chunk: Índice del bloque de pasos.
+        :return: Recompensas del bloque.
+        """
+        seed_sequence = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(run, chunk))
+        rng = make_generator(seed_sequence)
+
+        n = min(self.chunk_size, self.steps - chunk * self.chunk_size)
+        return self.bandit.sample((n,), rng=rng, start=chunk * self.chunk_size).astype(self.dtype, copy=False)
+
+    def __str__(self):
+        """
+        Representación en cadena de la tabla de recompensas.
+        """
+        storage = 'perezosa' if self.lazy else ('memmap' if self.path is not None else 'memoria')
+        return f"RewardTable(runs={self.runs}, steps={self.steps}, k={self.k}, almacenamiento={storage})"
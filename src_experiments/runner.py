@@ -0,0 +1,282 @@
+"""
+Module: src_experiments/runner.py
+Description: Ejecución de experimentos comparativos de algoritmos para el problema de los k-brazos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src_algorithms import Algorithm
+from src_arms import Bandit, make_generator
+from src_experiments.accumulators import Accumulator, DenseAccumulator
+from src_experiments.reward_table import RewardTable
+
+# Tamaño por defecto (en pasos) de los bloques que se entregan al acumulador
+DEFAULT_CHUNK_SIZE = 4096
+# Número por defecto de ejecuciones de cada bloque del motor paralelo
+DEFAULT_SHARD_SIZE = 16
+
+# Registro de motores de ejecución disponibles
+ENGINES: Dict[str, Callable] = {}
+
+
+def register_engine(name: str):
+    """
+    Decorador que registra un motor de ejecución bajo un nombre.
+
+    Un motor recibe (bandit, algorithms, steps, runs, accumulator, chunk_size) y los
+    argumentos con nombre reward_table, seed_sequence y las opciones propias del motor, y
+    debe entregar al acumulador todas las trayectorias de todas las ejecuciones.
+
+    :param name: Nombre con el que se seleccionará el motor en run_experiment_complete.
+    :return: Decorador.
+    """
+    def decorator(engine: Callable) -> Callable:
+        ENGINES[name] = engine
+        return engine
+    return decorator
+
+
+def make_rng(seed_sequence: np.random.SeedSequence, *key: int) -> np.random.Generator:
+    """
+    Crea un generador independiente para una posición del experimento (p. ej. ejecución y algoritmo).
+
+    El flujo depende solo de la semilla y de key, no del orden en que se creen los
+    generadores ni del proceso que los use.
+
+    :param seed_sequence: Secuencia de semillas raíz del experimento.
+    :param key: Índices que identifican el flujo.
+    :return: Generador PCG64 independiente.
+    """
+    child = np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + key)
+    return make_generator(child)
+
+
+def simulate_runs(bandit: Bandit, algorithms: List[Algorithm], steps: int, run_start: int, run_stop: int,
+                  accumulator: Accumulator, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  reward_table: Optional[RewardTable] = None,
+                  seed_sequence: Optional[np.random.SeedSequence] = None):
+    """
+    Simula secuencialmente las ejecuciones [run_start, run_stop) de cada algoritmo.
+
+    El bucle interno solo llama a la política y escribe en buffers preasignados; la
+    contabilidad de resultados se delega al acumulador cada chunk_size pasos. Cada par
+    (ejecución, algoritmo) usa su propio generador derivado de seed_sequence, de modo que
+    el resultado de una ejecución no depende de cuántas se simulen ni dónde.
+    """
+    if seed_sequence is None:
+        seed_sequence = np.random.SeedSequence()
+
+    chunk = min(steps, chunk_size)
+    arms_buffer = np.empty((1, chunk), dtype=np.intp)  # Brazos elegidos en el bloque actual
+    rewards_buffer = np.empty((1, chunk), dtype=float)  # Recompensas obtenidas en el bloque actual
+    arms_row, rewards_row = arms_buffer[0], rewards_buffer[0]
+    pull = bandit.pull_arm
+
+    for run in range(run_start, run_stop):
+        for idx, algo in enumerate(algorithms):
+            rng = make_rng(seed_sequence, run, idx)
+            algo.reset(rng=rng)  # Reiniciar los valores del algoritmo en cada ejecución.
+            select, update = algo.select_arm, algo.update
+
+            for start in range(0, steps, chunk):
+                n = min(chunk, steps - start)
+                if reward_table is None:
+                    for i in range(n):
+                        chosen_arm = select()
+                        reward = pull(chosen_arm, rng, start + i)
+                        update(chosen_arm, reward)
+                        arms_row[i] = chosen_arm
+                        rewards_row[i] = reward
+                else:
+                    table_rewards = reward_table.block(run, run + 1, start, start + n)[0]
+                    for i in range(n):
+                        chosen_arm = select()
+                        reward = table_rewards[i, chosen_arm]
+                        update(chosen_arm, reward)
+                        arms_row[i] = chosen_arm
+                        rewards_row[i] = reward
+
+                accumulator.add(idx, run, start, arms_buffer[:, :n], rewards_buffer[:, :n])
+
+
+@register_engine('serial')
+def run_serial(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+               accumulator: Accumulator, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               reward_table: Optional[RewardTable] = None,
+               seed_sequence: Optional[np.random.SeedSequence] = None):
+    """
+    Motor secuencial: ejecuta cada algoritmo ejecución a ejecución, paso a paso.
+
+    Si se indica reward_table, las recompensas se leen de la tabla en lugar de muestrearse.
+    """
+    simulate_runs(bandit, algorithms, steps, 0, runs, accumulator, chunk_size, reward_table, seed_sequence)
+
+
+@register_engine('batched')
+def run_batched(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+                accumulator: Accumulator, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                reward_table: Optional[RewardTable] = None,
+                seed_sequence: Optional[np.random.SeedSequence] = None):
+    """
+    Motor por lotes: simula todas las ejecuciones de un algoritmo a la vez.
+
+    Cada algoritmo se reinicia en modo por lotes (counts y values de forma runs x k), de
+    modo que cada paso es una única llamada vectorizada a select_arm/update para todas
+    las ejecuciones. Si se indica reward_table, las recompensas se leen de la tabla.
+    """
+    if seed_sequence is None:
+        seed_sequence = np.random.SeedSequence()
+
+    chunk = min(steps, chunk_size)
+    # Buffers (pasos x ejecuciones) para escribir cada paso de forma contigua
+    arms_buffer = np.empty((chunk, runs), dtype=np.intp)
+    rewards_buffer = np.empty((chunk, runs), dtype=float)
+    rows = np.arange(runs)
+
+    for idx, algo in enumerate(algorithms):
+        rng = make_rng(seed_sequence, idx)
+        algo.reset(runs=runs, rng=rng)
+        select, update, pull_many = algo.select_arm, algo.update, bandit.pull_many
+
+        for start in range(0, steps, chunk):
+            n = min(chunk, steps - start)
+            if reward_table is not None:
+                table_rewards = reward_table.block(0, runs, start, start + n)
+
+            for i in range(n):
+                chosen_arms = select()
+                if reward_table is None:
+                    rewards = pull_many(chosen_arms, rng, start + i)
+                else:
+                    rewards = table_rewards[rows, i, chosen_arms]
+                update(chosen_arms, rewards)
+                arms_buffer[i] = chosen_arms
+                rewards_buffer[i] = rewards
+
+            accumulator.add(idx, 0, start, arms_buffer[:n].T, rewards_buffer[:n].T)
+
+        algo.reset()  # Devolver el algoritmo al modo escalar
+
+
+@register_engine('parallel')
+def run_parallel(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+                 accumulator: Accumulator, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 reward_table: Optional[RewardTable] = None,
+                 seed_sequence: Optional[np.random.SeedSequence] = None,
+                 n_workers: Optional[int] = None, shard_size: int = DEFAULT_SHARD_SIZE):
+    """
+    Motor paralelo: reparte las ejecuciones en bloques de shard_size entre varios procesos.
+
+    Cada proceso simula su bloque con simulate_runs sobre una copia vacía del acumulador,
+    y los acumuladores parciales se combinan en el orden de los bloques. Como cada
+    ejecución tiene su propio generador y el reparto en bloques no depende de n_workers,
+    el resultado es idéntico bit a bit para cualquier número de procesos.
+
+    :param n_workers: Número de procesos (por defecto, uno por núcleo; 1 ejecuta en el propio proceso).
+    :param shard_size: Número de ejecuciones de cada bloque.
+    """
+    assert shard_size > 0, "El tamaño de bloque debe ser mayor que 0."
+    if seed_sequence is None:
+        seed_sequence = np.random.SeedSequence()
+
+    template = copy.deepcopy(accumulator)  # Acumulador vacío (ya inicializado con begin)
+    tasks = [(bandit, algorithms, steps, run_start, min(run_start + shard_size, runs), template,
+              chunk_size, reward_table, seed_sequence)
+             for run_start in range(0, runs, shard_size)]
+
+    if n_workers == 1:
+        shard_accumulators = map(_run_shard, tasks)
+        for shard_accumulator in shard_accumulators:
+            accumulator.merge(shard_accumulator)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        for shard_accumulator in executor.map(_run_shard, tasks):
+            accumulator.merge(shard_accumulator)
+
+
+def _run_shard(task) -> Accumulator:
+    """
+    Simula un bloque de ejecuciones en un proceso del motor paralelo.
+
+    :param task: Tupla con los argumentos de simulate_runs (el acumulador es una plantilla vacía).
+    :return: Acumulador con los resultados del bloque.
+    """
+    bandit, algorithms, steps, run_start, run_stop, template, chunk_size, reward_table, seed_sequence = task
+    accumulator = copy.deepcopy(template)
+    simulate_runs(bandit, algorithms, steps, run_start, run_stop, accumulator, chunk_size, reward_table, seed_sequence)
+    return accumulator
+
+
+def run_experiment_complete(bandit: Bandit, algorithms: List[Algorithm], steps: int, runs: int,
+                            seed: Optional[int] = None, engine: str = 'serial',
+                            accumulator: Optional[Accumulator] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            reward_table: Optional[RewardTable] = None, verbose: bool = False,
+                            **engine_options):
+    """
+    Ejecuta un experimento comparativo de varios algoritmos sobre un bandido.
+
+    Cada algoritmo se ejecuta runs veces durante steps pasos, reiniciándose en cada
+    ejecución. Los resultados son los mismos que devolvía la función de los notebooks.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos.
+    :param algorithms: Lista de instancias de algoritmos a comparar.
+    :param steps: Número de pasos de cada ejecución.
+    :param runs: Número de ejecuciones por algoritmo.
+    :param seed: (Opcional) Semilla para asegurar la reproducibilidad de los resultados.
+    :param engine: Nombre del motor de ejecución registrado en ENGINES.
+    :param accumulator: (Opcional) Acumulador de resultados; por defecto DenseAccumulator.
+    :param chunk_size: Número de pasos que se entregan al acumulador en cada bloque.
+    :param reward_table: (Opcional) Tabla de recompensas pregeneradas compartida por todos los
+                         algoritmos (números aleatorios comunes).
+    :param verbose: Si es True imprime el número de selecciones de cada brazo.
+    :param engine_options: Opciones propias del motor (p. ej. n_workers y shard_size del motor paralelo).
+    :return: Tupla (rewards, optimal_selections, arm_stats, regret_accumulated).
+    :raises ValueError: Si el motor solicitado no está registrado.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de ejecución desconocido: {engine}. Disponibles: {list(ENGINES)}")
+
+    if reward_table is not None:
+        assert reward_table.k == bandit.k, "La tabla de recompensas no corresponde al bandido."
+        assert runs <= reward_table.runs and steps <= reward_table.steps, \
+            "La tabla de recompensas es menor que el experimento solicitado."
+        chunk_size = reward_table.chunk_size  # Leer la tabla alineada con sus bloques
+
+    if accumulator is None:
+        accumulator = DenseAccumulator()
+    accumulator.begin(bandit, len(algorithms), steps, runs)
+
+    # Todas las fuentes de aleatoriedad del experimento derivan de esta secuencia de semillas
+    seed_sequence = np.random.SeedSequence(seed)
+
+    ENGINES[engine](bandit, algorithms, steps, runs, accumulator, chunk_size,
+                    reward_table=reward_table, seed_sequence=seed_sequence, **engine_options)
+
+    rewards, optimal_selections, arm_stats, regret_accumulated = accumulator.results()
+
+    if verbose:
+        print("\nNúmero de veces que fue seleccionado cada brazo:")
+        for algo_idx, algo in enumerate(algorithms):
+            print(f"\n- Algoritmo {algo_idx} ({type(algo).__name__}):")
+            for arm, count in enumerate(arm_stats[algo_idx]['selection_counts']):
+                status = "✅ Brazo Óptimo General" if arm == bandit.optimal_arm else "No óptimo"
+                print(f"   Brazo {arm + 1}: {int(count)} veces ({status})")
+
+    return rewards, optimal_selections, arm_stats, regret_accumulated
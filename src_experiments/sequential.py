@@ -0,0 +1,166 @@
+"""
+Module: src_experiments/sequential.py
+Description: Comparación secuencial de algoritmos con asignación adaptativa de ejecuciones.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import copy
+from statistics import NormalDist
+from typing import List, Optional
+
+import numpy as np
+
+from src_algorithms import Algorithm
+from src_arms import Bandit
+from src_experiments.accumulators import Accumulator, DenseAccumulator
+from src_experiments.runner import DEFAULT_CHUNK_SIZE, ENGINES
+
+
+def run_sequential_comparison(bandit: Bandit, algorithms: List[Algorithm], steps: int,
+                              batch_runs: int = 20, max_runs: int = 500,
+                              max_total_runs: Optional[int] = None, confidence: float = 0.95,
+                              seed: Optional[int] = None, engine: str = 'serial',
+                              accumulator: Optional[Accumulator] = None,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE, verbose: bool = False,
+                              **engine_options):
+    """
+    Compara varios algoritmos añadiendo ejecuciones por lotes solo donde hacen falta.
+
+    En cada ronda se calcula, para cada algoritmo, el intervalo de confianza (aproximación
+    normal) del regret acumulado final a partir de los resúmenes de sus ejecuciones. Un
+    algoritmo recibe batch_runs ejecuciones más solo si su intervalo se solapa con el de
+    algún otro algoritmo, es decir, si su posición en la clasificación aún no está decidida.
+    La comparación termina cuando ningún intervalo se solapa (clasificación resuelta) o
+    cuando se agota el presupuesto (max_runs por algoritmo o max_total_runs en total).
+
+    Como los intervalos se vuelven a mirar en cada ronda, un nivel fijo por ronda haría
+    que alguno acabase fuera del regret real con probabilidad mucho mayor que 1 - confidence.
+    Cada algoritmo se evalúa como mucho ceil(max_runs / batch_runs) veces (cada ronda en la
+    que recibe ejecuciones lo hace con un lote completo salvo la última), así que sus
+    intervalos se calculan con la corrección de Bonferroni sobre ese número de rondas: el
+    nivel confidence se cumple a la vez en todas las rondas para cada algoritmo.
+
+    Cada lote es un experimento independiente del motor elegido cuyos resultados se
+    combinan en accumulator con merge, por lo que el acumulador debe admitir combinarse.
+    El generador de cada ejecución depende solo de la semilla, del algoritmo y del índice
+    de la ejecución, de modo que el resultado es reproducible.
+
+    :param bandit: Bandido sobre el que se ejecutan los algoritmos.
+    :param algorithms: Lista de instancias de algoritmos a comparar.
+    :param steps: Número de pasos de cada ejecución.
+    :param batch_runs: Número de ejecuciones que se añaden a un algoritmo en cada ronda (al menos 2).
+    :param max_runs: Número máximo de ejecuciones por algoritmo.
+    :param max_total_runs: (Opcional) Número máximo de ejecuciones sumando todos los algoritmos.
+    :param confidence: Nivel de confianza de cada algoritmo, simultáneo en todas las rondas.
+    :param seed: (Opcional) Semilla para asegurar la reproducibilidad de los resultados.
+    :param engine: Nombre del motor de ejecución registrado en ENGINES.
+    :param accumulator: (Opcional) Acumulador de resultados; por defecto DenseAccumulator.
+    :param chunk_size: Número de pasos que se entregan al acumulador en cada bloque.
+    :param verbose: Si es True imprime la asignación de ejecuciones de cada ronda.
+    :param engine_options: Opciones propias del motor (p. ej. n_workers del motor paralelo).
+    :return: Tupla (rewards, optimal_selections, arm_stats, regret_accumulated, intervals), donde
+             intervals es un array (2 x algoritmos) con el intervalo del regret final de cada
+             algoritmo. El número de ejecuciones de cada uno está en accumulator.run_counts.
+    :raises ValueError: Si el motor solicitado no está registrado.
+    """
+    assert steps > 0, "El número de pasos debe ser mayor que 0."
+    assert batch_runs >= 2, "Cada lote debe tener al menos 2 ejecuciones para estimar la varianza."
+    assert max_runs >= batch_runs, "max_runs debe ser al menos batch_runs."
+    assert 0 < confidence < 1, "El nivel de confianza debe estar entre 0 y 1."
+
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de ejecución desconocido: {engine}. Disponibles: {list(ENGINES)}")
+
+    if accumulator is None:
+        accumulator = DenseAccumulator()
+    template = copy.deepcopy(accumulator)  # Acumulador sin inicializar para cada lote
+    accumulator.begin(bandit, len(algorithms), steps, max_runs)
+
+    seed_sequence = np.random.SeedSequence(seed)
+    n_runs = np.zeros(len(algorithms), dtype=int)
+    pending = np.ones(len(algorithms), dtype=bool)  # Algoritmos cuya posición no está decidida
+    budget = np.inf if max_total_runs is None else max_total_runs
+    # Corrección de Bonferroni sobre el número máximo de rondas en que se evalúa cada algoritmo
+    round_confidence = 1 - (1 - confidence) / -(-max_runs // batch_runs)
+
+    while True:
+        # Reparto de la ronda respetando los límites por algoritmo y el presupuesto total
+        allocation = np.where(pending, np.minimum(batch_runs, max_runs - n_runs), 0)
+        remaining = budget - n_runs.sum()
+        for algo_idx in np.flatnonzero(allocation):
+            allocation[algo_idx] = min(allocation[algo_idx], remaining)
+            remaining -= allocation[algo_idx]
+        if not allocation.any():
+            break
+
+        for algo_idx in np.flatnonzero(allocation):
+            runs = int(allocation[algo_idx])
+            batch = copy.deepcopy(template)
+            batch.begin(bandit, 1, steps, runs)
+            # Flujo propio de cada lote: (algoritmo, primera ejecución) + (ejecución, 0) dentro del motor
+            batch_sequence = np.random.SeedSequence(seed_sequence.entropy,
+                                                    spawn_key=seed_sequence.spawn_key + (int(algo_idx), int(n_runs[algo_idx])))
+            ENGINES[engine](bandit, [algorithms[algo_idx]], steps, runs, batch, chunk_size,
+                            seed_sequence=batch_sequence, **engine_options)
+            accumulator.merge(batch, algo_idx=int(algo_idx), run_offset=int(n_runs[algo_idx]))
+            n_runs[algo_idx] += runs
+
+        intervals = _final_regret_intervals(accumulator, round_confidence)
+        pending = _overlapping(intervals)
+
+        if verbose:
+            print(f"Ronda: ejecuciones {n_runs.tolist()}, pendientes {np.flatnonzero(pending).tolist()}")
+        if not pending.any():
+            break
+
+    rewards, optimal_selections, arm_stats, regret_accumulated = accumulator.results()
+
+    if verbose:
+        total = int(n_runs.sum())
+        print(f"\nEjecuciones simuladas: {total} de {len(algorithms) * max_runs} "
+              f"({total * steps} pasos). Clasificación por regret final:")
+        for position, algo_idx in enumerate(np.argsort(intervals.mean(axis=0))):
+            status = "pendiente" if pending[algo_idx] else "resuelto"
+            print(f"   {position + 1}. Algoritmo {algo_idx} ({type(algorithms[algo_idx]).__name__}): "
+                  f"[{intervals[0, algo_idx]:.2f}, {intervals[1, algo_idx]:.2f}] "
+                  f"con {n_runs[algo_idx]} ejecuciones ({status})")
+
+    return rewards, optimal_selections, arm_stats, regret_accumulated, intervals
+
+
+def _final_regret_intervals(accumulator: Accumulator, confidence: float) -> np.ndarray:
+    """
+    Calcula el intervalo de confianza (aproximación normal) del regret final de cada algoritmo.
+
+    :return: Array (2 x algoritmos) con los límites inferior y superior.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    intervals = np.empty((2, accumulator.n_algorithms))
+    for algo_idx in range(accumulator.n_algorithms):
+        regrets = accumulator.run_summaries[accumulator.REGRET, algo_idx, accumulator.completed[algo_idx]]
+        if len(regrets) < 2:
+            intervals[:, algo_idx] = -np.inf, np.inf  # Sin ejecuciones suficientes no hay nada decidido
+            continue
+        half_width = z * regrets.std(ddof=1) / np.sqrt(len(regrets))
+        intervals[:, algo_idx] = regrets.mean() - half_width, regrets.mean() + half_width
+    return intervals
+
+
+def _overlapping(intervals: np.ndarray) -> np.ndarray:
+    """
+    Indica qué intervalos se solapan con el de algún otro algoritmo.
+
+    :param intervals: Array (2 x algoritmos) con los límites inferior y superior.
+    :return: Vector booleano con un elemento por algoritmo.
+    """
+    low, high = intervals
+    overlap = (low[:, np.newaxis] <= high[np.newaxis, :]) & (low[np.newaxis, :] <= high[:, np.newaxis])
+    np.fill_diagonal(overlap, False)
+    return overlap.any(axis=1)
@@ -0,0 +1,199 @@
+"""
+Module: src_experiments/store.py
+Description: Almacenamiento en disco de los resultados de los experimentos con carga mediante memmap.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src_algorithms import Algorithm
+from src_arms import Bandit
+from src_experiments.accumulators import Accumulator
+
+# Versión del formato del directorio de resultados
+FORMAT_VERSION = 1
+# Nombre del manifiesto dentro del directorio
+MANIFEST = 'manifest.json'
+# Número de columnas (pasos) que se copian a disco en cada bloque
+WRITE_CHUNK = 1 << 16
+
+
+class ResultStore:
+    """
+    Directorio de resultados con un fichero .npy por columna y un manifiesto JSON.
+
+    Cada resultado (curvas por paso, estadísticas y valores esperados por brazo, resúmenes
+    por ejecución...) se guarda como un array .npy independiente, escrito por bloques de pasos. Al abrir el
+    directorio solo se lee el manifiesto; cada columna se abre bajo demanda con
+    np.load(mmap_mode='r'), de modo que recargar resultados de varios GB no copia nada a
+    memoria hasta que se accede a los datos.
+
+    El manifiesto se escribe al final, por lo que un directorio sin manifiesto corresponde
+    a una escritura interrumpida.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre un directorio de resultados guardado con save.
+
+        :param path: Directorio de resultados.
+        :raises FileNotFoundError: Si el directorio no contiene un manifiesto.
+        """
+        self.path = Path(path)
+        with open(self.path / MANIFEST, encoding='utf-8') as file:
+            self.manifest = json.load(file)
+        assert self.manifest['format_version'] == FORMAT_VERSION, "Versión del formato de resultados no soportada."
+
+        self.config: dict = self.manifest['config']
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def save(cls, path: str, bandit: Bandit, algorithms: List[Algorithm], results: Optional[tuple] = None,
+             accumulator: Optional[Accumulator] = None, config: Optional[dict] = None) -> 'ResultStore':
+        """
+        Guarda los resultados de un experimento en un directorio.
+
+        :param path: Directorio de destino (se crea si no existe; se sobrescriben sus columnas).
+        :param bandit: Bandido del experimento.
+        :param algorithms: Lista de algoritmos comparados.
+        :param results: (Opcional) Tupla devuelta por run_experiment_complete.
+        :param accumulator: (Opcional) Acumulador del experimento; si se indica se guardan
+                            también sus puntos de control, varianzas y resúmenes por ejecución.
+        :param config: (Opcional) Configuración adicional del experimento (serializable a JSON).
+        :return: El directorio abierto en modo lectura.
+        """
+        assert results is not None or accumulator is not None, "Hay que indicar los resultados o el acumulador."
+
+        if results is None:
+            results = accumulator.results()
+        rewards, optimal_selections, arm_stats, regret_accumulated = results
+
+        columns = {'rewards': rewards, 'optimal_selections': optimal_selections,
+                   'regret_accumulated': regret_accumulated, 'expected_values': bandit.expected_rewards,
+                   'average_rewards': np.stack([stats['average_rewards'] for stats in arm_stats]),
+                   'selection_counts': np.stack([stats['selection_counts'] for stats in arm_stats])}
+        if accumulator is not None:
+            columns['checkpoints'] = accumulator.checkpoints
+            columns['run_counts'] = accumulator.run_counts
+            columns['run_summaries'] = accumulator.run_summaries
+            columns['completed'] = accumulator.completed
+            try:
+                variances = accumulator.variances()
+            except NotImplementedError:
+                variances = None
+            if variances is not None:
+                for name, variance in zip(('rewards', 'optimal_selections', 'regret_accumulated'), variances):
+                    columns[f'{name}_variance'] = variance
+        else:
+            columns['checkpoints'] = np.arange(rewards.shape[1])
+
+        path = Path(path)
+        os.makedirs(path, exist_ok=True)
+        if (path / MANIFEST).exists():
+            os.remove(path / MANIFEST)  # El directorio queda incompleto hasta escribir el nuevo manifiesto
+
+        manifest_columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            _write_column(path / f'{name}.npy', values)
+            manifest_columns[name] = {'file': f'{name}.npy', 'dtype': values.dtype.str, 'shape': list(values.shape)}
+
+        manifest = {'format_version': FORMAT_VERSION,
+                    'config': {**_describe_bandit(bandit),
+                               'algorithms': [_describe_algorithm(algo) for algo in algorithms],
+                               **(config or {})},
+                    'columns': manifest_columns}
+        temporary = path / f'{MANIFEST}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, ensure_ascii=False, default=str)
+        os.replace(temporary, path / MANIFEST)
+
+        return cls(path)
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Nombres de las columnas guardadas.
+        """
+        return list(self.manifest['columns'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Devuelve una columna abierta mediante memmap (solo lectura, sin copiar a memoria).
+
+        :param name: Nombre de la columna.
+        :return: Array respaldado por el fichero .npy de la columna.
+        :raises KeyError: Si la columna no existe.
+        """
+        if name not in self._columns:
+            column = self.manifest['columns'][name]
+            self._columns[name] = np.load(self.path / column['file'], mmap_mode='r')
+        return self._columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.manifest['columns']
+
+    def results(self):
+        """
+        Devuelve los resultados con la misma forma que run_experiment_complete (arrays en memmap).
+
+        :return: Tupla (rewards, optimal_selections, arm_stats, regret_accumulated).
+        """
+        average_rewards, selection_counts = self['average_rewards'], self['selection_counts']
+        arm_stats = [{'average_rewards': average_rewards[idx], 'selection_counts': selection_counts[idx]}
+                     for idx in range(len(average_rewards))]
+        return self['rewards'], self['optimal_selections'], arm_stats, self['regret_accumulated']
+
+    def __str__(self):
+        """
+        Representación en cadena del directorio de resultados.
+        """
+        return f"ResultStore(path={self.path}, columnas={self.columns})"
+
+
+def _write_column(path: Path, values: np.ndarray):
+    """
+    Escribe un array en un fichero .npy copiándolo por bloques de pasos (última dimensión).
+    """
+    column = np.lib.format.open_memmap(path, mode='w+', dtype=values.dtype, shape=values.shape)
+    if values.ndim == 0:
+        column[...] = values
+    else:
+        for start in range(0, values.shape[-1], WRITE_CHUNK):
+            column[..., start:start + WRITE_CHUNK] = values[..., start:start + WRITE_CHUNK]
+    column.flush()
+    del column
+
+
+def _describe_bandit(bandit: Bandit) -> dict:
+    """
+    Describe un bandido por su número de brazos, la clase de sus brazos y el brazo óptimo.
+
+    El tamaño no depende de k: los valores esperados de los brazos se guardan como columna.
+    """
+    arm_class = bandit.arm_class
+    return {'k': bandit.k, 'optimal_arm': int(bandit.optimal_arm),
+            'arm_class': f"{arm_class.__module__}.{arm_class.__qualname__}" if arm_class is not None else None}
+
+
+def _describe_algorithm(algo: Algorithm) -> dict:
+    """
+    Describe un algoritmo por su clase y los parámetros de su constructor guardados como atributos.
+    """
+    signature = inspect.signature(type(algo).__init__)
+    parameters = {name: getattr(algo, name) for name in signature.parameters
+                  if isinstance(getattr(algo, name, None), (bool, int, float, str))}
+    return {'class': f"{type(algo).__module__}.{type(algo).__qualname__}", 'parameters': parameters}
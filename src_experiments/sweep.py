@@ -0,0 +1,205 @@
+"""
+Module: src_experiments/sweep.py
+Description: Barridos de hiperparámetros en paralelo con caché de resultados en disco.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import copy
+import hashlib
+import inspect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from src_algorithms import Algorithm
+from src_arms import Arm, Bandit
+from src_experiments.accumulators import Accumulator, StreamingAccumulator
+from src_experiments.runner import run_experiment_complete
+
+# Paquetes cuyo código fuente forma parte de la clave de la caché
+_SOURCE_PACKAGES = ('src_algorithms', 'src_arms', 'src_experiments')
+# Directorio por defecto de la caché de resultados
+DEFAULT_CACHE_DIR = '.sweep_cache'
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[dict]:
+    """
+    Expande una rejilla de parámetros en la lista de todas sus combinaciones.
+
+    :param grid: Diccionario que asocia a cada parámetro la lista de valores a probar.
+    :return: Lista de diccionarios, uno por combinación (en el orden del producto cartesiano).
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def code_version() -> str:
+    """
+    Calcula un hash del código fuente de los algoritmos, los brazos y el motor de experimentos.
+
+    Cualquier cambio en esos paquetes invalida los resultados guardados en la caché.
+    :return: Hash sha256 en hexadecimal.
+    """
+    root = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for package in _SOURCE_PACKAGES:
+        for path in sorted((root / package).glob('*.py')):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run_sweep(algorithms: List[Tuple[Type[Algorithm], Dict[str, Sequence]]],
+              arm_families: Sequence[Type[Arm]], ks: Sequence[int], steps: Sequence[int],
+              seeds: Sequence[int], runs: int, engine: str = 'batched',
+              accumulator: Optional[Accumulator] = None, n_workers: Optional[int] = None,
+              cache_dir: Optional[str] = DEFAULT_CACHE_DIR, verbose: bool = False,
+              **engine_options) -> List[dict]:
+    """
+    Ejecuta un barrido sobre la rejilla algoritmo x parámetros x familia de brazos x k x steps x semilla.
+
+    Cada celda genera un bandido con Bandit.generate(family, k, rng=seed) y ejecuta un único
+    algoritmo con run_experiment_complete(..., seed=seed). Su resumen se guarda en
+    cache_dir con un nombre que es el hash de la configuración y de la versión del
+    código, de modo que al repetir el barrido solo se simulan las celdas nuevas. Las
+    celdas pendientes se reparten entre n_workers procesos.
+
+    Ejemplo de rejilla de algoritmos:
+        [(EpsilonGreedy, {'epsilon': [0, 0.01, 0.1]}), (UCB2, {'alpha_param': [0.2, 0.9]})]
+
+    :param algorithms: Lista de pares (clase de algoritmo, rejilla de parámetros del constructor).
+    :param arm_families: Clases de brazos con las que generar los bandidos.
+    :param ks: Números de brazos.
+    :param steps: Números de pasos de cada ejecución.
+    :param seeds: Semillas (de los brazos y del experimento).
+    :param runs: Número de ejecuciones de cada celda.
+    :param engine: Motor de ejecución de cada celda (el paralelismo lo aporta el barrido).
+    :param accumulator: (Opcional) Acumulador plantilla; por defecto StreamingAccumulator con
+                        1000 puntos lineales (idéntico al denso si steps <= 1000).
+    :param n_workers: Número de procesos (por defecto, uno por núcleo; 1 ejecuta en el propio proceso).
+    :param cache_dir: Directorio de la caché; None para no usarla.
+    :param verbose: Si es True imprime cuántas celdas se leen de la caché y cuántas se simulan.
+    :param engine_options: Opciones propias del motor.
+    :return: Lista con un diccionario por celda con las claves 'config', 'checkpoints', 'rewards',
+             'optimal_selections', 'regret_accumulated', 'average_rewards', 'selection_counts',
+             'run_summaries' y 'cached'.
+    """
+    assert runs > 0, "El número de ejecuciones debe ser mayor que 0."
+
+    if accumulator is None:
+        accumulator = StreamingAccumulator(n_points=1000, spacing='linear')
+
+    version = code_version()
+    # Opciones del acumulador: solo los parámetros de su constructor (no el estado que deja begin)
+    signature = inspect.signature(type(accumulator).__init__)
+    accumulator_options = {name: getattr(accumulator, name) for name in signature.parameters
+                           if isinstance(getattr(accumulator, name, None), (bool, int, float, str))}
+    cells = []
+    for algorithm_class, parameter_grid in algorithms:
+        for parameters, family, k, n_steps, seed in itertools.product(
+                expand_grid(parameter_grid), arm_families, ks, steps, seeds):
+            config = {'algorithm': f"{algorithm_class.__module__}.{algorithm_class.__qualname__}",
+                      'parameters': parameters, 'arms': f"{family.__module__}.{family.__qualname__}",
+                      'k': k, 'steps': n_steps, 'seed': seed, 'runs': runs, 'engine': engine,
+                      'engine_options': engine_options,
+                      'accumulator': {'class': type(accumulator).__name__, **accumulator_options}}
+            cells.append((algorithm_class, family, config, _cell_key(config, version)))
+
+    results: List[Optional[dict]] = [None] * len(cells)
+    pending = []
+    for index, (_, _, _, key) in enumerate(cells):
+        results[index] = _load_cell(cache_dir, key)
+        if results[index] is None:
+            pending.append(index)
+
+    if verbose:
+        print(f"Barrido: {len(cells)} celdas, {len(cells) - len(pending)} en caché, {len(pending)} por simular.")
+
+    tasks = [(cells[index][0], cells[index][1], cells[index][2], accumulator) for index in pending]
+    if n_workers == 1 or not tasks:
+        for index, result in zip(pending, map(_run_cell, tasks)):
+            results[index] = _save_cell(cache_dir, cells[index][3], result)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            # Cada celda se guarda en cuanto termina, así un barrido interrumpido no pierde lo calculado
+            for index, result in zip(pending, executor.map(_run_cell, tasks)):
+                results[index] = _save_cell(cache_dir, cells[index][3], result)
+
+    return results
+
+
+def _cell_key(config: dict, version: str) -> str:
+    """
+    Calcula la clave de la caché de una celda: hash de su configuración canónica y de la versión del código.
+    """
+    canonical = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(f"{version}:{canonical}".encode()).hexdigest()
+
+
+def _run_cell(task) -> dict:
+    """
+    Simula una celda del barrido (en un proceso del pool o en el propio proceso).
+
+    :param task: Tupla (clase de algoritmo, familia de brazos, configuración, acumulador plantilla).
+    :return: Resumen de la celda.
+    """
+    algorithm_class, family, config, template = task
+    k, seed = config['k'], config['seed']
+    bandit = Bandit.generate(family, k, rng=seed)
+    algorithm = algorithm_class(k, **config['parameters'])
+    accumulator = copy.deepcopy(template)
+
+    rewards, optimal_selections, arm_stats, regret_accumulated = run_experiment_complete(
+        bandit, [algorithm], config['steps'], config['runs'], seed=seed, engine=config['engine'],
+        accumulator=accumulator, **config['engine_options'])
+
+    return {'config': config, 'checkpoints': accumulator.checkpoints, 'rewards': rewards[0],
+            'optimal_selections': optimal_selections[0], 'regret_accumulated': regret_accumulated[0],
+            'average_rewards': arm_stats[0]['average_rewards'],
+            'selection_counts': arm_stats[0]['selection_counts'],
+            'run_summaries': accumulator.run_summaries[:, 0], 'cached': False}
+
+
+def _load_cell(cache_dir: Optional[str], key: str) -> Optional[dict]:
+    """
+    Lee el resumen de una celda de la caché, o devuelve None si no está.
+    """
+    if cache_dir is None:
+        return None
+    path = Path(cache_dir) / f"{key}.npz"
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        result = {name: data[name] for name in data.files if name != 'config'}
+        result['config'] = json.loads(str(data['config']))
+    result['cached'] = True
+    return result
+
+
+def _save_cell(cache_dir: Optional[str], key: str, result: dict) -> dict:
+    """
+    Guarda el resumen de una celda en la caché (escritura atómica mediante un fichero temporal).
+
+    :return: El propio resumen.
+    """
+    if cache_dir is None:
+        return result
+    os.makedirs(cache_dir, exist_ok=True)
+    path = Path(cache_dir) / f"{key}.npz"
+    temporary = path.with_suffix('.tmp.npz')
+    arrays = {name: value for name, value in result.items() if name not in ('config', 'cached')}
+    np.savez(temporary, config=json.dumps(result['config'], default=str), **arrays)
+    os.replace(temporary, path)
+    return result
@@ -0,0 +1,229 @@
+"""
+Module: src_experiments/trace.py
+Description: Grabación de las trayectorias completas de cada ejecución y reproducción sobre un algoritmo.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from src_algorithms import Algorithm
+from src_arms import ArmBernoulli, ArmBinomial, Bandit
+from src_experiments.accumulators import Accumulator, DenseAccumulator
+from src_experiments.store import _describe_bandit
+
+# Nombre del manifiesto dentro del directorio de la traza
+MANIFEST = 'manifest.json'
+
+
+def arm_dtype(k: int) -> np.dtype:
+    """
+    Devuelve el tipo entero sin signo más pequeño capaz de almacenar los índices de k brazos.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if k - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def reward_dtype(bandit: Bandit) -> np.dtype:
+    """
+    Devuelve el tipo con el que almacenar las recompensas de un bandido sin pérdida relevante.
+
+    Las recompensas Bernoulli y Binomiales (n <= 255) son enteros pequeños y se guardan
+    como uint8; el resto, como float32.
+    """
+    if bandit.arm_class is not None:
+        small = bandit.arm_class is ArmBernoulli or (bandit.arm_class is ArmBinomial and bandit.parameters['n'].max() <= 255)
+    else:
+        small = all(isinstance(arm, ArmBernoulli) or (isinstance(arm, ArmBinomial) and arm.n <= 255) for arm in bandit.arms)
+    if small:
+        return np.dtype(np.uint8)
+    return np.dtype(np.float32)
+
+
+class TraceRecorder(Accumulator):
+    """
+    Acumulador que graba en disco los brazos elegidos y las recompensas de cada paso.
+
+    Envuelve a otro acumulador, al que delega todos los resultados, y escribe cada bloque
+    que recibe del motor en dos ficheros .npy (algoritmos x ejecuciones x pasos) abiertos
+    con np.memmap: los bloques del motor (chunk_size pasos) son los buffers de escritura y
+    el volcado a disco lo hace el sistema operativo en segundo plano, de modo que la
+    memoria usada no depende del tamaño de la traza. Los brazos se guardan con el tipo
+    entero más pequeño posible (uint8/uint16/uint32) y las recompensas como float32, o
+    uint8 en bandidos Bernoulli/Binomiales.
+
+    Es compatible con los motores serie, por lotes y paralelo (cada proceso escribe su
+    rango de ejecuciones en los mismos ficheros). La traza se lee con Trace.
+    """
+
+    def __init__(self, path: str, accumulator: Optional[Accumulator] = None, rewards_dtype=None):
+        """
+        Inicializa el grabador.
+
+        :param path: Directorio en el que se escribe la traza.
+        :param accumulator: (Opcional) Acumulador al que se delegan los resultados; por defecto DenseAccumulator.
+        :param rewards_dtype: (Opcional) Tipo de las recompensas grabadas; por defecto según el bandido.
+        """
+        self.path = Path(path)
+        self.accumulator = DenseAccumulator() if accumulator is None else accumulator
+        self.rewards_dtype = rewards_dtype
+        self._arms = None
+        self._rewards = None
+
+    def begin(self, bandit: Bandit, n_algorithms: int, steps: int, runs: int):
+        self.accumulator.begin(bandit, n_algorithms, steps, runs)
+
+        shape = (n_algorithms, runs, steps)
+        dtypes = {'arms': arm_dtype(bandit.k),
+                  'rewards': np.dtype(self.rewards_dtype) if self.rewards_dtype is not None else reward_dtype(bandit)}
+        os.makedirs(self.path, exist_ok=True)
+        self._arms = np.lib.format.open_memmap(self.path / 'arms.npy', mode='w+', dtype=dtypes['arms'], shape=shape)
+        self._rewards = np.lib.format.open_memmap(self.path / 'rewards.npy', mode='w+', dtype=dtypes['rewards'],
+                                                  shape=shape)
+
+        manifest = {**_describe_bandit(bandit), 'n_algorithms': n_algorithms, 'runs': runs, 'steps': steps,
+                    'dtypes': {name: dtype.str for name, dtype in dtypes.items()}}
+        with open(self.path / MANIFEST, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, ensure_ascii=False)
+
+    def add(self, algo_idx: int, run: int, start: int, arms: np.ndarray, rewards: np.ndarray):
+        self.accumulator.add(algo_idx, run, start, arms, rewards)
+        n_runs, n = arms.shape
+        self._arms[algo_idx, run:run + n_runs, start:start + n] = arms
+        self._rewards[algo_idx, run:run + n_runs, start:start + n] = rewards
+
+    def merge(self, other: 'TraceRecorder', algo_idx: Optional[int] = None, run_offset: int = 0):
+        assert algo_idx is None and run_offset == 0, "La traza solo admite combinar ejecuciones del mismo experimento."
+        # other ya ha escrito sus ejecuciones en los mismos ficheros; solo se combinan los resultados
+        self.accumulator.merge(other.accumulator)
+
+    def flush(self):
+        """
+        Fuerza el volcado a disco de la traza.
+        """
+        if self._arms is not None:
+            self._arms.flush()
+            self._rewards.flush()
+
+    def results(self):
+        self.flush()
+        return self.accumulator.results()
+
+    def variances(self):
+        return self.accumulator.variances()
+
+    @property
+    def checkpoints(self) -> np.ndarray:
+        return self.accumulator.checkpoints
+
+    def confidence_bands(self, confidence: float = 0.95):
+        return self.accumulator.confidence_bands(confidence)
+
+    def bootstrap_intervals(self, confidence: float = 0.95, n_resamples: int = 1000, seed=None):
+        return self.accumulator.bootstrap_intervals(confidence, n_resamples, seed)
+
+    def __getattr__(self, name: str):
+        """
+        Expone los atributos del acumulador envuelto (run_counts, run_summaries...).
+        """
+        if name.startswith('__') or 'accumulator' not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.accumulator, name)
+
+    def __getstate__(self):
+        """
+        Al copiar o serializar el grabador (p. ej. hacia otro proceso) no se copia la traza:
+        se vuelca a disco y el receptor vuelve a abrir los ficheros para escribir su parte.
+        """
+        self.flush()
+        state = self.__dict__.copy()
+        state['_arms'] = state['_rewards'] = None
+        state['_opened'] = self._arms is not None
+        return state
+
+    def __setstate__(self, state):
+        opened = state.pop('_opened')
+        self.__dict__.update(state)
+        if opened:
+            self._arms = np.load(self.path / 'arms.npy', mmap_mode='r+')
+            self._rewards = np.load(self.path / 'rewards.npy', mmap_mode='r+')
+
+
+class Trace:
+    """
+    Traza grabada con TraceRecorder, abierta en modo solo lectura mediante memmap.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre una traza.
+
+        :param path: Directorio de la traza.
+        """
+        self.path = Path(path)
+        with open(self.path / MANIFEST, encoding='utf-8') as file:
+            self.manifest = json.load(file)
+        self.k = self.manifest['k']
+        self.runs = self.manifest['runs']
+        self.steps = self.manifest['steps']
+        self.arms = np.load(self.path / 'arms.npy', mmap_mode='r')  # (algoritmos x ejecuciones x pasos)
+        self.rewards = np.load(self.path / 'rewards.npy', mmap_mode='r')  # (algoritmos x ejecuciones x pasos)
+
+    def replay(self, algorithm: Algorithm, algo_idx: int, run: int, rng=None, check: bool = False,
+               callback: Optional[Callable[[int, Algorithm], None]] = None,
+               bandit: Optional[Bandit] = None) -> int:
+        """
+        Vuelve a aplicar a un algoritmo la secuencia grabada de brazos y recompensas de una ejecución.
+
+        El algoritmo se reinicia y en cada paso recibe update(brazo grabado, recompensa
+        grabada), de modo que su estado evoluciona exactamente como durante la ejecución
+        y puede inspeccionarse paso a paso con callback. Con check=True se llama antes a
+        select_arm y se cuentan los pasos en los que el algoritmo elegiría otro brazo.
+
+        Para reproducir también las decisiones aleatorias hay que pasar el generador que usó
+        el motor serie, make_rng(np.random.SeedSequence(seed), run, algo_idx), y el bandido:
+        ese generador también muestreaba las recompensas, así que en cada paso se llama a
+        select_arm (aunque check sea False) y después se descarta una recompensa del bandido,
+        igual que en el motor, para mantenerlo sincronizado. Las recompensas float32 pueden
+        desempatar de forma distinta a las originales.
+
+        :param algorithm: Algoritmo a reproducir (se reinicia en modo escalar).
+        :param algo_idx: Índice del algoritmo en el experimento grabado.
+        :param run: Índice de la ejecución.
+        :param rng: (Opcional) Generador o semilla con la que reiniciar el algoritmo.
+        :param check: Si es True compara la decisión del algoritmo con el brazo grabado.
+        :param callback: (Opcional) Función llamada como callback(paso, algoritmo) tras cada actualización.
+        :param bandit: (Opcional) Bandido del experimento, para mantener rng sincronizado con el motor serie.
+        :return: Número de pasos en los que la decisión no coincide (0 si check es False).
+        """
+        assert algorithm.k == self.k, "El algoritmo no tiene el mismo número de brazos que la traza."
+        assert bandit is None or rng is not None, "Sincronizar con el bandido requiere el generador de la ejecución."
+
+        algorithm.reset(rng=rng)
+        arms = self.arms[algo_idx, run].tolist()
+        rewards = self.rewards[algo_idx, run].astype(float).tolist()
+        mismatches = 0
+        for step, (arm, reward) in enumerate(zip(arms, rewards)):
+            if check or bandit is not None:
+                chosen = algorithm.select_arm()  # Con el bandido, consume rng igual que el motor
+                if check and chosen != arm:
+                    mismatches += 1
+            if bandit is not None:
+                bandit.pull_arm(arm, algorithm.rng, step)
+            algorithm.update(arm, reward)
+            if callback is not None:
+                callback(step, algorithm)
+        return mismatches
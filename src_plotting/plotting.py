@@ -13,13 +13,15 @@ For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
 """
 
 
-from typing import List
+from typing import List, Optional, Union
 
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-from src_algorithms import Algorithm, EpsilonGreedy, Softmax, GradientPreference, UCB2, UCB1
+from src_algorithms import (Algorithm, EpsilonGreedy, Softmax, GradientPreference, UCB2, UCB1,
+                            GaussianKLUCB, UCBV, BetaThompsonSampling, GaussianThompsonSampling)
+from src_algorithms.nonStationary import ConstantStepEstimates, DiscountedEstimates, SlidingWindowEstimates
 
 
 def get_algorithm_label(algo: Algorithm) -> str:
@@ -40,8 +42,16 @@ def get_algorithm_label(algo: Algorithm) -> str:
         label += f" (alpha={algo.alpha})"
     elif isinstance(algo, UCB2):
         label += f" (alfa={algo.alpha_param})"
+    elif isinstance(algo, GaussianKLUCB):
+        label += f" (c={algo.c}, sigma={algo.sigma})"
+    elif isinstance(algo, UCBV):
+        label += f" (c={algo.c}, b={algo.b}, zeta={algo.zeta})"
     elif isinstance(algo, UCB1):
         label += f" (c={algo.c})"
+    elif isinstance(algo, BetaThompsonSampling):
+        label += f" (alpha0={algo.alpha0}, beta0={algo.beta0})"
+    elif isinstance(algo, GaussianThompsonSampling):
+        label += f" (mu0={algo.mu0}, kappa0={algo.kappa0})" if algo.sigma is None else f" (mu0={algo.mu0}, sigma={algo.sigma})"
 
 
 
@@ -50,22 +60,45 @@ def get_algorithm_label(algo: Algorithm) -> str:
     # Añadir más condiciones para otros algoritmos aquí
     else:
         raise ValueError("El algoritmo debe ser de la clase Algorithm o una subclase.")
+
+    # Parámetro de las variantes no estacionarias
+    if isinstance(algo, ConstantStepEstimates):
+        label = label[:-1] + f", alpha={algo.alpha})"
+    elif isinstance(algo, DiscountedEstimates):
+        label = label[:-1] + f", gamma={algo.gamma})"
+    elif isinstance(algo, SlidingWindowEstimates):
+        label = label[:-1] + f", window={algo.window})"
     return label
 
-def plot_average_rewards(steps: int, rewards: np.ndarray, algorithms: List[Algorithm]):
+def steps_axis(steps: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    Devuelve el eje x de las gráficas temporales.
+
+    :param steps: Número de pasos de tiempo, o pasos a los que corresponde cada columna de
+                  los resultados (p. ej. StreamingAccumulator.checkpoints).
+    :return: Pasos de tiempo de cada columna de los resultados.
+    """
+    return np.arange(steps) if np.ndim(steps) == 0 else np.asarray(steps)
+
+def plot_average_rewards(steps: Union[int, np.ndarray], rewards: np.ndarray, algorithms: List[Algorithm],
+                         bands: Optional[np.ndarray] = None):
     """
     Genera la gráfica de Recompensa Promedio vs Pasos de Tiempo.
 
-    :param steps: Número de pasos de tiempo.
+    :param steps: Número de pasos de tiempo o pasos de cada columna de rewards.
     :param rewards: Matriz de recompensas promedio.
     :param algorithms: Lista de instancias de algoritmos comparados.
+    :param bands: (Opcional) Bandas de confianza (2 x algoritmos x pasos) con los límites inferior y
+                  superior, p. ej. las de Accumulator.confidence_bands; se dibujan sombreadas.
     """
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
     plt.figure(figsize=(14, 7))
     for idx, algo in enumerate(algorithms):
         label = get_algorithm_label(algo)
-        plt.plot(range(steps), rewards[idx], label=label, linewidth=2)
+        line, = plt.plot(steps_axis(steps), rewards[idx], label=label, linewidth=2)
+        if bands is not None:
+            plt.fill_between(steps_axis(steps), bands[0][idx], bands[1][idx], color=line.get_color(), alpha=0.2)
 
     plt.xlabel('Pasos de Tiempo', fontsize=14)
     plt.ylabel('Recompensa Promedio', fontsize=14)
@@ -74,22 +107,27 @@ def plot_average_rewards(steps: int, rewards: np.ndarray, algorithms: List[Algor
     plt.tight_layout()
     plt.show()
 
-def plot_optimal_selections(steps: int, 
+def plot_optimal_selections(steps: Union[int, np.ndarray], 
                             optimal_selections: np.ndarray, 
-                            algorithms: List[Algorithm]):
+                            algorithms: List[Algorithm],
+                            bands: Optional[np.ndarray] = None):
     """
     Genera la gráfica de Porcentaje de Selección del Brazo Óptimo vs Pasos de Tiempo.
 
-    :param steps: Número de pasos de tiempo.
+    :param steps: Número de pasos de tiempo o pasos de cada columna de optimal_selections.
     :param optimal_selections: Matriz de porcentaje de selecciones óptimas.
     :param algorithms: Lista de instancias de algoritmos comparados.
+    :param bands: (Opcional) Bandas de confianza (2 x algoritmos x pasos) con los límites inferior y
+                  superior, p. ej. las de Accumulator.confidence_bands; se dibujan sombreadas.
     """
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
     plt.figure(figsize=(14, 7))
     for idx, algo in enumerate(algorithms):
         label = get_algorithm_label(algo)
-        plt.plot(range(steps), optimal_selections[idx], label=label, linewidth=2)
+        line, = plt.plot(steps_axis(steps), optimal_selections[idx], label=label, linewidth=2)
+        if bands is not None:
+            plt.fill_between(steps_axis(steps), bands[0][idx], bands[1][idx], color=line.get_color(), alpha=0.2)
 
     plt.xlabel('Pasos de Tiempo', fontsize=14)
     plt.ylabel('Porcentaje de Selección del Brazo Óptimo', fontsize=14)
@@ -98,24 +136,29 @@ def plot_optimal_selections(steps: int,
     plt.tight_layout()
     plt.show()
 
-def plot_regret(steps: int, regret_accumulated: np.ndarray, algorithms: List[Algorithm], expected_regret: np.ndarray = None):
+def plot_regret(steps: Union[int, np.ndarray], regret_accumulated: np.ndarray, algorithms: List[Algorithm], expected_regret: np.ndarray = None,
+                bands: Optional[np.ndarray] = None):
     """
     Genera la gráfica de Regret Acumulado vs Pasos de Tiempo.
 
-    :param steps: Número de pasos de tiempo.
+    :param steps: Número de pasos de tiempo o pasos de cada columna de regret_accumulated.
     :param regret_accumulated: Matriz de regret acumulado (algoritmos x pasos).
     :param algorithms: Lista de instancias de algoritmos comparados.
     :param expected_regret: (Opcional) Arreglo con el arrepentimiento esperado para cada paso de tiempo.
+    :param bands: (Opcional) Bandas de confianza (2 x algoritmos x pasos) con los límites inferior y
+                  superior, p. ej. las de Accumulator.confidence_bands; se dibujan sombreadas.
     """
     sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
 
     plt.figure(figsize=(14, 7))
     for idx, algo in enumerate(algorithms):
         label = get_algorithm_label(algo)
-        plt.plot(range(steps), regret_accumulated[idx], label=label, linewidth=2)
+        line, = plt.plot(steps_axis(steps), regret_accumulated[idx], label=label, linewidth=2)
+        if bands is not None:
+            plt.fill_between(steps_axis(steps), bands[0][idx], bands[1][idx], color=line.get_color(), alpha=0.2)
 
     if expected_regret is not None:
-        plt.plot(range(steps), expected_regret, label='Arrepentimiento Esperado', linestyle='--', color='r', linewidth=2)
+        plt.plot(steps_axis(steps), expected_regret, label='Arrepentimiento Esperado', linestyle='--', color='r', linewidth=2)
 
     plt.xlabel('Pasos de Tiempo', fontsize=14)
     plt.ylabel('Regret Acumulado', fontsize=14)
@@ -182,13 +225,13 @@ def plot_arm_statistics(arm_stats: List[dict], algorithms: List[Algorithm], opti
     plt.tight_layout()
     plt.show()
 
-def calculate_expected_regret(steps: int, constant: float) -> np.ndarray:
+def calculate_expected_regret(steps: Union[int, np.ndarray], constant: float) -> np.ndarray:
     """
     Calcula el arrepentimiento esperado utilizando la fórmula C * ln(T).
 
-    :param steps: Número de pasos de tiempo.
+    :param steps: Número de pasos de tiempo o pasos (empezando en 0) en los que evaluarlo.
     :param constant: Constante C utilizada en la fórmula.
     :return: Arreglo con el arrepentimiento esperado para cada paso de tiempo.
     """
-    return constant * np.log(np.arange(1, steps + 1))
+    return constant * np.log(steps_axis(steps) + 1)
 
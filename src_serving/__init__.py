@@ -0,0 +1,7 @@
+# Importación de módulos o clases
+from .server import Decision, PolicyServer
+from .feed import SimulatedRewardFeed
+from .benchmark import benchmark_server
+
+# Lista de módulos o clases públicas
+__all__ = ['Decision', 'PolicyServer', 'SimulatedRewardFeed', 'benchmark_server']
\ No newline at end of file
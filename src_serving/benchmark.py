@@ -0,0 +1,80 @@
+"""
+Module: src_serving/benchmark.py
+Description: Medición del rendimiento (decisiones por segundo) y de la latencia de cola del servicio de decisiones.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import threading
+import time
+from typing import Dict
+
+import numpy as np
+
+from src_arms import Bandit
+from src_serving.feed import SimulatedRewardFeed
+from src_serving.server import PolicyServer
+
+# Percentiles de latencia que se informan
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def benchmark_server(server: PolicyServer, bandit: Bandit, threads: int = 4, requests: int = 10_000,
+                     delay: float = 0.0, seed=None) -> Dict[str, float]:
+    """
+    Mide el servicio con varios hilos que piden decisiones a la vez y recompensas diferidas.
+
+    Cada hilo pide requests decisiones seguidas y entrega cada una a una
+    SimulatedRewardFeed común, que notifica las recompensas al servicio desde otro hilo.
+    Se mide la latencia de cada select (incluida la espera por el cerrojo de su
+    fragmento) y el rendimiento total hasta que se han notificado todas las recompensas.
+
+    Con el GIL de CPython los hilos no ejecutan Python en paralelo, así que el rendimiento
+    total apenas crece con threads; lo que evitan los fragmentos es que la latencia de cola
+    se dispare por la espera de un cerrojo común.
+
+    :param server: Servicio a medir.
+    :param bandit: Bandido del que se muestrean las recompensas.
+    :param threads: Número de hilos que piden decisiones.
+    :param requests: Número de decisiones que pide cada hilo.
+    :param delay: Retardo medio (en segundos) de las recompensas.
+    :param seed: (Opcional) Semilla de la fuente de recompensas.
+    :return: Diccionario con decisions, seconds, throughput (decisiones/s) y la latencia de
+             select en microsegundos para cada percentil (p50, p90, p99, p99.9) y la máxima.
+    """
+    assert threads > 0 and requests > 0, "El número de hilos y de peticiones debe ser mayor que 0."
+
+    latencies = np.zeros((threads, requests))
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(row: np.ndarray):
+        clock = time.perf_counter
+        barrier.wait()
+        for i in range(requests):
+            start = clock()
+            decision = server.select()
+            row[i] = clock() - start
+            feed.submit(decision)
+
+    with SimulatedRewardFeed(server, bandit, delay, seed) as feed:
+        workers = [threading.Thread(target=worker, args=(latencies[i],)) for i in range(threads)]
+        for thread in workers:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in workers:
+            thread.join()
+    seconds = time.perf_counter() - start  # Hasta notificar la última recompensa
+
+    latencies *= 1e6
+    summary = {'decisions': threads * requests, 'seconds': seconds, 'throughput': threads * requests / seconds}
+    for percentile, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        summary[f'p{percentile:g}_us'] = float(value)
+    summary['max_us'] = float(latencies.max())
+    return summary
@@ -0,0 +1,109 @@
+"""
+Module: src_serving/feed.py
+Description: Fuente local de recompensas diferidas que simula en proceso el retorno de las peticiones reales.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import heapq
+import threading
+import time
+from typing import List, Tuple
+
+from src_arms import Bandit, make_generator
+from src_serving.server import Decision, PolicyServer
+
+
+class SimulatedRewardFeed:
+    """
+    Devuelve al servicio las recompensas de sus decisiones con un retardo aleatorio.
+
+    Cada decisión que se entrega con submit se programa para dentro de un retardo
+    exponencial de media delay segundos; un hilo en segundo plano muestrea entonces la
+    recompensa del brazo en el bandido y llama a server.update, igual que lo haría el
+    sistema real al recibir el resultado de la petición. Puede usarse como gestor de
+    contexto: al salir se entregan las recompensas pendientes y se detiene el hilo.
+    """
+
+    def __init__(self, server: PolicyServer, bandit: Bandit, delay: float = 0.0, seed=None):
+        """
+        Inicializa la fuente y arranca su hilo.
+
+        :param server: Servicio al que se notifican las recompensas.
+        :param bandit: Bandido del que se muestrean las recompensas.
+        :param delay: Retardo medio (en segundos) entre la decisión y su recompensa.
+        :param seed: (Opcional) Semilla del generador de retardos y recompensas.
+        """
+        assert bandit.k == server.k, "El bandido no tiene el mismo número de brazos que el servicio."
+        assert delay >= 0, "El retardo medio no puede ser negativo."
+
+        self.server = server
+        self.bandit = bandit
+        self.delay = delay
+        self.delivered = 0  # Recompensas notificadas al servicio
+        self.dropped = 0  # Recompensas de decisiones que ya habían caducado
+        self._rng = make_generator(seed)
+        self._queue: List[Tuple[float, int, int]] = []  # Montículo de (instante, decisión, brazo)
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='SimulatedRewardFeed', daemon=True)
+        self._thread.start()
+
+    def submit(self, decision: Decision):
+        """
+        Programa la recompensa de una decisión.
+
+        :param decision: Decisión devuelta por el servicio.
+        """
+        with self._condition:
+            assert not self._closed, "La fuente de recompensas está cerrada."
+            due = time.monotonic() + (self._rng.exponential(self.delay) if self.delay > 0 else 0.0)
+            heapq.heappush(self._queue, (due, decision.id, decision.arm))
+            if self._queue[0][1] == decision.id:
+                self._condition.notify()  # Es la siguiente en vencer: se despierta al hilo
+
+    def _run(self):
+        """
+        Bucle del hilo: espera a que venza la recompensa más próxima y la notifica.
+        """
+        while True:
+            with self._condition:
+                while True:
+                    if self._queue:
+                        wait = self._queue[0][0] - time.monotonic()
+                        if wait <= 0 or self._closed:
+                            break
+                        self._condition.wait(wait)
+                    elif self._closed:
+                        return
+                    else:
+                        self._condition.wait()
+                _, decision_id, arm = heapq.heappop(self._queue)
+                reward = self.bandit.pull_arm(arm, self._rng)
+            # La actualización se hace fuera de la condición para no bloquear a submit
+            try:
+                self.server.update(decision_id, reward)
+                self.delivered += 1
+            except KeyError:
+                self.dropped += 1  # La decisión caducó en el servicio antes de recibir la recompensa
+
+    def close(self):
+        """
+        Entrega inmediatamente las recompensas pendientes y detiene el hilo.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self) -> 'SimulatedRewardFeed':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,271 @@
+"""
+Module: src_serving/server.py
+Description: Servicio de decisiones en línea sobre cualquier algoritmo, con réplicas por fragmento y recompensas diferidas.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import copy
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from src_algorithms import Algorithm
+from src_arms import make_generator
+
+# Número máximo por defecto de decisiones pendientes de recompensa en cada fragmento
+DEFAULT_MAX_PENDING = 100_000
+# Número por defecto de recompensas que acumula un fragmento antes de enviarlas a las demás réplicas
+DEFAULT_SYNC_EVERY = 64
+
+
+class Decision(NamedTuple):
+    """
+    Decisión emitida por el servicio: identificador con el que notificar la recompensa y brazo elegido.
+    """
+    id: int
+    arm: int
+
+
+class _Shard:
+    """
+    Réplica del algoritmo con su propio cerrojo, sus decisiones pendientes y las recompensas por intercambiar.
+    """
+    __slots__ = ('algorithm', 'lock', 'pending', 'sequence', 'selections', 'updates', 'expired',
+                 'outbox', 'inbox', 'counts', 'sums')
+
+    def __init__(self, algorithm: Algorithm):
+        self.algorithm = algorithm
+        self.lock = threading.Lock()
+        self.pending: Dict[int, int] = OrderedDict()  # Identificador de decisión -> brazo (en orden de emisión)
+        self.sequence = 0  # Número de decisiones emitidas por el fragmento
+        self.selections = 0
+        self.updates = 0
+        self.expired = 0
+        self.outbox: List[tuple] = []  # Recompensas propias (brazo, recompensa) aún no enviadas a las demás réplicas
+        self.inbox: List[tuple] = []  # Lotes (brazos, recompensas) de las demás réplicas aún no aplicados
+        self.counts = np.zeros(algorithm.k, dtype=int)  # Recompensas propias de cada brazo
+        self.sums = np.zeros(algorithm.k, dtype=float)
+
+
+class PolicyServer:
+    """
+    Envuelve un algoritmo para elegir brazos en peticiones reales concurrentes.
+
+    select_arm y update modifican arrays de NumPy compartidos, así que no pueden llamarse
+    a la vez desde varios hilos. En lugar de un cerrojo global, el servicio mantiene
+    shards réplicas del algoritmo, cada una con su propio cerrojo: cada hilo queda asociado
+    a un fragmento la primera vez que pide una decisión (reparto circular con un contador
+    atómico), de modo que con tantos fragmentos como hilos los cerrojos no se disputan y
+    solo se comparten con quien notifica las recompensas.
+
+    Cada decisión recibe un identificador que codifica su fragmento (id % shards); la
+    recompensa puede llegar mucho después, desde cualquier hilo, con update(id, reward), y
+    se aplica de inmediato a la réplica que tomó la decisión. Para que la exploración no se
+    repita en cada réplica, cada fragmento guarda sus recompensas y, cada sync_every, las
+    entrega de una vez a las demás réplicas, que las aplican con update_batch antes de su
+    siguiente decisión. Así todas las réplicas aprenden de todo el tráfico con un retraso de
+    como mucho sync_every recompensas por fragmento, y nunca se toman dos cerrojos a la vez.
+    Las decisiones sin recompensa se descartan (caducan) cuando un fragmento acumula más de
+    max_pending.
+
+    Mientras no llegan las recompensas, las políticas deterministas (UCB) repiten el mismo
+    brazo; con retardos grandes conviene usar políticas aleatorizadas (Thompson Sampling,
+    epsilon-greedy).
+
+    Las corrutinas select_async y update_async permiten usarlo desde tareas de asyncio: las
+    operaciones duran microsegundos y no bloquean el bucle de eventos.
+    """
+
+    def __init__(self, algorithm: Algorithm, shards: Optional[int] = None, seed=None,
+                 max_pending: int = DEFAULT_MAX_PENDING, sync_every: int = DEFAULT_SYNC_EVERY):
+        """
+        Inicializa el servicio.
+
+        :param algorithm: Algoritmo en modo escalar; cada fragmento trabaja sobre una copia
+                          (con el estado que ya tuviera) y no se modifica el original.
+        :param shards: (Opcional) Número de réplicas; por defecto el número de CPUs.
+        :param seed: (Opcional) Semilla de la que se derivan generadores independientes para cada réplica.
+        :param max_pending: Número máximo de decisiones pendientes de recompensa por fragmento.
+        :param sync_every: Número de recompensas que acumula cada fragmento antes de enviarlas a las demás réplicas.
+        """
+        assert algorithm.runs is None, "El servicio necesita el algoritmo en modo escalar."
+        shards = (os.cpu_count() or 1) if shards is None else shards
+        assert shards > 0, "El número de fragmentos debe ser mayor que 0."
+        assert max_pending > 0, "El número máximo de decisiones pendientes debe ser mayor que 0."
+        assert sync_every > 0, "El intervalo de sincronización debe ser mayor que 0."
+
+        self.k = algorithm.k
+        self.max_pending = max_pending
+        self.sync_every = sync_every
+        # Estimaciones de partida (las mismas en todas las réplicas): estimates no las cuenta una vez por réplica
+        self._initial_counts = algorithm.counts.copy()
+        self._initial_sums = algorithm.counts * algorithm.values
+        self._shards: List[_Shard] = []
+        for child in np.random.SeedSequence(seed).spawn(shards):
+            replica = copy.deepcopy(algorithm)
+            replica.rng = make_generator(child)
+            self._shards.append(_Shard(replica))
+
+        self._assign = itertools.count()  # next() es atómico: reparte fragmentos entre hilos
+        self._local = threading.local()
+
+    @property
+    def shards(self) -> int:
+        """
+        Número de réplicas del algoritmo.
+        """
+        return len(self._shards)
+
+    def _shard_index(self) -> int:
+        """
+        Devuelve el fragmento asociado al hilo actual, asignándolo la primera vez.
+        """
+        index = getattr(self._local, 'shard', None)
+        if index is None:
+            index = self._local.shard = next(self._assign) % len(self._shards)
+        return index
+
+    def select(self) -> Decision:
+        """
+        Elige un brazo para una petición.
+
+        :return: Decisión con su identificador y el brazo elegido.
+        """
+        index = self._shard_index()
+        shard = self._shards[index]
+        with shard.lock:
+            if shard.inbox:
+                self._absorb(shard)
+            arm = int(shard.algorithm.select_arm())
+            decision_id = shard.sequence * len(self._shards) + index
+            shard.sequence += 1
+            shard.selections += 1
+            shard.pending[decision_id] = arm
+            if len(shard.pending) > self.max_pending:
+                shard.pending.popitem(last=False)  # Se descarta la más antigua
+                shard.expired += 1
+        return Decision(decision_id, arm)
+
+    def update(self, decision_id: int, reward: float):
+        """
+        Notifica la recompensa de una decisión y actualiza la réplica que la tomó.
+
+        :param decision_id: Identificador devuelto por select.
+        :param reward: Recompensa obtenida.
+        :raises KeyError: Si la decisión no existe, ya se actualizó o ha caducado.
+        """
+        index = decision_id % len(self._shards)
+        shard = self._shards[index]
+        outbox = None
+        with shard.lock:
+            arm = shard.pending.pop(decision_id, None)
+            if arm is None:
+                raise KeyError(f"Decisión desconocida, ya actualizada o caducada: {decision_id}")
+            shard.algorithm.update(arm, reward)
+            shard.updates += 1
+            shard.counts[arm] += 1
+            shard.sums[arm] += reward
+            if len(self._shards) > 1:
+                shard.outbox.append((arm, reward))
+                if len(shard.outbox) >= self.sync_every:
+                    outbox, shard.outbox = shard.outbox, []
+        if outbox:
+            # Fuera del cerrojo propio: cada entrega solo toma el cerrojo de la réplica de destino
+            self._publish(index, outbox)
+
+    def sync(self):
+        """
+        Entrega a las demás réplicas todas las recompensas que aún no se habían intercambiado.
+
+        Tras llamarlo (sin peticiones en curso) todas las réplicas han visto el mismo tráfico
+        en cuanto apliquen sus lotes pendientes, lo que ocurre en su siguiente decisión.
+        """
+        for index, shard in enumerate(self._shards):
+            with shard.lock:
+                outbox, shard.outbox = shard.outbox, []
+            if outbox:
+                self._publish(index, outbox)
+
+    def _publish(self, source: int, outbox: List[tuple]):
+        """
+        Añade las recompensas de un fragmento a los lotes pendientes de todas las demás réplicas.
+
+        :param source: Índice del fragmento que tomó las decisiones.
+        :param outbox: Lista de pares (brazo, recompensa).
+        """
+        arms, rewards = zip(*outbox)
+        batch = (np.array(arms, dtype=np.intp), np.array(rewards, dtype=float))
+        for index, shard in enumerate(self._shards):
+            if index != source:
+                with shard.lock:
+                    shard.inbox.append(batch)
+
+    @staticmethod
+    def _absorb(shard: _Shard):
+        """
+        Aplica a la réplica de un fragmento los lotes recibidos de las demás (con su cerrojo tomado).
+        """
+        inbox, shard.inbox = shard.inbox, []
+        shard.algorithm.update_batch(np.concatenate([arms for arms, _ in inbox]),
+                                     np.concatenate([rewards for _, rewards in inbox]))
+
+    async def select_async(self) -> Decision:
+        """
+        Versión para asyncio de select.
+        """
+        return self.select()
+
+    async def update_async(self, decision_id: int, reward: float):
+        """
+        Versión para asyncio de update.
+        """
+        self.update(decision_id, reward)
+
+    def estimates(self):
+        """
+        Combina las estimaciones de todas las réplicas.
+
+        Se calculan con las recompensas que recibió cada fragmento (y el estado inicial del
+        algoritmo), no con las réplicas, que también contienen las de las demás.
+        :return: Tupla (counts, values) con el número total de selecciones actualizadas de
+                 cada brazo y su recompensa media.
+        """
+        counts = self._initial_counts.copy()
+        sums = self._initial_sums.copy()
+        for shard in self._shards:
+            with shard.lock:
+                counts += shard.counts
+                sums += shard.sums
+        return counts, sums / np.maximum(counts, 1)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve los contadores del servicio sumados sobre todos los fragmentos.
+
+        :return: Diccionario con selections, updates, pending y expired.
+        """
+        totals = {'selections': 0, 'updates': 0, 'pending': 0, 'expired': 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals['selections'] += shard.selections
+                totals['updates'] += shard.updates
+                totals['pending'] += len(shard.pending)
+                totals['expired'] += shard.expired
+        return totals
+
+    def __str__(self):
+        """
+        Representación en cadena del servicio.
+        """
+        return f"PolicyServer({type(self._shards[0].algorithm).__name__}, k={self.k}, shards={len(self._shards)})"
@@ -0,0 +1,49 @@
+"""
+Module: tests/conftest.py
+Description: Algoritmos y utilidades comunes a las pruebas.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import numpy as np
+import pytest
+
+from src_algorithms import (EpsilonGreedy, Softmax, UCB1, UCB2, UCBV, KLUCB, BetaThompsonSampling,
+                            GaussianThompsonSampling, DiscountedUCB1, SlidingWindowEpsilonGreedy)
+
+# Constructores de los algoritmos (k brazos, generador o semilla) sobre los que se parametrizan las pruebas
+ALGORITHMS = {
+    'epsilon_greedy': lambda k, rng=None: EpsilonGreedy(k, epsilon=0.1, rng=rng),
+    'softmax': lambda k, rng=None: Softmax(k, tau=0.5, rng=rng),
+    'ucb1': lambda k, rng=None: UCB1(k, rng=rng),
+    'ucb2': lambda k, rng=None: UCB2(k, alpha_param=0.5, rng=rng),
+    'ucbv': lambda k, rng=None: UCBV(k, rng=rng),
+    'klucb': lambda k, rng=None: KLUCB(k, rng=rng),
+    'beta_ts': lambda k, rng=None: BetaThompsonSampling(k, rng=rng),
+    'gaussian_ts': lambda k, rng=None: GaussianThompsonSampling(k, rng=rng),
+    'discounted_ucb1': lambda k, rng=None: DiscountedUCB1(k, gamma=0.95, rng=rng),
+    'sliding_window': lambda k, rng=None: SlidingWindowEpsilonGreedy(k, window=50, rng=rng),
+}
+
+
+@pytest.fixture(params=list(ALGORITHMS))
+def make_algorithm(request):
+    """
+    Constructor de cada uno de los algoritmos de ALGORITHMS.
+    """
+    return ALGORITHMS[request.param]
+
+
+def assert_same_arrays(expected: dict, actual: dict):
+    """
+    Comprueba que dos diccionarios de arrays tienen las mismas claves y valores (salvo redondeo).
+    """
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        np.testing.assert_allclose(actual[name], expected[name], rtol=1e-12, atol=1e-12, err_msg=name)
@@ -0,0 +1,108 @@
+"""
+Module: tests/test_batch_updates.py
+Description: Pruebas de las actualizaciones y selecciones por lotes (update_batch y select_batch).
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import numpy as np
+
+from conftest import assert_same_arrays
+from src_algorithms import GradientPreference, UCB2
+
+
+def _bernoulli_stream(k: int, size: int, seed: int):
+    """
+    Genera una secuencia de brazos y recompensas Bernoulli independiente de cualquier política.
+    """
+    rng = np.random.default_rng(seed)
+    arms = rng.integers(0, k, size)
+    return arms, (rng.random(size) < rng.random(k)[arms]).astype(float)
+
+
+def _normalized_state(algorithm) -> dict:
+    """
+    Devuelve los arrays y escalares de state_dict con las sumas descontadas divididas por su peso
+    total, que update y update_batch reescalan en momentos distintos.
+    """
+    state = algorithm.state_dict()
+    arrays, scalars = state['arrays'], state['scalars']
+    total = scalars.pop('_total', None)
+    if total is not None:
+        scalars.pop('_weight')
+        arrays['_weights'], arrays['_sums'] = arrays['_weights'] / total, arrays['_sums'] / total
+    return {**arrays, **{name: np.asarray(value, dtype=float) for name, value in scalars.items() if value is not None}}
+
+
+def test_update_batch_equals_sequential_updates(make_algorithm):
+    arms, rewards = _bernoulli_stream(6, 300, seed=1)
+    sequential, batch = make_algorithm(6), make_algorithm(6)
+    for arm, reward in zip(arms, rewards):
+        sequential.update(int(arm), reward)
+    for start in range(0, len(arms), 64):
+        batch.update_batch(arms[start:start + 64], rewards[start:start + 64])
+
+    assert_same_arrays(_normalized_state(sequential), _normalized_state(batch))
+
+
+def test_gradient_preference_single_observation_equals_update():
+    arms, rewards = _bernoulli_stream(5, 50, seed=2)
+    sequential, batch = GradientPreference(5, alpha=0.2, rng=0), GradientPreference(5, alpha=0.2, rng=0)
+    for arm, reward in zip(arms, rewards):
+        # Las probabilidades que usa el gradiente son las de la última selección
+        sequential.select_arm(), batch.select_arm()
+        sequential.update(int(arm), reward)
+        batch.update_batch([arm], [reward])
+    assert_same_arrays({'preferences': sequential.preferences, 'average_reward': sequential.average_reward},
+                       {'preferences': batch.preferences, 'average_reward': batch.average_reward})
+
+
+def test_gradient_preference_batch_is_one_gradient_step():
+    # Todas las decisiones del lote se tomaron con la misma P: un único paso con la suma de los
+    # gradientes respecto de la recompensa promedio anterior al lote
+    algorithm = GradientPreference(5, alpha=0.2, rng=0)
+    warmup_arms, warmup_rewards = _bernoulli_stream(5, 20, seed=3)
+    algorithm.update_batch(warmup_arms, warmup_rewards)
+    algorithm.select_arm()
+    probabilities, preferences = algorithm.probabilities.copy(), algorithm.preferences.copy()
+    average_reward = algorithm.average_reward
+
+    arms, rewards = _bernoulli_stream(5, 40, seed=4)
+    algorithm.update_batch(arms, rewards)
+    for arm, reward in zip(arms, rewards):
+        preferences += 0.2 * (reward - average_reward) * ((np.arange(5) == arm) - probabilities)
+
+    np.testing.assert_allclose(algorithm.preferences, preferences, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(algorithm.average_reward, np.concatenate([warmup_rewards, rewards]).mean())
+
+
+def test_ucb2_select_batch_keeps_epochs():
+    # Con recompensas nulas las medias no cambian (tampoco las de decisiones aún sin recompensa), así que entregar las decisiones por lotes
+    # (select_batch y después update_batch) debe recorrer exactamente las mismas épocas que
+    # seleccionar y actualizar paso a paso
+    sequential, batch = UCB2(6, alpha_param=0.5, rng=5), UCB2(6, alpha_param=0.5, rng=5)
+    expected = []
+    for _ in range(500):
+        arm = sequential.select_arm()
+        expected.append(arm)
+        sequential.update(arm, 0.0)
+
+    chosen = []
+    for size in (1, 7, 64, 3, 200, 225):
+        arms = batch.select_batch(size)
+        chosen.extend(arms.tolist())
+        batch.update_batch(arms, np.zeros(size))
+
+    assert chosen == expected
+    assert_same_arrays(sequential.state_dict()['arrays'], batch.state_dict()['arrays'])
+    # Épocas (r en los arrays), instante del próximo cambio y brazo actual; el puntero de
+    # exploración inicial solo es una pista que select_batch restaura
+    expected_scalars, scalars = sequential.state_dict()['scalars'], batch.state_dict()['scalars']
+    expected_scalars.pop('_UCB2__next_unplayed'), scalars.pop('_UCB2__next_unplayed')
+    assert scalars == expected_scalars
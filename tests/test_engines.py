@@ -0,0 +1,39 @@
+"""
+Module: tests/test_engines.py
+Description: Pruebas de equivalencia entre los motores de ejecución de experimentos.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import numpy as np
+
+from conftest import assert_same_arrays
+from src_algorithms import EpsilonGreedy, GaussianThompsonSampling, UCB1
+from src_arms import ArmNormal, Bandit
+from src_experiments import run_experiment_complete
+
+
+def test_serial_equals_parallel():
+    # Cada ejecución tiene su propio generador: el motor paralelo simula las mismas ejecuciones
+    # que el serie y solo cambia el orden en que se suman (diferencias de redondeo); entre
+    # distintos números de procesos el resultado es idéntico bit a bit
+    bandit = Bandit.generate(ArmNormal, 5, rng=0)
+    algorithms = [EpsilonGreedy(5, epsilon=0.1), UCB1(5), GaussianThompsonSampling(5)]
+    serial = run_experiment_complete(bandit, algorithms, steps=200, runs=7, seed=3, engine='serial')
+    in_process, pool = (run_experiment_complete(bandit, algorithms, steps=200, runs=7, seed=3, engine='parallel',
+                                                n_workers=n_workers, shard_size=3)
+                        for n_workers in (1, 2))
+    for expected, actual, pooled in zip(serial, in_process, pool):
+        if isinstance(expected, list):  # arm_stats: un diccionario de arrays por algoritmo
+            for expected_stats, actual_stats, pooled_stats in zip(expected, actual, pooled):
+                assert_same_arrays(expected_stats, actual_stats)
+                assert_same_arrays(actual_stats, pooled_stats)
+            continue
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+        np.testing.assert_array_equal(pooled, actual)
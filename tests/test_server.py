@@ -0,0 +1,58 @@
+"""
+Module: tests/test_server.py
+Description: Pruebas del servicio de decisiones con réplicas por fragmento.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import threading
+
+import numpy as np
+
+from src_algorithms import EpsilonGreedy
+from src_serving import PolicyServer
+
+
+def _serve(server: PolicyServer, threads: int, requests: int, final_barrier: threading.Barrier = None):
+    """
+    Atiende requests peticiones desde cada hilo, con recompensa igual al brazo elegido.
+    """
+    def worker():
+        for _ in range(requests):
+            decision = server.select()
+            server.update(decision.id, float(decision.arm))
+        if final_barrier is not None:
+            final_barrier.wait()
+            server.select()  # Aplica los lotes recibidos de las demás réplicas
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+
+
+def test_replicas_learn_from_every_shard():
+    server = PolicyServer(EpsilonGreedy(5, epsilon=0.5), shards=4, seed=0, sync_every=8)
+    barrier = threading.Barrier(4, action=server.sync)
+    _serve(server, threads=4, requests=100, final_barrier=barrier)
+
+    counts, values = server.estimates()
+    assert counts.sum() == 400  # Cada recompensa cuenta una vez aunque la vean todas las réplicas
+    np.testing.assert_allclose(values[counts > 0], np.arange(5)[counts > 0])
+    for shard in server._shards:
+        np.testing.assert_array_equal(shard.algorithm.counts, counts)
+
+
+def test_single_shard_does_not_exchange():
+    server = PolicyServer(EpsilonGreedy(5), shards=1, seed=0, sync_every=1)
+    _serve(server, threads=2, requests=50)
+    counts, _ = server.estimates()
+    assert counts.sum() == 100 and server.stats()['updates'] == 100
+    assert not server._shards[0].outbox and not server._shards[0].inbox
@@ -0,0 +1,78 @@
+"""
+Module: tests/test_state.py
+Description: Pruebas del guardado y la restauración del estado de los algoritmos (state_dict y ficheros de estado).
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import numpy as np
+import pytest
+
+from conftest import assert_same_arrays
+from src_algorithms import BetaThompsonSampling, EpsilonGreedy, UCB2, save_state, load_state
+from src_arms import ArmBernoulli, Bandit
+
+
+def _trained(make_algorithm, k: int = 6, steps: int = 100):
+    """
+    Devuelve un algoritmo tras steps decisiones con recompensas Bernoulli reproducibles.
+    """
+    bandit = Bandit.generate(ArmBernoulli, k, rng=2)
+    rng = np.random.default_rng(3)
+    algorithm = make_algorithm(k, rng=4)
+    for _ in range(steps):
+        arm = algorithm.select_arm()
+        algorithm.update(arm, bandit.pull_arm(arm, rng=rng))
+    return algorithm
+
+
+def test_state_dict_round_trip(make_algorithm):
+    original = _trained(make_algorithm)
+    restored = make_algorithm(6)
+    restored.load_state_dict(original.state_dict())
+    assert_same_arrays(original.state_dict()['arrays'], restored.state_dict()['arrays'])
+    assert restored.state_dict()['scalars'] == original.state_dict()['scalars']
+    # El generador también se restaura: las decisiones siguientes son las mismas
+    assert [restored.select_arm() for _ in range(20)] == [original.select_arm() for _ in range(20)]
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_state_file_round_trip(make_algorithm, mmap, tmp_path):
+    original = _trained(make_algorithm)
+    path = str(tmp_path / 'state.bin')
+    save_state(original, path)
+    restored = load_state(make_algorithm(6), path, mmap=mmap)
+    assert_same_arrays(original.state_dict()['arrays'], restored.state_dict()['arrays'])
+
+    if mmap and isinstance(original, UCB2):
+        return  # UCB2 registra el inicio de cada época al elegir: sus réplicas de solo lectura no pueden elegir
+    assert [restored.select_arm() for _ in range(20)] == [original.select_arm() for _ in range(20)]
+
+
+def test_derived_attributes_are_not_saved():
+    algorithm = BetaThompsonSampling(4, n=[1, 2, 3, 4])
+    state = algorithm.state_dict()
+    assert '_trials' not in state['arrays'] and '_scale' not in state['arrays']
+    assert '_scale' not in state['scalars']
+
+
+def test_mmap_load_of_a_million_arms_does_not_copy(tmp_path):
+    k = 10 ** 6
+    original = EpsilonGreedy(k, epsilon=0.1, rng=0)
+    original.update_batch(np.arange(0, k, 7), np.ones(len(range(0, k, 7))))
+    path = str(tmp_path / 'state.bin')
+    save_state(original, path)
+
+    replica = load_state(EpsilonGreedy(k, epsilon=0.1), path, mmap=True)
+    for name in ('counts', 'values'):
+        array = getattr(replica, name)
+        assert isinstance(array, np.memmap) and not array.flags.writeable, name
+        assert not array.flags.owndata, name
+    np.testing.assert_array_equal(replica.values, original.values)
+    assert [replica.select_arm() for _ in range(10)] == [original.select_arm() for _ in range(10)]
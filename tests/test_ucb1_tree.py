@@ -0,0 +1,71 @@
+"""
+Module: tests/test_ucb1_tree.py
+Description: Pruebas de equivalencia entre UCB1Tree y UCB1.
+
+Authors: Gonzalo Marcos Andres and Francisco José López Fernández
+Email: gonzalo.marcosa@um.es and franciscojose.lopezf@um.es
+Date: 2025/02/25
+
+This software is licensed under the GNU General Public License v3.0 (GPL-3.0),
+with the additional restriction that it may not be used for commercial purposes.
+
+For more details about GPL-3.0: https://www.gnu.org/licenses/gpl-3.0.html
+"""
+import numpy as np
+import pytest
+
+from src_algorithms import UCB1, UCB1Tree
+from src_arms import ArmNormal, Bandit
+
+
+def _bernoulli_selections(k: int, seed: int, steps: int, batch: bool = False):
+    """
+    Ejecuta UCB1 y UCB1Tree paso a paso con las mismas recompensas Bernoulli y devuelve los brazos que elige cada uno.
+    """
+    rng = np.random.default_rng(seed)
+    probabilities = rng.random(k)
+    reference, tree = UCB1(k), UCB1Tree(k)
+    expected, chosen = [], []
+    for _ in range(steps):
+        arm = reference.select_arm()
+        expected.append(arm)
+        chosen.append(int(tree.select_batch(1)[0]) if batch else tree.select_arm())
+        reward = float(rng.random() < probabilities[arm])
+        reference.update(arm, reward)
+        if batch:
+            tree.update_batch([arm], [reward])
+        else:
+            tree.update(arm, reward)
+    return expected, chosen
+
+
+@pytest.mark.parametrize('seed', [2, 8, 10])
+def test_bernoulli_ties(seed):
+    # Con recompensas Bernoulli hay brazos con las mismas selecciones y medias idénticas
+    # (o que difieren en el último bit): ante empate ambos eligen el de menor índice
+    expected, chosen = _bernoulli_selections(7, seed, 20_000)
+    assert chosen == expected
+
+
+def test_bernoulli_many_arms():
+    expected, chosen = _bernoulli_selections(300, 0, 10_000)
+    assert chosen == expected
+
+
+def test_batch_round_trip():
+    expected, chosen = _bernoulli_selections(7, 2, 5_000, batch=True)
+    assert chosen == expected
+
+
+@pytest.mark.parametrize('c', [0.5, 2.0])
+def test_normal_rewards(c):
+    # Recompensas normales: las medias casi nunca coinciden y el árbol debe seguir a UCB1 en cada paso
+    bandit = Bandit.generate(ArmNormal, 40, rng=5)
+    rng = np.random.default_rng(6)
+    reference, tree = UCB1(40, c=c), UCB1Tree(40, c=c)
+    for _ in range(3_000):
+        arm = reference.select_arm()
+        assert tree.select_arm() == arm
+        reward = bandit.pull_arm(arm, rng=rng)
+        reference.update(arm, reward)
+        tree.update(arm, reward)